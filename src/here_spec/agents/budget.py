@@ -0,0 +1,258 @@
+"""
+Context token budgets
+Local token estimates for generated agent contexts, and deterministic trimming
+of the parts that push a context over its budget.
+
+Trimming keeps the layout described in here_spec.agents.context intact: the
+project facts block is trimmed once, against a single project-wide budget, so
+it stays byte-identical in every step's context; each step's own budget only
+ever trims that step's section (the build's artifact digest).
+
+The estimator needs no model or network: it approximates a BPE tokenizer by
+charging one token per punctuation mark or non-ASCII character and one token
+per four characters of each word. It is meant for sizing and trend analysis,
+not for billing.
+"""
+
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from here_spec.agents.context import PROJECT_FACTS, TEMPLATES, compiled, describe_layout
+from here_spec.core.generated import GeneratedFiles
+from here_spec.core.paths import load_config
+
+ESTIMATOR = "heuristic-v1"
+USAGE_FILE = "context-tokens.json"
+
+DEFAULT_BUDGET = 3000
+DEFAULT_BUDGETS = {
+    "constitution": 3000,
+    "spec": 3000,
+    "plan": 3000,
+    "tasks": 3000,
+    "validate": 3000,
+    "build": 4000,
+}
+
+# Budget for the project facts block, the same for every step
+DEFAULT_FACTS_BUDGET = 1500
+
+# Fields that may be trimmed, most important first. Lower-priority fields are
+# cut first, and none is cut below MIN_SECTION_TOKENS. Facts fields are fitted
+# to the facts budget, step fields to the step's budget. The static prefix and
+# the step instructions are never trimmed.
+FACTS_TRIM_PRIORITY = ["big_picture", "features", "audience", "constraints", "tech_stack"]
+STEP_TRIM_PRIORITY = ["artifacts"]
+MIN_SECTION_TOKENS = 48
+
+_PIECES = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]")
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+
+def _piece_tokens(piece: str) -> int:
+    if piece[0].isascii() and (piece[0].isalnum() or piece[0] == "_"):
+        return math.ceil(len(piece) / 4)
+    return 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text"""
+    return sum(_piece_tokens(m.group()) for m in _PIECES.finditer(text))
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    """Cut text to about limit tokens, preferring a sentence boundary
+
+    Deterministic: the same text and limit always give the same result. The
+    cut is marked with how much was dropped so the agent knows it is partial.
+    """
+    total = estimate_tokens(text)
+    if total <= limit:
+        return text
+
+    # Leave room for the marker so the result stays within limit.
+    room = limit - estimate_tokens(f" … [trimmed {total} of {total} tokens]")
+    used = 0
+    cut = 0
+    for match in _PIECES.finditer(text):
+        used += _piece_tokens(match.group())
+        if used > room:
+            break
+        cut = match.end()
+
+    head = text[:cut]
+    sentences = list(_SENTENCE_END.finditer(head))
+    if sentences and sentences[-1].end() >= cut // 2:
+        head = head[: sentences[-1].end()]
+    head = head.rstrip()
+    kept = estimate_tokens(head)
+    return f"{head} … [trimmed {total - kept} of {total} tokens]"
+
+
+def step_budget(step: str) -> int:
+    """Token budget for a step's context (0 means unlimited)
+
+    $HERE_SPEC_CONTEXT_BUDGET overrides every step; otherwise the config's
+    "context_budgets" mapping ({"spec": 5000, "default": 3000}) applies,
+    then the built-in defaults.
+    """
+    env_value = os.environ.get("HERE_SPEC_CONTEXT_BUDGET")
+    if env_value:
+        try:
+            return max(0, int(env_value))
+        except ValueError:
+            pass
+
+    budgets = load_config().get("context_budgets")
+    if isinstance(budgets, dict):
+        for key in (step, "default"):
+            value = budgets.get(key)
+            if isinstance(value, int) and value >= 0:
+                return value
+    return DEFAULT_BUDGETS.get(step, DEFAULT_BUDGET)
+
+
+def facts_budget() -> int:
+    """Token budget for the project facts block (0 means unlimited)
+
+    Set with "facts" in the config's "context_budgets"; unlike step budgets
+    it is not overridden by $HERE_SPEC_CONTEXT_BUDGET, since every step must
+    render the same facts.
+    """
+    budgets = load_config().get("context_budgets")
+    if isinstance(budgets, dict):
+        value = budgets.get("facts")
+        if isinstance(value, int) and value >= 0:
+            return value
+    return DEFAULT_FACTS_BUDGET
+
+
+@dataclass
+class FittedContext:
+    """A rendered context and how it was sized"""
+
+    text: str
+    step: str
+    budget: int
+    tokens: int
+    sections: Dict[str, int]
+    trimmed: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.tokens > self.budget
+
+    def to_dict(self) -> Dict:
+        return {
+            "estimator": ESTIMATOR,
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "over_budget": self.over_budget,
+            "sections": self.sections,
+            "trimmed": {name: list(sizes) for name, sizes in self.trimmed.items()},
+        }
+
+
+def _section_tokens(text: str) -> Dict[str, int]:
+    layout = describe_layout(text)
+    data = text.encode("utf-8")
+    prefix_end = int(layout["prefix_bytes"])
+    facts_end = prefix_end + int(layout["facts_bytes"])
+    return {
+        "prefix": estimate_tokens(data[:prefix_end].decode("utf-8")),
+        "facts": estimate_tokens(data[prefix_end:facts_end].decode("utf-8")),
+        "step": estimate_tokens(data[facts_end:].decode("utf-8")),
+    }
+
+
+def _trim(values: Dict[str, str], names: List[str], overflow: int) -> Dict[str, Tuple[int, int]]:
+    """Shorten values[name] for names, last first, until overflow tokens are gone"""
+    trimmed: Dict[str, Tuple[int, int]] = {}
+    for name in reversed(names):
+        if overflow <= 0:
+            break
+        value = values.get(name)
+        if value is None:
+            continue
+        size = estimate_tokens(value)
+        limit = max(MIN_SECTION_TOKENS, size - overflow)
+        if limit >= size:
+            continue
+        shorter = truncate_tokens(value, limit)
+        new_size = estimate_tokens(shorter)
+        if new_size >= size:
+            continue
+        values[name] = shorter
+        trimmed[name] = (size, new_size)
+        overflow -= size - new_size
+    return trimmed
+
+
+def fit_context(
+    kind: str, context: Dict, budget: Optional[int] = None, facts: Optional[int] = None
+) -> FittedContext:
+    """Render a 'step' or 'build' context within its budgets
+
+    The facts block is fitted to facts (default: facts_budget()) first, the
+    same way for every step, then the step's section to budget (default:
+    step_budget()).
+    """
+    step = context.get("step", "unknown") if kind == "step" else "build"
+    if budget is None:
+        budget = step_budget(step)
+    if facts is None:
+        facts = facts_budget()
+
+    template = compiled(kind)
+    values = TEMPLATES[kind][1](context)
+    trimmed: Dict[str, Tuple[int, int]] = {}
+
+    if facts:
+        facts_tokens = estimate_tokens(PROJECT_FACTS.format_map(values))
+        trimmed.update(_trim(values, FACTS_TRIM_PRIORITY, facts_tokens - facts))
+
+    text = template.render(values)
+    tokens = estimate_tokens(text)
+    if budget:
+        step_trimmed = _trim(values, STEP_TRIM_PRIORITY, tokens - budget)
+        if step_trimmed:
+            trimmed.update(step_trimmed)
+            text = template.render(values)
+            tokens = estimate_tokens(text)
+
+    return FittedContext(
+        text=text,
+        step=step,
+        budget=budget,
+        tokens=tokens,
+        sections=_section_tokens(text),
+        trimmed=trimmed,
+    )
+
+
+def record_usage(generated: GeneratedFiles, project_path: Path, fitted: FittedContext):
+    """Store fitted's estimate under its step in .speckit/context-tokens.json"""
+    usage_file = Path(project_path) / ".speckit" / USAGE_FILE
+    try:
+        data = json.loads(usage_file.read_text())
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    data[fitted.step] = fitted.to_dict()
+    generated.write(usage_file, json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def budget_warnings(fitted: FittedContext) -> List[str]:
+    """Human-readable notes about trimming, for the launcher to print"""
+    notes = []
+    for name, (before, after) in fitted.trimmed.items():
+        notes.append(f"Trimmed '{name}' from ~{before} to ~{after} tokens")
+    if fitted.over_budget:
+        notes.append(f"Context is ~{fitted.tokens} tokens, over the {fitted.budget} token budget")
+    return notes
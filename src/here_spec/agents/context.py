@@ -0,0 +1,369 @@
+"""
+Agent context rendering
+Shared, precompiled templates for the files every launcher hands to its agent.
+
+Contexts are laid out for prompt caching: a byte-stable, versioned static
+prefix (Spec's personality and communication style) comes first, then the
+project facts that do not change between steps, then the step-specific
+instructions. Every context of every project therefore shares the prefix, and
+all steps of one project also share the facts block.
+
+Templates are parsed once into literal segments and field slots; static
+fragments are folded into the literal segments at compile time, so rendering a
+context is a single substitution pass.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from here_spec.art.dog_art import get_spec_personality
+
+# Bump when the static prefix changes so reports can tell stale contexts apart.
+PREFIX_VERSION = 1
+PREFIX_MARKER = "<!-- here-spec context prefix v{version} -->"
+SECTION_BREAK = "\n---\n\n"
+
+PROJECT_FACTS = """\
+# Project: {project_name}
+
+## Project Details
+**Description**: {big_picture}
+**Audience**: {audience}
+**Features**: {features}
+**Constraints**: {constraints}
+**Tech Stack**: {tech_stack}
+**Quality Level**: {quality_level}
+"""
+
+STEP_TEMPLATE = (
+    "{static_prefix}"
+    + PROJECT_FACTS
+    + SECTION_BREAK
+    + """\
+# Step: {step_title}
+
+**Step**: {step}
+**Command**: {command}
+**Completed Steps**: {completed_steps}
+
+## Your Task
+Run: {command}
+
+Use the project details above to inform your work."""
+)
+
+BUILD_TEMPLATE = (
+    "{static_prefix}"
+    + PROJECT_FACTS
+    + SECTION_BREAK
+    + """\
+# Spec Kit Assistant - Build Context
+
+**Completed Steps**: {completed_steps}
+
+## Your Task
+Implement the project based on the specification and plan.
+Run: /speckit.implement
+
+All previous steps (constitution, spec, plan, tasks) should be complete.
+
+{artifacts}{resume}{implementation_notes}"""
+)
+
+TASK_TEMPLATE = (
+    "{static_prefix}"
+    + PROJECT_FACTS
+    + SECTION_BREAK
+    + """\
+# Task {task_id}
+
+**Task**: {task_id} {description}
+**Phase**: {phase}
+**Files**: {files}
+
+## Your Task
+Implement only task {task_id} as described in {tasks_file}, following the
+spec and plan in the same directory. Other tasks are being implemented in
+parallel in separate worktrees, so stay within this task's scope.
+
+Do not edit {tasks_file}: here-spec checks the task off when your work is
+merged. Leave your changes in the working tree; here-spec commits them."""
+)
+
+COMMAND_TEMPLATE = """\
+---
+description: Show project context
+---
+
+# Project Context
+
+Name: {project_name}
+Step: {step}
+
+Full context in .speckit/checkpoints.json
+"""
+
+COMMUNICATION_STYLE = """\
+## Communication Style
+
+Throughout this process:
+- Show enthusiasm and encouragement! 🐕
+- Use small ASCII art like (◕‿◕)🐕 or 🐕💭 occasionally
+- Celebrate small wins and milestones
+- Keep the tone friendly and supportive
+- Make the user feel capable and supported
+
+Remember: You're Spec, their loyal development companion!"""
+
+IMPLEMENTATION_NOTES = """\
+## Implementation Notes
+
+This is the big moment! (◕‿◕)🐕
+
+As you implement:
+- Show progress updates with enthusiasm!
+- Use small ASCII art like (◕‿◕)🐕 or 🐕✨ for milestones
+- Celebrate when modules are completed
+- Encourage the user throughout the process
+- Make it feel like a collaborative journey
+
+The user has been guided through all the preparation steps
+and now trusts you to bring their vision to life!
+
+Let's build something amazing together! 🐕✨"""
+
+
+@lru_cache(maxsize=None)
+def static_prefix() -> str:
+    """The byte-stable block every context starts with"""
+    return "\n".join(
+        [
+            PREFIX_MARKER.format(version=PREFIX_VERSION),
+            get_spec_personality(),
+            COMMUNICATION_STYLE,
+            SECTION_BREAK,
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def prefix_id() -> str:
+    """Version and short hash of the static prefix, e.g. 'v1:3f2a9c0d41be'"""
+    digest = hashlib.sha256(static_prefix().encode("utf-8")).hexdigest()
+    return f"v{PREFIX_VERSION}:{digest[:12]}"
+
+
+@lru_cache(maxsize=None)
+def static_fragments() -> Dict[str, str]:
+    """Fragments that never change between renders, built once per process"""
+    return {
+        "static_prefix": static_prefix(),
+        "implementation_notes": IMPLEMENTATION_NOTES,
+    }
+
+
+class CompiledTemplate:
+    """A template split into literal segments and the slots to fill between them"""
+
+    def __init__(self, source: str, statics: Dict[str, str]):
+        parts: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        literal = ""
+        for text, field, _spec, _conv in Formatter().parse(source):
+            literal += text
+            if field is None:
+                continue
+            if field in statics:
+                literal += statics[field]
+                continue
+            parts.append(literal)
+            literal = ""
+            slots.append((len(parts), field))
+            parts.append("")
+        parts.append(literal)
+
+        self.parts = parts
+        self.slots = slots
+        self.fields = tuple(dict.fromkeys(name for _, name in slots))
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill every slot from values (missing keys raise KeyError)"""
+        parts = list(self.parts)
+        for index, name in self.slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+
+def _answer(answers: Dict, key: str, default: str = "N/A") -> str:
+    return str(answers.get(key, default))
+
+
+def _completed(context: Dict) -> str:
+    completed = context.get("completed_steps", [])
+    return ", ".join(completed) if completed else "None"
+
+
+def _resume(outstanding) -> str:
+    """Section limiting a resumed build to the tasks still open ('' otherwise)"""
+    if not outstanding:
+        return ""
+    lines = ["## Resuming", "This build was interrupted. Tasks already checked off in tasks.md are"]
+    lines.append("done; implement only the outstanding tasks, in order:")
+    lines.extend(f"- {task.id} {task.description}" for task in outstanding)
+    return "\n".join(lines) + "\n\n"
+
+
+def project_fields(context: Dict) -> Dict[str, str]:
+    """Step-invariant project facts shared by every context of a project"""
+    answers = context.get("answers", {})
+    return {
+        "project_name": str(context.get("project_name", "Unnamed Project")),
+        "big_picture": _answer(answers, "big_picture"),
+        "audience": _answer(answers, "audience"),
+        "features": _answer(answers, "features"),
+        "constraints": ", ".join(answers.get("constraints", [])) or "None",
+        "tech_stack": _answer(answers, "tech_stack", "auto"),
+        "quality_level": _answer(answers, "quality_level", "production"),
+    }
+
+
+def step_fields(context: Dict) -> Dict[str, str]:
+    """Values for a constitution/spec/plan/tasks/validate context"""
+    step = context.get("step", "unknown")
+    values = project_fields(context)
+    values.update(
+        {
+            "step_title": step.title(),
+            "step": step,
+            "command": context.get("next_command", "/speckit.help"),
+            "completed_steps": _completed(context),
+        }
+    )
+    return values
+
+
+def build_fields(context: Dict) -> Dict[str, str]:
+    """Values for the final build context"""
+    values = project_fields(context)
+    values["completed_steps"] = _completed(context)
+    # Digest of specs/<feature>/ artifacts, added by the launcher (see core.artifacts)
+    values["artifacts"] = context.get("artifacts", "")
+    values["resume"] = _resume(context.get("resume_tasks"))
+    return values
+
+
+def task_fields(context: Dict) -> Dict[str, str]:
+    """Values for one task of a parallel build (context["task"] is a core.tasks.Task)"""
+    task = context["task"]
+    values = project_fields(context)
+    values.update(
+        {
+            "task_id": task.id,
+            "description": task.description,
+            "phase": task.phase or "-",
+            "files": ", ".join(task.files) or "-",
+            "tasks_file": context.get("tasks_file", "tasks.md"),
+        }
+    )
+    return values
+
+
+def command_fields(context: Dict) -> Dict[str, str]:
+    """Values for the agent's interview-context command file"""
+    return {
+        "project_name": str(context.get("project_name", "N/A")),
+        "step": str(context.get("step", "N/A")),
+    }
+
+
+TEMPLATES: Dict[str, Tuple[str, Callable[[Dict], Dict[str, str]]]] = {
+    "step": (STEP_TEMPLATE, step_fields),
+    "build": (BUILD_TEMPLATE, build_fields),
+    "task": (TASK_TEMPLATE, task_fields),
+    "command": (COMMAND_TEMPLATE, command_fields),
+}
+
+
+@lru_cache(maxsize=None)
+def compiled(kind: str) -> CompiledTemplate:
+    """The compiled template for kind, built on first use"""
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown context template: {kind}")
+    source, _ = TEMPLATES[kind]
+    return CompiledTemplate(source, static_fragments())
+
+
+def template_id(kind: str) -> str:
+    """prefix_id() plus a short hash of kind's template, e.g. 'v1:3f2a9c0d41be:8e1f03aa'"""
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown context template: {kind}")
+    digest = hashlib.sha256(TEMPLATES[kind][0].encode("utf-8")).hexdigest()
+    return f"{prefix_id()}:{digest[:8]}"
+
+
+def render_context(kind: str, context: Dict) -> str:
+    """Render one context ('step', 'build', 'task' or 'command')"""
+    template = compiled(kind)
+    return template.render(TEMPLATES[kind][1](context))
+
+
+def render_batch(kind: str, contexts: Iterable[Dict]) -> List[str]:
+    """Render many contexts (e.g. every step of a project, or many projects) at once"""
+    template = compiled(kind)
+    fields = TEMPLATES[kind][1]
+    return [template.render(fields(context)) for context in contexts]
+
+
+def describe_layout(text: str) -> Dict[str, object]:
+    """Split a rendered context into prefix / facts / step segments
+
+    Returns the prefix id (None when the context does not start with the
+    current prefix), a short hash of the project facts block, and byte sizes.
+    """
+    data = text.encode("utf-8")
+    prefix = static_prefix().encode("utf-8")
+    if data.startswith(prefix):
+        prefix_label = prefix_id()
+        prefix_bytes = len(prefix)
+    else:
+        prefix_label = None
+        prefix_bytes = 0
+
+    rest = data[prefix_bytes:]
+    end = rest.find(SECTION_BREAK.encode("utf-8"))
+    facts = rest[:end] if prefix_label and end >= 0 else b""
+    return {
+        "prefix": prefix_label,
+        "prefix_bytes": prefix_bytes,
+        "facts": hashlib.sha256(facts).hexdigest()[:12] if facts else None,
+        "facts_bytes": len(facts),
+        "total_bytes": len(data),
+    }
+
+
+def context_files(project_path: Path) -> List[Path]:
+    """Generated context files of a project, in step order where possible"""
+    speckit = Path(project_path) / ".speckit"
+    files = sorted(speckit.glob("context-*.md"), key=lambda p: p.stat().st_mtime)
+    build = speckit / "launcher-context.md"
+    if build.exists():
+        files.append(build)
+    return files
+
+
+def layout_report(project_paths: Iterable[Path]) -> List[Dict[str, object]]:
+    """describe_layout for every generated context in the given projects"""
+    rows = []
+    for project_path in project_paths:
+        for path in context_files(project_path):
+            try:
+                text = path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            row = describe_layout(text)
+            row["file"] = str(path)
+            rows.append(row)
+    return rows
@@ -0,0 +1,436 @@
+"""
+Parallel task executor
+Runs the open tasks of tasks.md as a DAG: up to N agents at once, each in its
+own git worktree, with results merged back into the project in task order.
+
+For every task the executor:
+1. waits until its prerequisites (see core.tasks) are merged
+2. creates a worktree on branch here-spec/tasks/<ID> from the current HEAD
+3. runs the agent there with a task-specific context file
+4. commits whatever the agent changed
+5. once every earlier task has been merged (or has failed), merges the branch
+   with --no-ff, checks the task off in tasks.md in the same merge commit and
+   removes the worktree
+
+The project's checkout must have no uncommitted changes to tracked files,
+since every merge lands in it. A failed agent, a failed commit or merge, or a
+merge conflict marks the task failed, and a task whose agent changed nothing
+is reported as not implemented; tasks that depend on either are skipped.
+Whenever a failed task's agent changed files, its worktree and branch are
+kept (and named in the result) so the work can be finished by hand.
+Progress is reported per task through a callback so callers can checkpoint
+it.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import shlex
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, IO, List, Optional, Set
+
+from here_spec.agents.context import render_context
+from here_spec.agents.runner import agent_timeout, run_agent_async
+from here_spec.core.paths import cache_dir, load_config
+from here_spec.core.tasks import Task, TaskGraph
+
+BRANCH_PREFIX = "here-spec/tasks/"
+
+# Terminal states reported through the progress callback
+MERGED = "merged"
+FAILED = "failed"
+CONFLICT = "conflict"
+NO_CHANGES = "no-changes"
+SKIPPED = "skipped"
+RUNNING = "running"
+_RAN = "ran"  # agent finished; waiting for its turn to merge
+
+CommandFactory = Callable[[Path, Task], List[str]]
+ProgressCallback = Callable[[str, str, Dict], None]
+
+
+class GitError(RuntimeError):
+    """A git command failed"""
+
+
+def build_workers() -> int:
+    """$HERE_SPEC_BUILD_WORKERS, else config "build_workers", else 1"""
+    value = os.environ.get("HERE_SPEC_BUILD_WORKERS") or load_config().get("build_workers")
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+def command_override() -> Optional[CommandFactory]:
+    """Command from $HERE_SPEC_TASK_AGENT ('my-agent --ctx {context} {task}'), if set"""
+    template = os.environ.get("HERE_SPEC_TASK_AGENT")
+    if not template:
+        return None
+
+    def factory(context_file: Path, task: Task) -> List[str]:
+        return [
+            part.replace("{context}", str(context_file)).replace("{task}", task.id)
+            for part in shlex.split(template)
+        ]
+
+    return factory
+
+
+@dataclass
+class TaskResult:
+    task_id: str
+    status: str
+    returncode: Optional[int] = None
+    duration: float = 0.0
+    commit: Optional[str] = None
+    log_path: Optional[Path] = None
+    detail: str = ""
+    changed: bool = False  # the agent left changes that a failure must not discard
+
+
+class _Prefixed:
+    """Writes every line of agent output with a [T001] prefix"""
+
+    def __init__(self, sink: IO[str], prefix: str):
+        self.sink = sink
+        self.prefix = prefix
+
+    def write(self, text: str):
+        self.sink.write(f"{self.prefix}{text}")
+
+    def flush(self):
+        self.sink.flush()
+
+
+async def _git(cwd: Path, *args: str, check: bool = True) -> str:
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await proc.communicate()
+    if check and proc.returncode != 0:
+        raise GitError(f"git {' '.join(args)}: {err.decode(errors='replace').strip()}")
+    return out.decode(errors="replace").strip()
+
+
+def _tick(tasks_file: Path, task_id: str) -> bool:
+    """Check task_id's box in tasks_file; False if the line is not found"""
+    text = tasks_file.read_text(encoding="utf-8")
+    pattern = re.compile(rf"^(\s*[-*]\s+)\[ \](\s+{re.escape(task_id)}\b)", re.M)
+    updated, count = pattern.subn(r"\1[x]\2", text, count=1)
+    if count:
+        tasks_file.write_text(updated, encoding="utf-8")
+    return bool(count)
+
+
+class ParallelExecutor:
+    """DAG scheduler for the open tasks of one tasks.md"""
+
+    def __init__(
+        self,
+        project_path: Path,
+        graph: TaskGraph,
+        tasks_file: Path,
+        command_factory: CommandFactory,
+        workers: int = 2,
+        context: Optional[Dict] = None,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        stdout: Optional[IO[str]] = None,
+    ):
+        self.project_path = Path(project_path).resolve()
+        self.graph = graph
+        self.tasks_file = Path(tasks_file).resolve()
+        self.command_factory = command_factory
+        self.workers = max(1, workers)
+        self.context = context or {}
+        self.progress = progress or (lambda task_id, status, info: None)
+        self.timeout = agent_timeout() if timeout is None else timeout
+        self.stdout = stdout or sys.stdout
+        self.results: Dict[str, TaskResult] = {}
+        self.stats = {"max_concurrency": 0}
+        self.interrupted = False
+
+    # Setup
+
+    async def _prepare(self):
+        self.repo = Path(await _git(self.project_path, "rev-parse", "--show-toplevel")).resolve()
+        self.subdir = self.project_path.relative_to(self.repo)
+        digest = hashlib.sha1(str(self.repo).encode()).hexdigest()[:12]
+        self.worktree_root = cache_dir() / "worktrees" / digest
+        self.context_dir = self.project_path / ".speckit" / "tasks"
+        self.log_dir = self.project_path / ".speckit" / "logs"
+        self.context_dir.mkdir(parents=True, exist_ok=True)
+        self.git_lock = asyncio.Lock()
+        # Merges go into this checkout: staged or modified files would either
+        # fail every merge or end up in a task's merge commit
+        if await _git(self.repo, "status", "--porcelain", "--untracked-files=no"):
+            raise GitError(f"{self.repo} has uncommitted changes")
+
+    # Scheduling
+
+    def _blocked_by(self, task: Task, settled: Set[str]) -> Optional[str]:
+        """A failed/skipped prerequisite of task, if any"""
+        for dep in self.graph.prerequisites(task.id):
+            result = self.results.get(dep)
+            if dep in settled and result is not None and result.status != MERGED:
+                return dep
+        return None
+
+    async def run_async(self, task_ids: Optional[List[str]] = None) -> List[TaskResult]:
+        """Run the given open tasks (default: every open task) and merge them"""
+        await self._prepare()
+        wanted = set(task_ids) if task_ids is not None else None
+        order = [
+            t for t in self.graph.tasks if not t.done and (wanted is None or t.id in wanted)
+        ]
+        merged: Set[str] = {t.id for t in self.graph.tasks if t.done}
+        settled: Set[str] = set(merged)  # merged, failed or skipped
+        finished: Dict[str, TaskResult] = {}  # ran, waiting for its turn to merge
+        started: Set[str] = set()
+        running: Dict[asyncio.Task, str] = {}
+        next_merge = 0
+
+        try:
+            while next_merge < len(order):
+                # Skip tasks whose prerequisites failed
+                for task in order:
+                    if task.id in started or task.id in settled:
+                        continue
+                    blocker = self._blocked_by(task, settled)
+                    if blocker:
+                        started.add(task.id)
+                        finished[task.id] = TaskResult(
+                            task.id, SKIPPED, detail=f"{blocker} did not merge"
+                        )
+
+                # Dispatch ready tasks
+                for task in order:
+                    if len(running) >= self.workers:
+                        break
+                    if task.id in started:
+                        continue
+                    if all(dep in merged for dep in self.graph.prerequisites(task.id)):
+                        started.add(task.id)
+                        job = asyncio.ensure_future(self._run_task(task))
+                        running[job] = task.id
+                        self.progress(task.id, RUNNING, {})
+                self.stats["max_concurrency"] = max(self.stats["max_concurrency"], len(running))
+
+                # Merge everything that is next in line
+                progressed = False
+                while next_merge < len(order) and order[next_merge].id in finished:
+                    task = order[next_merge]
+                    result = finished.pop(task.id)
+                    if result.status == _RAN:
+                        result = await self._merge(task, result)
+                    else:
+                        await self._discard(task, result)
+                    self.results[task.id] = result
+                    settled.add(task.id)
+                    if result.status == MERGED:
+                        merged.add(task.id)
+                    self.progress(task.id, result.status, self._info(result))
+                    next_merge += 1
+                    progressed = True
+                if progressed:
+                    continue
+
+                if not running:
+                    # Nothing running and nothing mergeable: remaining tasks wait
+                    # on tasks outside this run.
+                    for task in order[next_merge:]:
+                        if task.id not in self.results:
+                            result = TaskResult(task.id, SKIPPED, detail="prerequisites not met")
+                            self.results[task.id] = result
+                            self.progress(task.id, SKIPPED, self._info(result))
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for job in done:
+                    finished[running.pop(job)] = job.result()
+        finally:
+            for job in running:
+                job.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return [self.results[t.id] for t in order if t.id in self.results]
+
+    def run(self, task_ids: Optional[List[str]] = None) -> List[TaskResult]:
+        """Blocking wrapper; Ctrl+C stops every running agent and returns what merged"""
+
+        async def main():
+            runner = asyncio.ensure_future(self.run_async(task_ids))
+            loop = asyncio.get_running_loop()
+            try:
+                loop.add_signal_handler(signal.SIGINT, runner.cancel)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+            try:
+                return await runner
+            except asyncio.CancelledError:
+                self.interrupted = True
+                return list(self.results.values())
+            finally:
+                try:
+                    loop.remove_signal_handler(signal.SIGINT)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+
+        return asyncio.run(main())
+
+    @staticmethod
+    def _info(result: TaskResult) -> Dict:
+        info = {"duration": round(result.duration, 3)}
+        if result.commit:
+            info["commit"] = result.commit
+        if result.returncode is not None:
+            info["returncode"] = result.returncode
+        if result.detail:
+            info["detail"] = result.detail
+        if result.log_path:
+            info["log"] = str(result.log_path)
+        return info
+
+    # One task
+
+    def _worktree(self, task: Task) -> Path:
+        return self.worktree_root / task.id
+
+    async def _run_task(self, task: Task) -> TaskResult:
+        """Run the agent for task in a fresh worktree and commit its changes"""
+        branch = BRANCH_PREFIX + task.id
+        worktree = self._worktree(task)
+        started = time.monotonic()
+
+        async with self.git_lock:
+            if await self._has_work(task):
+                return TaskResult(
+                    task.id,
+                    FAILED,
+                    detail=self._kept(task, "an earlier attempt's work is still there"),
+                    changed=True,
+                )
+            if worktree.exists():
+                await _git(self.repo, "worktree", "remove", "--force", str(worktree), check=False)
+            await _git(self.repo, "worktree", "prune", check=False)
+            worktree.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                await _git(self.repo, "worktree", "add", "-B", branch, str(worktree), "HEAD")
+            except GitError as e:
+                return TaskResult(task.id, FAILED, detail=str(e))
+
+        context_file = self.context_dir / f"{task.id}.md"
+        rel_tasks = self.tasks_file.relative_to(self.repo).as_posix()
+        context = dict(self.context, task=task, tasks_file=rel_tasks)
+        context_file.write_text(render_context("task", context), encoding="utf-8")
+
+        log_path = self.log_dir / f"task-{task.id}-{time.strftime('%Y%m%d-%H%M%S')}.log"
+        sink = _Prefixed(self.stdout, f"[{task.id}] ")
+        try:
+            outcome = await run_agent_async(
+                self.command_factory(context_file, task),
+                cwd=worktree / self.subdir,
+                log_path=log_path,
+                timeout=self.timeout,
+                stream=True,
+                stdout=sink,
+                stderr=sink,
+                handle_sigint=False,
+            )
+        except FileNotFoundError as e:
+            return TaskResult(task.id, FAILED, detail=f"agent not found: {e.filename}")
+
+        duration = time.monotonic() - started
+        result = TaskResult(task.id, FAILED, outcome.returncode, duration, log_path=log_path)
+        if outcome.timed_out:
+            result.detail = "timed out"
+        elif not outcome.ok:
+            result.detail = f"agent exited {outcome.returncode}"
+        else:
+            try:
+                result.commit = await self._commit(task, worktree)
+                result.status = _RAN if result.commit else NO_CHANGES
+                result.changed = bool(result.commit)
+                if not result.commit:
+                    result.detail = "the agent changed nothing"
+                return result
+            except GitError as e:
+                result.detail = str(e)
+        if await self._has_work(task):
+            result.changed = True
+            result.detail = self._kept(task, result.detail)
+        return result
+
+    async def _has_work(self, task: Task) -> bool:
+        """Whether task's worktree or branch holds changes not in HEAD"""
+        worktree = self._worktree(task)
+        if worktree.exists() and await _git(worktree, "status", "--porcelain", check=False):
+            return True
+        branch = BRANCH_PREFIX + task.id
+        if not await _git(self.repo, "rev-parse", "--verify", "-q", branch, check=False):
+            return False
+        return bool(await _git(self.repo, "rev-list", "-1", f"HEAD..{branch}", check=False))
+
+    def _kept(self, task: Task, detail: str) -> str:
+        where = f"work kept in {self._worktree(task)} on branch {BRANCH_PREFIX + task.id}"
+        return f"{detail}; {where}" if detail else where
+
+    async def _commit(self, task: Task, worktree: Path) -> Optional[str]:
+        """Commit the agent's changes in worktree; None if it changed nothing"""
+        await _git(worktree, "add", "-A")
+        status = await _git(worktree, "status", "--porcelain")
+        commit = None
+        if status:
+            message = f"{task.id}: {task.description}"
+            await _git(worktree, "commit", "-q", "-m", message)
+            commit = await _git(worktree, "rev-parse", "HEAD")
+        return commit
+
+    async def _discard(self, task: Task, result: TaskResult):
+        async with self.git_lock:
+            await self._clean_up(task, result)
+
+    async def _clean_up(self, task: Task, result: TaskResult):
+        """Remove task's worktree and branch unless they hold unmerged work (git_lock held)"""
+        if result.changed and result.status != MERGED:
+            return
+        worktree = self._worktree(task)
+        if worktree.exists():
+            await _git(self.repo, "worktree", "remove", "--force", str(worktree), check=False)
+        await _git(self.repo, "branch", "-D", BRANCH_PREFIX + task.id, check=False)
+
+    async def _merge(self, task: Task, result: TaskResult) -> TaskResult:
+        """Merge task's branch into the project and check it off in tasks.md"""
+        branch = BRANCH_PREFIX + task.id
+        async with self.git_lock:
+            try:
+                try:
+                    await _git(self.repo, "merge", "--no-ff", "--no-commit", branch)
+                except GitError as e:
+                    await _git(self.repo, "merge", "--abort", check=False)
+                    result.status, result.detail = CONFLICT, self._kept(task, str(e))
+                    return result
+                if _tick(self.tasks_file, task.id):
+                    await _git(self.repo, "add", str(self.tasks_file))
+                message = f"Merge {task.id}: {task.description}"
+                await _git(self.repo, "commit", "-q", "-m", message)
+                result.status = MERGED
+                return result
+            except GitError as e:
+                await _git(self.repo, "merge", "--abort", check=False)
+                result.status, result.detail = FAILED, self._kept(task, str(e))
+                return result
+            finally:
+                # Unless merged, the agent's commit is only reachable from its branch
+                await self._clean_up(task, result)
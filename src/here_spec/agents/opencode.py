@@ -3,14 +3,18 @@ Opencode Launcher (Free Tier Support)
 Launches Opencode with interview context
 """
 
-import subprocess
 import sys
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 from rich.console import Console
 from rich.prompt import Confirm
 
-from here_spec.art.dog_art import get_spec_personality
+from here_spec.agents.budget import budget_warnings, fit_context, record_usage
+from here_spec.agents.context import render_context
+from here_spec.agents.runner import AgentRunResult, agent_log_path, run_agent
+from here_spec.core.artifacts import build_artifact_context
+from here_spec.core.generated import GeneratedFiles
+from here_spec.core.metrics import Measurement, measure
 
 console = Console()
 
@@ -18,24 +22,33 @@ console = Console()
 class OpencodeLauncher:
     """Launches Opencode with pre-loaded interview context"""
 
-    def launch_for_step(self, context: Dict, project_path: Path):
+    def launch_for_step(self, context: Dict, project_path: Path) -> Optional[AgentRunResult]:
         """Launch Opencode for a specific step"""
         step = context.get("step", "unknown")
         command = context.get("next_command", "/speckit.help")
 
+        meter = Measurement(project_path, step, "context")
+
         # Build step-specific context
-        step_context = self._build_step_context(context)
+        fitted = fit_context("step", context)
+        step_context = fitted.text
+        for note in budget_warnings(fitted):
+            console.print(f"[yellow]✂️  {note}[/yellow]")
 
         # Save context file
         context_file = project_path / ".speckit" / f"context-{step}.md"
-        context_file.parent.mkdir(exist_ok=True)
-        with open(context_file, "w") as f:
-            f.write(step_context)
-
-        console.print(f"[dim]Context saved to {context_file}[/dim]")
+        generated = GeneratedFiles(project_path)
+        if generated.write(context_file, step_context):
+            console.print(f"[dim]Context saved to {context_file}[/dim]")
+        else:
+            console.print(f"[dim]Context unchanged: {context_file}[/dim]")
 
         # Generate agent command files
-        self._generate_agent_files(context, project_path)
+        self._generate_agent_files(context, project_path, generated)
+        record_usage(generated, project_path, fitted)
+        generated.save()
+        console.print(f"[dim]Generated files: {generated.summary()}[/dim]")
+        meter.stop(bytes_generated=generated.stats["bytes_written"], tokens=fitted.tokens)
 
         # Check if we're in an interactive terminal
         if not sys.stdin.isatty():
@@ -50,33 +63,54 @@ class OpencodeLauncher:
         console.print(f"\n[bold green]🚀 Launching Opencode for {step}...[/bold green]\n")
 
         try:
-            subprocess.run(
-                ["opencode", "--prompt", str(context_file.absolute())],
-                check=True,
-                cwd=str(project_path),
-            )
+            with measure(project_path, step, "agent") as metrics:
+                result = run_agent(
+                    ["opencode", "--prompt", str(context_file.absolute())],
+                    cwd=project_path,
+                    log_path=agent_log_path(project_path, step),
+                )
+                metrics["returncode"] = result.returncode
         except FileNotFoundError:
             console.print("[red]❌ Opencode not found![/red]")
             console.print("[yellow]Install: npm install -g opencode-ai[/yellow]")
             console.print("[yellow]Then: opencode auth login[/yellow]")
-        except subprocess.CalledProcessError:
+            return
+
+        if result.timed_out:
+            console.print(
+                f"\n[yellow]⏱️  Opencode stopped after {result.duration:.0f}s (timeout)[/yellow]"
+            )
+        elif result.returncode != 0:
             console.print(f"\n[yellow]👋 Opencode session ended[/yellow]")
+        if result.log_path:
+            console.print(f"[dim]Agent log: {result.log_path}[/dim]")
+        return result
 
-    def launch(self, context: Dict, project_path: Path):
+    def launch(self, context: Dict, project_path: Path) -> Optional[AgentRunResult]:
         """Launch Opencode for the final build step"""
+        meter = Measurement(project_path, "build", "context")
+
         # Build full context
-        build_context = self._build_build_context(context)
+        context = dict(context, artifacts=build_artifact_context(project_path))
+        fitted = fit_context("build", context)
+        build_context = fitted.text
+        for note in budget_warnings(fitted):
+            console.print(f"[yellow]✂️  {note}[/yellow]")
 
         # Save context file
         context_file = project_path / ".speckit" / "launcher-context.md"
-        context_file.parent.mkdir(exist_ok=True)
-        with open(context_file, "w") as f:
-            f.write(build_context)
-
-        console.print(f"[dim]Context saved to {context_file}[/dim]")
+        generated = GeneratedFiles(project_path)
+        if generated.write(context_file, build_context):
+            console.print(f"[dim]Context saved to {context_file}[/dim]")
+        else:
+            console.print(f"[dim]Context unchanged: {context_file}[/dim]")
 
         # Generate agent command files
-        self._generate_agent_files(context, project_path)
+        self._generate_agent_files(context, project_path, generated)
+        record_usage(generated, project_path, fitted)
+        generated.save()
+        console.print(f"[dim]Generated files: {generated.summary()}[/dim]")
+        meter.stop(bytes_generated=generated.stats["bytes_written"], tokens=fitted.tokens)
 
         # Check if we're in an interactive terminal
         if not sys.stdin.isatty():
@@ -93,126 +127,52 @@ class OpencodeLauncher:
         console.print("\n[bold green]🚀 Launching Opencode...[/bold green]\n")
 
         try:
-            subprocess.run(
-                ["opencode", "--prompt", str(context_file.absolute())],
-                check=True,
-                cwd=str(project_path),
-            )
+            with measure(project_path, "build", "agent") as metrics:
+                result = run_agent(
+                    ["opencode", "--prompt", str(context_file.absolute())],
+                    cwd=project_path,
+                    log_path=agent_log_path(project_path, "build"),
+                )
+                metrics["returncode"] = result.returncode
         except FileNotFoundError:
             console.print("[red]❌ Opencode not found![/red]")
             console.print("[yellow]Install: npm install -g opencode-ai[/yellow]")
             console.print("[yellow]Then: opencode auth login[/yellow]")
-        except subprocess.CalledProcessError:
+            return
+
+        if result.timed_out:
+            console.print(
+                f"\n[yellow]⏱️  Opencode stopped after {result.duration:.0f}s (timeout)[/yellow]"
+            )
+            console.print("[dim]Run 'here-spec continue' to resume[/dim]")
+        elif result.returncode != 0:
             console.print("\n[yellow]👋 Opencode session ended[/yellow]")
             console.print("[dim]Run 'here-spec continue' to resume[/dim]")
+        if result.log_path:
+            console.print(f"[dim]Agent log: {result.log_path}[/dim]")
+        return result
+
+    def task_command(self, context_file: Path, task) -> List[str]:
+        """Non-interactive command for one task of a parallel build"""
+        prompt = f"Implement task {task.id} as described in your instructions."
+        return ["opencode", "run", "--prompt", str(context_file.absolute()), prompt]
 
     def _build_step_context(self, context: Dict) -> str:
         """Build context for a specific step"""
-        step = context.get("step", "unknown")
-        command = context.get("next_command", "/speckit.help")
-        answers = context.get("answers", {})
-
-        lines = [
-            f"# Step: {step.title()}",
-            "",
-            f"**Project**: {context.get('project_name', 'Unnamed')}",
-            f"**Step**: {step}",
-            f"**Command**: {command}",
-            "",
-            "## Context from Interview",
-            f"**Description**: {answers.get('big_picture', 'N/A')}",
-            f"**Audience**: {answers.get('audience', 'N/A')}",
-            f"**Features**: {answers.get('features', 'N/A')}",
-            f"**Quality**: {answers.get('quality_level', 'production')}",
-            "",
-            "## Your Task",
-            f"Run: {command}",
-            "",
-            "Use the interview context above to inform your work.",
-            "",
-            "---",
-            "",
-            get_spec_personality(),
-            "",
-            "## Communication Style",
-            "",
-            "Throughout this process:",
-            "- Show enthusiasm and encouragement! 🐕",
-            "- Use small ASCII art like (◕‿◕)🐕 or 🐕💭 occasionally",
-            "- Celebrate small wins and milestones",
-            "- Keep the tone friendly and supportive",
-            "- Make the user feel capable and supported",
-            "",
-            "Remember: You're Spec, their loyal development companion!",
-        ]
-
-        return "\n".join(lines)
+        return fit_context("step", context).text
 
     def _build_build_context(self, context: Dict) -> str:
         """Build full context for the build step"""
-        answers = context.get("answers", {})
-        completed = context.get("completed_steps", [])
-
-        lines = [
-            "# Spec Kit Assistant - Build Context",
-            "",
-            f"**Project**: {context.get('project_name', 'Unnamed Project')}",
-            f"**Completed Steps**: {', '.join(completed) if completed else 'None'}",
-            "",
-            "## Project Details",
-            f"**Description**: {answers.get('big_picture', 'N/A')}",
-            f"**Audience**: {answers.get('audience', 'N/A')}",
-            f"**Features**: {answers.get('features', 'N/A')}",
-            f"**Constraints**: {', '.join(answers.get('constraints', [])) or 'None'}",
-            f"**Tech Stack**: {answers.get('tech_stack', 'auto')}",
-            f"**Quality Level**: {answers.get('quality_level', 'production')}",
-            "",
-            "## Your Task",
-            "Implement the project based on the specification and plan.",
-            "Run: /speckit.implement",
-            "",
-            "All previous steps (constitution, spec, plan, tasks) should be complete.",
-            "",
-            "---",
-            "",
-            get_spec_personality(),
-            "",
-            "## Implementation Notes",
-            "",
-            "This is the big moment! (◕‿◕)🐕",
-            "",
-            "As you implement:",
-            "- Show progress updates with enthusiasm!",
-            "- Use small ASCII art like (◕‿◕)🐕 or 🐕✨ for milestones",
-            "- Celebrate when modules are completed",
-            "- Encourage the user throughout the process",
-            "- Make it feel like a collaborative journey",
-            "",
-            "The user has been guided through all the preparation steps",
-            "and now trusts you to bring their vision to life!",
-            "",
-            "Let's build something amazing together! 🐕✨",
-        ]
-
-        return "\n".join(lines)
-
-    def _generate_agent_files(self, context: Dict, project_path: Path):
+        return fit_context("build", context).text
+
+    def _generate_agent_files(
+        self, context: Dict, project_path: Path, generated: Optional[GeneratedFiles] = None
+    ):
         """Generate .opencode/commands/ files"""
         opencode_dir = project_path / ".opencode" / "commands"
-        opencode_dir.mkdir(parents=True, exist_ok=True)
-
         command_file = opencode_dir / "interview-context.md"
-        with open(command_file, "w") as f:
-            f.write(f"""---
-description: Show project context
----
-
-# Project Context
-
-Name: {context.get("project_name", "N/A")}
-Step: {context.get("step", "N/A")}
-
-Full context in .speckit/checkpoints.json
-""")
-
-        console.print(f"[dim]Created agent command: {command_file}[/dim]")
+        writer = generated or GeneratedFiles(project_path)
+        if writer.write(command_file, render_context("command", context)):
+            console.print(f"[dim]Created agent command: {command_file}[/dim]")
+        if generated is None:
+            writer.save()
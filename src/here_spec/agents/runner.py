@@ -0,0 +1,235 @@
+"""
+Agent Runner
+asyncio core that the launchers use to run an agent CLI
+
+Two modes:
+- interactive (stdout is a terminal): the agent inherits our stdio and stays
+  in our process group, so it owns the terminal and receives Ctrl+C itself;
+  here-spec just waits without dying on that Ctrl+C.
+- streaming (stdout redirected, or HERE_SPEC_AGENT_STREAM=1): the agent runs in
+  its own process group with piped output that is relayed line by line to
+  our stdout/stderr and to a log file. Ctrl+C is forwarded to the agent; a
+  second Ctrl+C terminates it.
+
+Both modes support a wall-clock timeout ($HERE_SPEC_AGENT_TIMEOUT) and clean
+cancellation: the agent is sent SIGTERM, then SIGKILL after a grace period.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import IO, List, Optional
+
+from here_spec.core.profiling import agent_wait
+
+TERMINATE_GRACE = 5.0
+LINE_LIMIT = 1024 * 1024
+
+
+class AgentRunResult:
+    """Outcome of one agent run"""
+
+    def __init__(
+        self,
+        returncode: Optional[int],
+        duration: float,
+        timed_out: bool = False,
+        interrupted: bool = False,
+        log_path: Optional[Path] = None,
+    ):
+        self.returncode = returncode
+        self.duration = duration
+        self.timed_out = timed_out
+        self.interrupted = interrupted
+        self.log_path = log_path
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    def __repr__(self) -> str:
+        return (
+            f"AgentRunResult(returncode={self.returncode}, duration={self.duration:.2f}, "
+            f"timed_out={self.timed_out}, interrupted={self.interrupted})"
+        )
+
+
+def agent_timeout() -> Optional[float]:
+    """Wall-clock limit from $HERE_SPEC_AGENT_TIMEOUT (seconds), None if unset"""
+    value = os.environ.get("HERE_SPEC_AGENT_TIMEOUT")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def should_stream() -> bool:
+    flag = os.environ.get("HERE_SPEC_AGENT_STREAM", "").strip().lower()
+    if flag in {"1", "true", "yes", "on"}:
+        return True
+    if flag in {"0", "false", "no", "off"}:
+        return False
+    return not sys.stdout.isatty()
+
+
+def _signal_group(proc: asyncio.subprocess.Process, sig: int, own_group: bool):
+    try:
+        if own_group and os.name == "posix":
+            os.killpg(proc.pid, sig)
+        else:
+            proc.send_signal(sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _terminate(proc: asyncio.subprocess.Process, own_group: bool):
+    if proc.returncode is not None:
+        return
+    _signal_group(proc, signal.SIGTERM, own_group)
+    try:
+        await asyncio.wait_for(proc.wait(), TERMINATE_GRACE)
+    except asyncio.TimeoutError:
+        _signal_group(proc, signal.SIGKILL, own_group)
+        await proc.wait()
+
+
+async def _relay(stream: asyncio.StreamReader, sink: IO[str], log: Optional[IO[str]], tag: str):
+    while True:
+        try:
+            raw = await stream.readline()
+        except ValueError:  # line longer than LINE_LIMIT: pass it through in chunks
+            raw = await stream.read(LINE_LIMIT)
+        if not raw:
+            return
+        line = raw.decode(errors="replace")
+        sink.write(line)
+        sink.flush()
+        if log is not None:
+            log.write(f"[{tag}] {line}" if line.endswith("\n") else f"[{tag}] {line}\n")
+            log.flush()
+
+
+async def run_agent_async(
+    argv: List[str],
+    cwd: Path,
+    log_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    stream: bool = True,
+    stdout: Optional[IO[str]] = None,
+    stderr: Optional[IO[str]] = None,
+    handle_sigint: bool = True,
+) -> AgentRunResult:
+    """
+    Run an agent process to completion.
+    Raises FileNotFoundError if the agent binary does not exist.
+    Callers running several agents at once pass handle_sigint=False and
+    cancel the runs themselves on Ctrl+C.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    started = time.monotonic()
+    own_group = stream and os.name == "posix"
+
+    if stream:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=str(cwd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=own_group,
+            limit=LINE_LIMIT,
+        )
+    else:
+        proc = await asyncio.create_subprocess_exec(*argv, cwd=str(cwd))
+
+    loop = asyncio.get_running_loop()
+    interrupts = 0
+
+    def on_sigint():
+        nonlocal interrupts
+        interrupts += 1
+        if not own_group:
+            return  # the agent shares our terminal and already got this Ctrl+C
+        if interrupts == 1:
+            _signal_group(proc, signal.SIGINT, own_group)
+        else:
+            _signal_group(proc, signal.SIGTERM, own_group)
+
+    handler_installed = False
+    if handle_sigint:
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_sigint)
+            handler_installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # not the main thread, or no signal support on this platform
+
+    log = None
+    timed_out = False
+    try:
+        if stream:
+            if log_path is not None:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                log = open(log_path, "a", encoding="utf-8")
+                log.write(f"# {' '.join(argv)}\n")
+            relays = asyncio.gather(
+                _relay(proc.stdout, stdout, log, "out"),
+                _relay(proc.stderr, stderr, log, "err"),
+            )
+            waiter = asyncio.gather(relays, proc.wait())
+        else:
+            waiter = proc.wait()
+
+        try:
+            with agent_wait():
+                await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            await _terminate(proc, own_group)
+    except asyncio.CancelledError:
+        await _terminate(proc, own_group)
+        raise
+    finally:
+        if handler_installed:
+            loop.remove_signal_handler(signal.SIGINT)
+        if log is not None:
+            log.write(f"# exit {proc.returncode}{' (timeout)' if timed_out else ''}\n")
+            log.close()
+
+    return AgentRunResult(
+        proc.returncode,
+        time.monotonic() - started,
+        timed_out=timed_out,
+        interrupted=interrupts > 0,
+        log_path=log_path if stream else None,
+    )
+
+
+def run_agent(
+    argv: List[str],
+    cwd: Path,
+    log_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    stream: Optional[bool] = None,
+) -> AgentRunResult:
+    """Blocking wrapper used by the launchers (timeout/stream default from env)"""
+    return asyncio.run(
+        run_agent_async(
+            argv,
+            cwd,
+            log_path=log_path,
+            timeout=agent_timeout() if timeout is None else timeout,
+            stream=should_stream() if stream is None else stream,
+        )
+    )
+
+
+def agent_log_path(project_path: Path, name: str) -> Path:
+    """Per-run log file under .speckit/logs/"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return project_path / ".speckit" / "logs" / f"{name}-{stamp}.log"
@@ -0,0 +1,265 @@
+"""
+Step artifact cache
+Opt-in reuse of the constitution and spec generated for earlier projects with
+the same answers, so identical projects do not each pay for an agent run.
+
+Entries are keyed by a hash of the step, its context template version and the
+normalized answers the step depends on (its own and those of the steps before
+it). Normalizing folds case and whitespace and sorts lists, so trivially
+different answers still hit. The project name is not part of the key: it is
+replaced by a placeholder when an artifact is stored and filled back in when
+it is restored.
+
+The cache directory may be shared between users or runners: entries are
+written atomically and statistics are appended as one JSON line per lookup.
+Because an entry may come from anyone with write access to it, restoring only
+writes paths the step itself could have produced, inside the project, and
+only replaces files that are missing or still the untouched spec-kit
+template unless the caller confirms. Feature artifacts (specs/<feature>/...)
+are stored under the source project's feature directory and restored into the
+current project's; a project without one is a miss.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from here_spec.agents.context import template_id
+from here_spec.core.artifacts import feature_dir
+from here_spec.core.fileio import atomic_write
+from here_spec.core.paths import cache_dir, load_config
+from here_spec.core.steps import STEP_ANSWERS, STEP_INPUTS, is_step_output, step_outputs
+
+CACHEABLE_STEPS = ("constitution", "spec")
+CACHE_VERSION = 1
+EVENTS_FILE = "events.jsonl"
+PROJECT_PLACEHOLDER = "{{here-spec:project_name}}"
+TEMPLATES_DIR = Path(".specify") / "templates"
+
+_OFF = {"", "0", "false", "no", "off"}
+_ON = {"1", "true", "yes", "on"}
+
+
+def step_cache_dir() -> Optional[Path]:
+    """Cache directory, or None when the cache is off (the default)
+
+    $HERE_SPEC_STEP_CACHE, else the config's "step_cache": a directory, or
+    1/true for <cache dir>/steps.
+    """
+    value = os.environ.get("HERE_SPEC_STEP_CACHE")
+    if value is None:
+        value = load_config().get("step_cache")
+    if value is None or value is False:
+        return None
+    text = str(value).strip()
+    if value is True or text.lower() in _ON:
+        return cache_dir() / "steps"
+    if text.lower() in _OFF:
+        return None
+    return Path(text).expanduser()
+
+
+def normalize_answer(value):
+    """Case- and whitespace-insensitive form of an answer (lists are sorted)"""
+    if isinstance(value, (list, tuple)):
+        return sorted(item for item in (normalize_answer(v) for v in value) if item)
+    if value is None:
+        return ""
+    return " ".join(str(value).split()).casefold().rstrip(".")
+
+
+def _answer_keys(step: str) -> List[str]:
+    """Answers step depends on: its own and those of every step it reads from"""
+    keys: List[str] = []
+    pending = [step]
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        keys.extend(k for k in STEP_ANSWERS[name] if not k.startswith("state."))
+        pending.extend(STEP_INPUTS[name])
+    return sorted(set(keys))
+
+
+def _is_template(project_path: Path, target: Path) -> bool:
+    """Whether target is still the spec-kit template it was created from"""
+    template = project_path / TEMPLATES_DIR / f"{target.stem}-template.md"
+    try:
+        return target.read_bytes() in (b"", template.read_bytes())
+    except OSError:
+        return False
+
+
+def cache_key(step: str, answers: Dict) -> str:
+    material = {
+        "version": CACHE_VERSION,
+        "step": step,
+        "template": template_id("step"),
+        "answers": {key: normalize_answer(answers.get(key)) for key in _answer_keys(step)},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+class StepCache:
+    """Generated artifacts by (step, template, normalized answers)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    @classmethod
+    def from_settings(cls) -> Optional["StepCache"]:
+        directory = step_cache_dir()
+        return cls(directory) if directory is not None else None
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _log(self, step: str, event: str, key: str, **extra):
+        record = {"step": step, "event": event, "key": key[:16], "at": time.time()}
+        line = json.dumps(dict(record, **extra))
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / EVENTS_FILE, "a") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+    def restore(
+        self,
+        step: str,
+        state: Dict,
+        project_path: Path,
+        confirm: Optional[Callable[[List[Path]], bool]] = None,
+    ) -> List[Path]:
+        """Copy a cached artifact set into project_path; [] on a miss
+
+        An entry with a path step could not have written, or one that resolves
+        outside project_path, is rejected. specs/<feature>/ paths are written
+        to project_path's own feature directory (see core.artifacts); without
+        one nothing is restored. Existing files other than an untouched
+        template are only overwritten if confirm(paths) agrees; otherwise
+        nothing is restored.
+        """
+        if step not in CACHEABLE_STEPS:
+            return []
+        key = cache_key(step, state.get("answers", {}))
+        try:
+            entry = json.loads(self._entry_path(key).read_text())
+        except (OSError, ValueError):
+            entry = None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            self.stats["misses"] += 1
+            self._log(step, "miss", key)
+            return []
+
+        root = Path(project_path).resolve()
+        feature = feature_dir(root)
+        files = entry.get("files")
+        targets = {}
+        reason = "rejected"
+        for rel, text in sorted(files.items() if isinstance(files, dict) else []):
+            if not (isinstance(text, str) and is_step_output(step, rel)):
+                targets = {}
+                break
+            parts = rel.split("/")
+            if parts[0] == "specs":
+                # Written by another project: use this project's feature directory
+                if feature is None:
+                    targets, reason = {}, "no feature directory"
+                    break
+                rel = "/".join(["specs", feature.name] + parts[2:])
+            target = (root / rel).resolve()
+            if not (root in target.parents and target.relative_to(root).as_posix() == rel):
+                targets = {}
+                break
+            targets[target] = (rel, text)
+        if not targets:
+            self.stats["misses"] += 1
+            self._log(step, "miss", key, reason=reason)
+            return []
+
+        changed = [t for t in targets if t.exists() and not _is_template(root, t)]
+        if changed and (confirm is None or not confirm(changed)):
+            self.stats["misses"] += 1
+            self._log(step, "miss", key, reason="existing files kept")
+            return []
+
+        project_name = state.get("project_name") or root.name
+        restored = []
+        for target, (rel, text) in targets.items():
+            atomic_write(target, text.replace(PROJECT_PLACEHOLDER, project_name).encode("utf-8"))
+            restored.append(Path(project_path) / rel)
+        self.stats["hits"] += 1
+        self._log(step, "hit", key)
+        return restored
+
+    def store(self, step: str, state: Dict, project_path: Path) -> bool:
+        """Save the artifacts step just generated; False if there were none"""
+        if step not in CACHEABLE_STEPS:
+            return False
+        project_path = Path(project_path)
+        outputs = step_outputs(project_path, step)
+        if not outputs:
+            return False
+        project_name = state.get("project_name") or project_path.name
+        files = {}
+        # Whole-word matches only, so a project called "app" leaves "application" alone
+        name_pattern = re.compile(rf"(?<![\w-]){re.escape(project_name)}(?![\w-])")
+        for path in outputs:
+            text = path.read_text(encoding="utf-8", errors="replace")
+            text = name_pattern.sub(lambda _: PROJECT_PLACEHOLDER, text)
+            files[path.relative_to(project_path).as_posix()] = text
+
+        key = cache_key(step, state.get("answers", {}))
+        entry = {"version": CACHE_VERSION, "step": step, "created_at": time.time(), "files": files}
+        atomic_write(self._entry_path(key), json.dumps(entry, indent=2).encode("utf-8"))
+        self.stats["stored"] += 1
+        self._log(step, "store", key)
+        return True
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Hits, misses and stores per step from the event log, plus entry counts"""
+        steps: Dict[str, Dict[str, int]] = {}
+        try:
+            with open(self.directory / EVENTS_FILE) as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            counts = steps.setdefault(event.get("step", "?"), {"hit": 0, "miss": 0, "store": 0})
+            if event.get("event") in counts:
+                counts[event["event"]] += 1
+        for path in self.directory.glob("*/*.json"):
+            try:
+                step = json.loads(path.read_text()).get("step", "?")
+            except (OSError, ValueError):
+                continue
+            counts = steps.setdefault(step, {"hit": 0, "miss": 0, "store": 0})
+            counts["entries"] = counts.get("entries", 0) + 1
+        return steps
+
+    def clear(self) -> int:
+        """Delete every entry and the event log; returns the number of entries removed"""
+        removed = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        try:
+            (self.directory / EVENTS_FILE).unlink()
+        except OSError:
+            pass
+        return removed
@@ -8,6 +8,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
+from functools import lru_cache
 import textwrap
 
 console = Console()
@@ -194,21 +195,37 @@ MICRO_ART = [
 ]
 
 
+@lru_cache(maxsize=None)
+def _logo_text() -> Text:
+    """SPEC_LOGO with its markup parsed once"""
+    return Text.from_markup(SPEC_LOGO)
+
+
+@lru_cache(maxsize=64)
+def _art_renderable(art_key: str, title: str, style: str):
+    art_text = DOG_ART.get(art_key, DOG_ART["happy"])
+    renderable = Align.left(art_text)
+    if title:
+        return Panel(renderable, title=title, border_style=style, padding=(1, 2))
+    return renderable
+
+
+def warm_art():
+    """Pre-build the logo and art panels (used by the here-spec daemon)"""
+    _logo_text()
+    for art_key in DOG_ART:
+        _art_renderable(art_key, "", "blue")
+
+
 def display_logo():
     """Display the full SPEC logo with pixel dog and cyan colors"""
-    console.print(SPEC_LOGO)
+    console.print(_logo_text())
     console.print()
 
 
 def display_art(art_key: str, title: str = "", style: str = "blue"):
     """Display ASCII art with optional title"""
-    art_text = DOG_ART.get(art_key, DOG_ART["happy"])
-    renderable = Align.left(art_text)
-
-    if title:
-        console.print(Panel(renderable, title=title, border_style=style, padding=(1, 2)))
-    else:
-        console.print(renderable)
+    console.print(_art_renderable(art_key, title, style))
 
 
 def display_welcome():
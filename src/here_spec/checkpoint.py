@@ -3,17 +3,31 @@ Checkpoint Manager - Progressive Questions Before Each Spec Kit Step
 Handles interview moments throughout the workflow, not just at the start
 """
 
-import json
+import shutil
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, List
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, IntPrompt, Confirm
 
 from here_spec.art.dog_art import display_art, display_micro_art, display_inline_tip
+from here_spec.core.state_store import JournaledStateStore
+
+if TYPE_CHECKING:
+    from here_spec.core.tasks import TaskGraph
 
 STATE_VERSION = 1
 
+# build_tasks statuses that mean the task's work is in the project
+DONE_TASK_STATUSES = ("merged", "done")
+
+
+def _stats_since(before: Dict, after: Dict) -> Dict:
+    """Counter increments between two stats snapshots"""
+    return {key: round(value - before.get(key, 0), 6) for key, value in after.items()}
+
 
 class CheckpointManager:
     """
@@ -26,23 +40,34 @@ class CheckpointManager:
         self.project_path = project_path
         self.auto_confirm = auto_confirm
         self.state_file = project_path / ".speckit" / "checkpoints.json"
+        self.store = JournaledStateStore(self.state_file)
         self.state = self._load_state()
+        self._batch_depth = 0
+        self._save_pending = False
+        self.write_stats = {
+            "save_requests": 0,
+            "flushes": 0,
+            "writes_skipped": 0,
+            "writes_coalesced": 0,
+        }
 
     def _load_state(self) -> Dict:
-        """Load checkpoint state with versioning + validation"""
+        """Load checkpoint state (snapshot + journal) with versioning + validation"""
         default_state = self._default_state()
-        if not self.state_file.exists():
-            return default_state
 
         try:
-            with open(self.state_file) as f:
-                data = json.load(f)
+            data = self.store.load()
         except Exception as exc:  # noqa: BLE001
+            # Our own writes are atomic, so this is outside damage: keep a copy
+            self._preserve_corrupt_state()
             self.console.print(
                 f"[yellow]⚠️  Could not read checkpoint file ({exc}). Resetting state.[/yellow]"
             )
             return default_state
 
+        if data is None:
+            return default_state
+
         if data.get("version") != STATE_VERSION:
             self.console.print(
                 "[yellow]⚠️  Checkpoint format changed. Resetting state (old version detected).[/yellow]"
@@ -55,14 +80,64 @@ class CheckpointManager:
         state["completed_steps"] = data.get("completed_steps") or []
         state["answers"] = data.get("answers") or {}
         state["agent"] = data.get("agent", "claude")
+        state["step_started_at"] = data.get("step_started_at")
+        state["build_tasks"] = data.get("build_tasks") or {}
+        state["build_tasks_digest"] = data.get("build_tasks_digest", "")
         return state
 
+    def _preserve_corrupt_state(self):
+        backup = self.state_file.with_name(self.state_file.name + ".corrupt")
+        try:
+            shutil.copyfile(self.state_file, backup)
+        except OSError:
+            pass
+
     def _save_state(self):
-        """Save checkpoint state"""
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Save checkpoint state (appends the change to the journal).
+        Inside batch() the write is deferred to the end of the batch.
+        """
+        self.write_stats["save_requests"] += 1
+        if self._batch_depth:
+            if self._save_pending:
+                self.write_stats["writes_coalesced"] += 1
+            self._save_pending = True
+            return
+        self._flush()
+
+    def _flush(self):
+        """
+        Write state if it differs from what is on disk.
+        Changes other processes saved meanwhile are merged into self.state.
+        """
+        self._save_pending = False
         self.state["version"] = STATE_VERSION
-        with open(self.state_file, "w") as f:
-            json.dump(self.state, f, indent=2)
+        if (
+            not self.state.get("step_started_at")
+            or self.state.get("current_step") != self.store.persisted_value("current_step")
+        ):
+            # When the project entered its current step (drives "stalled" in status --all)
+            self.state["step_started_at"] = time.time()
+        if not self.store.is_dirty(self.state):
+            self.write_stats["writes_skipped"] += 1
+            return
+        self.state = self.store.save(self.state)
+        self.write_stats["flushes"] += 1
+
+        from here_spec.core.workspace_index import record_project
+
+        record_project(self.project_path, self.state)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce every _save_state() in the block into one flush at its end"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._save_pending:
+                self._flush()
 
     def _default_state(self) -> Dict:
         return {
@@ -72,26 +147,43 @@ class CheckpointManager:
             "completed_steps": [],
             "answers": {},
             "agent": "claude",
+            "step_started_at": None,
+            "build_tasks": {},
+            "build_tasks_digest": "",
         }
 
     def run_checkpoint(self, step: str) -> Optional[Dict]:
         """
         Run the interview for a specific step.
         Returns context dict if ready to proceed, None if user wants to pause.
+        State is flushed once, when the checkpoint finishes. Timing, resource
+        usage and this call's state-lock activity and writes (lock_stats() and
+        io_stats(), as "state_lock" and "state_io") are appended to
+        .speckit/metrics.jsonl (see core.metrics).
         """
-        if step == "constitution":
-            return self._checkpoint_constitution()
-        elif step == "spec":
-            return self._checkpoint_spec()
-        elif step == "plan":
-            return self._checkpoint_plan()
-        elif step == "tasks":
-            return self._checkpoint_tasks()
-        elif step == "validate":
-            return self._checkpoint_validate()
-        elif step == "build":
-            return self._checkpoint_build()
-        return None
+        checkpoints = {
+            "constitution": self._checkpoint_constitution,
+            "spec": self._checkpoint_spec,
+            "plan": self._checkpoint_plan,
+            "tasks": self._checkpoint_tasks,
+            "validate": self._checkpoint_validate,
+            "build": self._checkpoint_build,
+        }
+        if step not in checkpoints:
+            return None
+        from here_spec.core.metrics import measure
+
+        with measure(self.project_path, step, "checkpoint") as metrics:
+            lock_before, io_before = self.lock_stats(), self.io_stats()
+            try:
+                with self.batch():
+                    context = checkpoints[step]()
+                    metrics["paused"] = context is None
+                    return context
+            finally:
+                # After the batch's flush, so the final save is included
+                metrics["state_lock"] = _stats_since(lock_before, self.lock_stats())
+                metrics["state_io"] = _stats_since(io_before, self.io_stats())
 
     def _checkpoint_constitution(self) -> Optional[Dict]:
         """Step 1: Questions before creating constitution"""
@@ -320,6 +412,40 @@ class CheckpointManager:
         }
         return commands.get(step, "/speckit.help")
 
+    def record_task(self, task_id: str, status: str, **info):
+        """Checkpoint one build task (running, merged, failed, conflict, skipped)"""
+        entry = {"status": status, "updated_at": time.time()}
+        entry.update(info)
+        self.state.setdefault("build_tasks", {})[task_id] = entry
+        self._save_state()
+
+    def reconcile_tasks(self, graph: "TaskGraph") -> List[str]:
+        """
+        Bring the per-task build record in line with tasks.md; returns the IDs
+        of the tasks still outstanding, in file order.
+        The checkboxes win: a checked task is recorded as done, a recorded task
+        whose box was unchecked again is reopened, and records of tasks that are
+        no longer in the file are dropped. Nothing is written when tasks.md has
+        not changed since the last reconcile.
+        """
+        outstanding = [t.id for t in graph.open_tasks()]
+        if graph.digest and graph.digest == self.state.get("build_tasks_digest"):
+            return outstanding
+
+        recorded = self.state.setdefault("build_tasks", {})
+        now = time.time()
+        for task in graph.tasks:
+            status = recorded.get(task.id, {}).get("status")
+            if task.done and status not in DONE_TASK_STATUSES:
+                recorded[task.id] = {"status": "done", "updated_at": now, "source": "tasks.md"}
+            elif not task.done and status in DONE_TASK_STATUSES:
+                recorded[task.id] = {"status": "reopened", "updated_at": now}
+        for task_id in [i for i in recorded if i not in graph.by_id]:
+            del recorded[task_id]
+        self.state["build_tasks_digest"] = graph.digest
+        self._save_state()
+        return outstanding
+
     def _confirm(self, message: str, default: bool = True) -> bool:
         if self.auto_confirm:
             return True
@@ -329,6 +455,17 @@ class CheckpointManager:
         """Get the next step that needs to be done"""
         return self.state.get("current_step", "constitution")
 
+    def lock_stats(self) -> Dict:
+        """Lock acquisitions, contention and total wait time for this manager"""
+        return {k: v for k, v in self.store.stats.items() if k.startswith("lock")}
+
+    def io_stats(self) -> Dict:
+        """Save requests vs. real writes: how many were skipped or coalesced"""
+        stats = dict(self.write_stats)
+        stats["bytes_written"] = self.store.stats["bytes_written"]
+        stats["compactions"] = self.store.stats["compactions"]
+        return stats
+
     def get_progress(self) -> Dict:
         """Get current progress for status display"""
         return {
@@ -0,0 +1,92 @@
+"""
+here-spec thin client
+Forwards commands to a running `here-spec serve` daemon over a Unix socket and
+falls back to running them in-process when no daemon answers.
+Keep this module free of third-party imports: it is the whole cold start.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+PROTOCOL_VERSION = 1
+
+# The only commands the daemon runs. It serves one request at a time, so
+# anything that can launch an agent (step, continue, build) always runs in the
+# client's own process rather than blocking every other client until it exits.
+READ_ONLY_COMMANDS = {"status", "check"}
+
+CONNECT_TIMEOUT = 0.2
+
+
+def socket_path() -> Path:
+    """Daemon socket: $HERE_SPEC_SOCKET, else $XDG_RUNTIME_DIR, else ~/.cache"""
+    env_path = os.environ.get("HERE_SPEC_SOCKET")
+    if env_path:
+        return Path(env_path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "here-spec.sock"
+    return Path.home() / ".cache" / "here-spec" / "daemon.sock"
+
+
+def should_forward(argv: List[str]) -> bool:
+    return bool(argv) and argv[0] in READ_ONLY_COMMANDS and "--help" not in argv
+
+
+def forward(argv: List[str], path: Optional[Path] = None) -> Optional[int]:
+    """Send argv to the daemon and echo its output; None if it is unreachable"""
+    path = path or socket_path()
+    request = {
+        "protocol": PROTOCOL_VERSION,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "tty": sys.stdout.isatty(),
+        "env": {k: v for k, v in os.environ.items() if k.startswith("HERE_SPEC_")},
+    }
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    if response.get("protocol") != PROTOCOL_VERSION or response.get("refused"):
+        return None
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    return int(response.get("exit_code", 1))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point for here-spec-client"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if should_forward(argv):
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from here_spec.cli.entry import main as local_main
+
+    local_main(argv)
+
+
+if __name__ == "__main__":
+    main()
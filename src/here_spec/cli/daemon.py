@@ -0,0 +1,168 @@
+"""
+here-spec warm daemon
+Serves here-spec-client requests over a Unix socket from one long-lived
+interpreter, so imports, checkpoint managers, system detection and rendered
+art are paid for once instead of on every call.
+
+Requests are handled one at a time: each one temporarily takes over the
+process-wide cwd, environment and stdio. Only read-only commands are served;
+others are refused and the client runs them itself.
+"""
+
+import io
+import json
+import os
+import re
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from rich.console import Console
+
+from here_spec.cli import runtime
+from here_spec.cli.client import PROTOCOL_VERSION, should_forward
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]|\x1b\][^\x07]*\x07")
+
+
+@contextmanager
+def _request_scope(cwd: str, env: Dict[str, str]) -> Iterator[None]:
+    """Apply a client's cwd and HERE_SPEC_* variables for one request"""
+    old_cwd = os.getcwd()
+    old_env = {k: v for k, v in os.environ.items() if k.startswith("HERE_SPEC_")}
+    old_stdin = sys.stdin
+    for key in old_env:
+        del os.environ[key]
+    os.environ.update({k: v for k, v in env.items() if k.startswith("HERE_SPEC_")})
+    sys.stdin = io.StringIO("")
+    try:
+        os.chdir(cwd)
+        yield
+    finally:
+        sys.stdin = old_stdin
+        os.chdir(old_cwd)
+        for key in [k for k in os.environ if k.startswith("HERE_SPEC_")]:
+            del os.environ[key]
+        os.environ.update(old_env)
+
+
+def run_command(argv: List[str], cwd: str, env: Dict[str, str], tty: bool = False) -> Dict:
+    """Run one CLI invocation in this process and capture its output
+
+    The CLI's consoles keep the colour mode detected when the daemon started,
+    so escape codes are stripped for clients that are not writing to a terminal.
+    """
+    from here_spec.cli.entry import main as entry_main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    with _request_scope(cwd, env), redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            entry_main(argv)
+        except SystemExit as exc:
+            code = exc.code
+            exit_code = code if isinstance(code, int) else (0 if code is None else 1)
+        except Exception:  # noqa: BLE001 - report, keep serving
+            traceback.print_exc()
+            exit_code = 1
+
+    out, err = stdout.getvalue(), stderr.getvalue()
+    if not tty:
+        out, err = _ANSI_ESCAPE.sub("", out), _ANSI_ESCAPE.sub("", err)
+    return {"protocol": PROTOCOL_VERSION, "exit_code": exit_code, "stdout": out, "stderr": err}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get("protocol") != PROTOCOL_VERSION:
+            # The client treats a mismatched protocol as "no daemon" and runs locally
+            response = {"protocol": PROTOCOL_VERSION}
+        elif not should_forward(request.get("argv", [])):
+            # Current clients run the command themselves; older ones show stderr
+            response = {
+                "protocol": PROTOCOL_VERSION,
+                "refused": True,
+                "exit_code": 2,
+                "stderr": "here-spec daemon: only status and check are served; "
+                "run this command with here-spec\n",
+            }
+        else:
+            response = run_command(
+                request.get("argv", []),
+                request.get("cwd", os.getcwd()),
+                request.get("env", {}),
+                tty=bool(request.get("tty")),
+            )
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Single-threaded on purpose: see the module docstring"""
+
+
+def warm_up():
+    """Load everything a command might need before the first request"""
+    from here_spec.art.dog_art import warm_art
+    import here_spec.cli.main  # noqa: F401 - Typer app and its commands
+    import here_spec.checkpoint  # noqa: F401
+    import here_spec.agents.claude  # noqa: F401
+    import here_spec.agents.opencode  # noqa: F401
+
+    runtime.enable_warm_cache()
+    runtime.system_info()
+    warm_art()
+
+
+def _socket_in_use(path: Path) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def create_server(path: Path) -> DaemonServer:
+    """Bind the daemon socket, replacing a stale one left by a dead daemon"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if _socket_in_use(path):
+            raise FileExistsError(f"a here-spec daemon is already listening on {path}")
+        path.unlink()
+    server = DaemonServer(str(path), _Handler)
+    os.chmod(path, 0o600)
+    return server
+
+
+def serve_forever(path: Path, console: Console) -> bool:
+    """Run the daemon until interrupted. Returns False if it could not start."""
+    try:
+        server = create_server(path)
+    except (FileExistsError, OSError) as exc:
+        console.print(f"[red]❌ Could not start daemon: {exc}[/red]")
+        return False
+
+    warm_up()
+    console.print(f"[green]🐕 here-spec daemon listening on {path}[/green]")
+    console.print("[dim]Use here-spec-client <command>; Ctrl+C to stop[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[dim]Daemon stopped[/dim]")
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return True
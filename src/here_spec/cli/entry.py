@@ -0,0 +1,93 @@
+"""
+here-spec entry point
+Dispatches hot, read-only commands without importing Typer or the full CLI
+"""
+
+import os
+import sys
+from typing import Callable, Dict, List, Optional
+
+# Upper bound (milliseconds) for the import time of here_spec's own modules on
+# the `--help` and `status` paths, as measured by `python -X importtime`.
+# Enforced by tests/test_startup.py.
+STARTUP_BUDGET_MS = 40
+
+
+def _run_status(args: List[str]) -> int:
+    from pathlib import Path
+
+    from rich.console import Console
+
+    from here_spec.cli.status import show_status
+
+    path = args[0] if args else "."
+    show_status(Console(), Path(path).resolve())
+    return 0
+
+
+def _match_status(args: List[str]) -> bool:
+    """Only the plain `status [PATH]` form is served without Typer"""
+    return len(args) <= 1 and not any(arg.startswith("-") for arg in args)
+
+
+def _run_rebuild_dry_run(args: List[str]) -> int:
+    from pathlib import Path
+
+    from rich.console import Console
+
+    from here_spec.cli.rebuild import show_stale
+
+    paths = [arg for arg in args if arg != "--dry-run"]
+    show_stale(Console(), Path(paths[0] if paths else ".").resolve())
+    return 0
+
+
+def _match_rebuild(args: List[str]) -> bool:
+    """`rebuild --dry-run [PATH]` only reads state, so it skips Typer too"""
+    others = [arg for arg in args if arg != "--dry-run"]
+    return "--dry-run" in args and len(others) <= 1 and not any(a.startswith("-") for a in others)
+
+
+# command name -> (argument matcher, handler). Anything that does not match
+# falls through to the Typer app, which loads its own dependencies lazily.
+FAST_COMMANDS: Dict[str, tuple] = {
+    "status": (_match_status, _run_status),
+    "rebuild": (_match_rebuild, _run_rebuild_dry_run),
+}
+
+
+def _fast_path(argv: List[str]) -> Optional[Callable[[], int]]:
+    if not argv or argv[0] not in FAST_COMMANDS:
+        return None
+    matcher, handler = FAST_COMMANDS[argv[0]]
+    if not matcher(argv[1:]):
+        return None
+    return lambda: handler(argv[1:])
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    profiler = None
+    if "--profile" in argv[:1] or "HERE_SPEC_PROFILE" in os.environ:
+        from here_spec.core import profiling
+
+        if profiling.profiling_requested(argv):
+            argv = [arg for arg in argv[:1] if arg != "--profile"] + argv[1:]
+            command = next((arg for arg in argv if not arg.startswith("-")), "here-spec")
+            profiler = profiling.start_profiling(command)
+    try:
+        handler = _fast_path(argv)
+        if handler is not None:
+            sys.exit(handler())
+
+        from here_spec.cli.main import app
+
+        app(args=argv, prog_name="here-spec")
+    finally:
+        if profiler is not None:
+            profiling.finish_profiling(profiler)
+
+
+if __name__ == "__main__":
+    main()
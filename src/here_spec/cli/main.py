@@ -8,24 +8,26 @@ import os
 import typer
 from typer import Context
 from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt, IntPrompt
 from pathlib import Path
 import sys
 import json
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
-from here_spec.art.dog_art import (
-    display_art,
-    display_welcome,
-    display_milestone,
-)
-from here_spec.core.system_detector import SystemDetector
-from here_spec.checkpoint import CheckpointManager
-from here_spec.agents.claude import ClaudeLauncher
-from here_spec.agents.opencode import OpencodeLauncher
+# Subcommand dependencies (art, checkpoints, detector, launchers, rich prompts)
+# are imported inside the commands that use them so that `--help` and the
+# `status` fast path never pay for them. See here_spec.cli.entry.
+if TYPE_CHECKING:
+    from here_spec.checkpoint import CheckpointManager
 
 console = Console()
+
+# Keep in sync with here_spec.core.discovery.DEFAULT_MAX_DEPTH (not imported
+# here so --help stays cheap)
+DISCOVERY_DEPTH = 3
+
+# Workflow order, for sorting per-step reports
+STEP_ORDER = ["constitution", "spec", "plan", "tasks", "validate", "build"]
+
 app = typer.Typer(
     name="here-spec",
     help="🐕 Spec Kit Assistant - Progressive checkpoints for Spec-Driven Development",
@@ -41,11 +43,19 @@ def init(
     ),
     free: bool = typer.Option(False, "--free", help="Use free tier (opencode)"),
     quick: bool = typer.Option(False, "--quick", help="Skip interviews, use defaults"),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-detect installed tools instead of using the cache"
+    ),
 ):
     """
     Initialize a new project with progressive checkpoints
     Asks questions before: constitution → spec → plan → tasks → validate → build
     """
+    from rich.prompt import Prompt
+
+    from here_spec.art.dog_art import display_welcome
+    from here_spec.cli import runtime
+
     display_welcome()
 
     env_project = os.environ.get("HERE_SPEC_PROJECT_NAME")
@@ -77,8 +87,7 @@ def init(
 
     # System detection
     console.print("\n[dim]🔍 Checking your system...[/dim]")
-    detector = SystemDetector()
-    system_info = detector.detect()
+    system_info = runtime.system_info(refresh=refresh)
     display_system_check(system_info)
 
     # Agent selection
@@ -88,35 +97,43 @@ def init(
     auto_confirm_env = _env_flag(os.environ.get("HERE_SPEC_AUTO_CONFIRM"))
 
     # Initialize checkpoint manager
-    checkpoints = CheckpointManager(console, project_path, auto_confirm=(auto_confirm_env or quick))
+    checkpoints = runtime.checkpoints(
+        console, project_path, auto_confirm=(auto_confirm_env or quick)
+    )
 
-    # Check if this is a fresh init or continuing
-    if checkpoints.state.get("current_step") != "init" and not checkpoints.state.get("answers"):
-        console.print("[dim]Resuming existing project...[/dim]")
-    else:
-        # Fresh start - clear any old state
-        console.print("[dim]Starting fresh project...[/dim]")
-        checkpoints.state = {
-            "project_name": "",
-            "current_step": "init",
-            "completed_steps": [],
-            "answers": {},
-        }
+    # Reset, agent choice and quick defaults land in a single write
+    with checkpoints.batch():
+        # Check if this is a fresh init or continuing
+        if checkpoints.state.get("current_step") != "init" and not checkpoints.state.get(
+            "answers"
+        ):
+            console.print("[dim]Resuming existing project...[/dim]")
+        else:
+            # Fresh start - clear any old state
+            console.print("[dim]Starting fresh project...[/dim]")
+            checkpoints.state = {
+                "project_name": "",
+                "current_step": "init",
+                "completed_steps": [],
+                "answers": {},
+            }
+
+        # Save agent choice in checkpoints
+        checkpoints.state["agent"] = agent
+        checkpoints._save_state()
 
-    # Save agent choice in checkpoints
-    checkpoints.state["agent"] = agent
-    checkpoints._save_state()
+        if quick:
+            # Quick mode: use defaults and skip to build
+            _setup_quick_defaults(checkpoints, project_name)
 
     if quick:
-        # Quick mode: use defaults and skip to build
-        _setup_quick_defaults(checkpoints, project_name)
         _run_build_step(agent, checkpoints, project_path)
     else:
         # Progressive mode: go through each checkpoint
         _run_progressive_flow(agent, checkpoints, project_path)
 
 
-def _setup_quick_defaults(checkpoints: CheckpointManager, project_name: str):
+def _setup_quick_defaults(checkpoints: "CheckpointManager", project_name: str):
     """Setup default values for quick mode"""
     checkpoints.state["project_name"] = project_name or "my-project"
     checkpoints.state["answers"] = {
@@ -132,8 +149,10 @@ def _setup_quick_defaults(checkpoints: CheckpointManager, project_name: str):
     checkpoints._save_state()
 
 
-def _run_progressive_flow(agent: str, checkpoints: CheckpointManager, project_path: Path):
+def _run_progressive_flow(agent: str, checkpoints: "CheckpointManager", project_path: Path):
     """Run through each checkpoint, asking questions before each step"""
+    from rich.prompt import Confirm
+
     steps = ["constitution", "spec", "plan", "tasks", "validate", "build"]
 
     for step in steps:
@@ -158,7 +177,7 @@ def _run_progressive_flow(agent: str, checkpoints: CheckpointManager, project_pa
             _run_build_step(agent, checkpoints, project_path)
         else:
             # Launch agent for this step
-            _run_step_agent(agent, context, project_path)
+            _run_step_agent(agent, context, project_path, checkpoints)
 
             # Ask if they want to continue
             if not Confirm.ask(f"\nContinue to next step?", default=True):
@@ -175,25 +194,84 @@ def _run_progressive_flow(agent: str, checkpoints: CheckpointManager, project_pa
     console.print(f"  {project_path.absolute()}")
 
 
-def _run_step_agent(agent: str, context: dict, project_path: Path):
-    """Launch agent for a specific step (constitution, spec, plan, etc.)"""
+def _run_step_agent(
+    agent: str,
+    context: dict,
+    project_path: Path,
+    checkpoints: Optional["CheckpointManager"] = None,
+) -> bool:
+    """Launch agent for a specific step (constitution, spec, plan, etc.)
+
+    Returns True if the agent ran to completion; the step's fingerprint is
+    then recorded for `here-spec rebuild`.
+    """
     step = context["step"]
     command = context.get("next_command", "/speckit.help")
 
     console.print(f"\n[bold blue]🚀 Running {command}...[/bold blue]")
 
-    if agent == "claude":
-        launcher = ClaudeLauncher()
-    elif agent == "opencode":
-        launcher = OpencodeLauncher()
-    else:
+    launcher = _get_launcher(agent)
+    if launcher is None:
         console.print(f"[red]❌ Unknown agent: {agent}[/red]")
-        return
+        return False
+
+    cache = None
+    if checkpoints is not None:
+        from here_spec.agents.step_cache import StepCache
+
+        cache = StepCache.from_settings()
+    if cache is not None:
+        restored = cache.restore(step, checkpoints.state, project_path, _confirm_overwrite)
+        if restored:
+            console.print(f"[green]♻️  Reused cached {step} (cache hit):[/green]")
+            for path in restored:
+                console.print(f"  [dim]{path.relative_to(project_path)}[/dim]")
+            _record_step(checkpoints, step)
+            return True
+
+    result = launcher.launch_for_step(context, project_path)
+    if result is None or not result.ok:
+        return False
+    if checkpoints is not None:
+        _record_step(checkpoints, step)
+    if cache is not None and cache.store(step, checkpoints.state, project_path):
+        console.print(f"[dim]Cached {step} artifacts in {cache.directory}[/dim]")
+    return True
+
+
+def _confirm_overwrite(paths: List[Path]) -> bool:
+    """Ask before a cached artifact replaces existing work (never without a terminal)"""
+    from rich.prompt import Confirm
+
+    if not sys.stdin.isatty():
+        return False
+    console.print("[yellow]A cached result would replace:[/yellow]")
+    for path in paths:
+        console.print(f"  [dim]{path}[/dim]")
+    return Confirm.ask("Overwrite with the cached version?", default=False)
 
-    launcher.launch_for_step(context, project_path)
 
+def _record_step(checkpoints: "CheckpointManager", step: str):
+    """Fingerprint a step's inputs and outputs after its agent finished"""
+    from here_spec.core.steps import StepFingerprints
 
-def _run_build_step(agent: str, checkpoints: CheckpointManager, project_path: Path):
+    StepFingerprints(checkpoints.project_path).record(step, checkpoints.state)
+
+
+def _get_launcher(agent: str):
+    """Import and instantiate the launcher for an agent (None if unknown)"""
+    if agent == "claude":
+        from here_spec.agents.claude import ClaudeLauncher
+
+        return ClaudeLauncher()
+    if agent == "opencode":
+        from here_spec.agents.opencode import OpencodeLauncher
+
+        return OpencodeLauncher()
+    return None
+
+
+def _run_build_step(agent: str, checkpoints: "CheckpointManager", project_path: Path):
     """Final build step"""
     context = checkpoints.run_checkpoint("build")
 
@@ -211,15 +289,142 @@ def _run_build_step(agent: str, checkpoints: CheckpointManager, project_path: Pa
 
     console.print("\n[bold green]🏗️  Starting Implementation[/bold green]\n")
 
-    if agent == "claude":
-        launcher = ClaudeLauncher()
-    elif agent == "opencode":
-        launcher = OpencodeLauncher()
-    else:
+    launcher = _get_launcher(agent)
+    if launcher is None:
+        console.print(f"[red]❌ Unknown agent: {agent}[/red]")
+        return
+
+    if _run_parallel_build(launcher, checkpoints, context, project_path):
+        return
+    result = launcher.launch(context, project_path)
+    if result is not None and result.ok:
+        _record_step(checkpoints, "build")
+
+
+def _run_parallel_build(
+    launcher,
+    checkpoints: "CheckpointManager",
+    context: dict,
+    project_path: Path,
+    workers: Optional[int] = None,
+) -> bool:
+    """Run tasks.md through the parallel executor; False if it does not apply
+
+    Applies when more than one build worker is configured, the project is a
+    git repository and its current feature has open tasks.
+    """
+    from here_spec.agents.executor import (
+        MERGED,
+        GitError,
+        ParallelExecutor,
+        build_workers,
+        command_override,
+    )
+    from here_spec.core.tasks import find_tasks_file, load_task_graph
+
+    workers = workers or build_workers()
+    if workers < 2:
+        return False
+    tasks_file = find_tasks_file(project_path)
+    if tasks_file is None:
+        return False
+    graph = load_task_graph(tasks_file)
+    if not graph.open_tasks():
+        return False
+
+    def progress(task_id: str, status: str, info: dict):
+        checkpoints.record_task(task_id, status, **info)
+        style = {"running": "blue", MERGED: "green", "skipped": "dim"}.get(status, "red")
+        detail = f" ({info['detail']})" if info.get("detail") else ""
+        console.print(f"[{style}]{task_id}: {status}{detail}[/{style}]")
+
+    console.print(
+        f"[bold]Running {len(graph.open_tasks())} tasks with {workers} workers[/bold] "
+        f"[dim]({tasks_file.relative_to(project_path)})[/dim]\n"
+    )
+    executor = ParallelExecutor(
+        project_path,
+        graph,
+        tasks_file,
+        command_override() or launcher.task_command,
+        workers=workers,
+        context=context,
+        progress=progress,
+    )
+    from here_spec.core.metrics import measure
+
+    previous_step = checkpoints.state["current_step"]
+    _set_current_step(checkpoints, "building")
+    try:
+        with measure(project_path, "build", "tasks", workers=workers) as metrics:
+            results = executor.run()
+            metrics["tasks"] = len(results)
+    except GitError as e:
+        _set_current_step(checkpoints, previous_step)
+        console.print(f"[yellow]Parallel build unavailable ({e}); using a single agent[/yellow]")
+        return False
+
+    merged = sum(r.status == MERGED for r in results)
+    console.print(
+        f"\n[bold]{merged} of {len(results)} tasks merged[/bold] "
+        f"[dim](up to {executor.stats['max_concurrency']} at once)[/dim]"
+    )
+    if executor.interrupted:
+        console.print("[yellow]Build interrupted; run 'here-spec continue' to resume[/yellow]")
+    elif merged == len(results):
+        _finish_build(checkpoints)
+    return True
+
+
+def _set_current_step(checkpoints: "CheckpointManager", step: str):
+    if checkpoints.state["current_step"] != step:
+        checkpoints.state["current_step"] = step
+        checkpoints._save_state()
+
+
+def _finish_build(checkpoints: "CheckpointManager"):
+    """Record the build step as completed once every task is done"""
+    with checkpoints.batch():
+        if "build" not in checkpoints.state["completed_steps"]:
+            checkpoints.state["completed_steps"].append("build")
+        checkpoints.state["current_step"] = "complete"
+        checkpoints._save_state()
+    _record_step(checkpoints, "build")
+
+
+def _resume_build(agent: str, checkpoints: "CheckpointManager", project_path: Path):
+    """Continue an interrupted build with only the tasks still outstanding"""
+    from here_spec.core.tasks import find_tasks_file, load_task_graph
+
+    tasks_file = find_tasks_file(project_path)
+    if tasks_file is None:
+        console.print("\n[yellow]Build was in progress. Restarting build step...[/yellow]")
+        _run_build_step(agent, checkpoints, project_path)
+        return
+
+    graph = load_task_graph(tasks_file)
+    outstanding = checkpoints.reconcile_tasks(graph)
+    if not outstanding:
+        console.print(f"\n[green]✅ All {len(graph)} tasks in tasks.md are done[/green]")
+        _finish_build(checkpoints)
+        return
+
+    console.print(
+        f"\n[yellow]Build was in progress: {len(graph) - len(outstanding)} of {len(graph)} "
+        f"tasks done. Resuming with {len(outstanding)} outstanding...[/yellow]"
+    )
+    launcher = _get_launcher(agent)
+    if launcher is None:
         console.print(f"[red]❌ Unknown agent: {agent}[/red]")
         return
 
-    launcher.launch(context, project_path)
+    context = checkpoints._build_context("build")
+    context["resume_tasks"] = [graph.by_id[task_id] for task_id in outstanding]
+    if _run_parallel_build(launcher, checkpoints, context, project_path):
+        return
+    result = launcher.launch(context, project_path)
+    if result is not None and result.ok:
+        _record_step(checkpoints, "build")
 
 
 @app.command()
@@ -227,19 +432,31 @@ def continue_project(
     path: str = typer.Argument(
         ".", help="Path to existing project (optional - auto-detects current directory)"
     ),
+    depth: int = typer.Option(
+        DISCOVERY_DEPTH, "--depth", help="How many directory levels to search for projects"
+    ),
+    ignore: Optional[List[str]] = typer.Option(
+        None, "--ignore", help="Extra directory globs to skip while searching (repeatable)"
+    ),
 ):
     """
     Continue from last checkpoint
     Resumes the progressive workflow where you left off
 
-    If run without arguments, automatically detects if you're in a project directory.
+    If run without arguments, automatically detects if you're in a project directory,
+    or searches below it for projects to choose from.
     """
+    from rich.prompt import Confirm
+
+    from here_spec.art.dog_art import display_art
+    from here_spec.cli import runtime
+
     project_path = Path(path).resolve()
     checkpoint_file = project_path / ".speckit" / "checkpoints.json"
 
     if not checkpoint_file.exists():
         if path == ".":
-            selected_project = _choose_project_from_directory(Path.cwd())
+            selected_project = _choose_project_from_directory(Path.cwd(), depth, ignore)
             if not selected_project:
                 raise typer.Exit(1)
             project_path = selected_project
@@ -252,7 +469,7 @@ def continue_project(
 
     # Load checkpoint state
     auto_confirm_env = _env_flag(os.environ.get("HERE_SPEC_AUTO_CONFIRM"))
-    checkpoints = CheckpointManager(console, project_path, auto_confirm=auto_confirm_env)
+    checkpoints = runtime.checkpoints(console, project_path, auto_confirm=auto_confirm_env)
 
     # Get current progress
     progress = checkpoints.get_progress()
@@ -269,8 +486,7 @@ def continue_project(
 
     # Map the current step to resume properly
     if current_step == "building":
-        console.print("\n[yellow]Build was in progress. Restarting build step...[/yellow]")
-        _run_build_step(agent, checkpoints, project_path)
+        _resume_build(agent, checkpoints, project_path)
     elif current_step in ["constitution", "spec", "plan", "tasks", "validate", "build"]:
         # Run from current checkpoint
         context = checkpoints.run_checkpoint(current_step)
@@ -282,7 +498,7 @@ def continue_project(
         if current_step == "build":
             _run_build_step(agent, checkpoints, project_path)
         else:
-            _run_step_agent(agent, context, project_path)
+            _run_step_agent(agent, context, project_path, checkpoints)
 
             # Ask if they want to continue to next steps
             if Confirm.ask(f"\nContinue with remaining steps?", default=True):
@@ -304,9 +520,11 @@ def step(
     Run a specific checkpoint step directly
     Useful for jumping to a specific part of the workflow
     """
+    from here_spec.cli import runtime
+
     project_path = Path(path).resolve()
     auto_confirm_env = _env_flag(os.environ.get("HERE_SPEC_AUTO_CONFIRM"))
-    checkpoints = CheckpointManager(console, project_path, auto_confirm=auto_confirm_env)
+    checkpoints = runtime.checkpoints(console, project_path, auto_confirm=auto_confirm_env)
 
     # Set agent if provided
     if agent:
@@ -326,47 +544,400 @@ def step(
 
 
 @app.command()
-def check():
+def rebuild(
+    path: str = typer.Argument(".", help="Project path"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only list the stale steps"),
+    agent: Optional[str] = typer.Option(None, "--agent", help="AI agent to use"),
+):
+    """
+    Re-run only the steps whose inputs changed
+    Like make: a completed step is stale when its answers or upstream artifacts
+    changed since it last ran, when its outputs are gone, or when a step it
+    reads from is stale
+    """
+    from here_spec.cli import runtime
+    from here_spec.cli.rebuild import show_stale
+    from here_spec.core.steps import StepFingerprints
+
+    project_path = Path(path).resolve()
+    if dry_run:
+        show_stale(console, project_path)
+        return
+    if not (project_path / ".speckit" / "checkpoints.json").exists():
+        console.print(f"[red]❌ No project found at: {path}[/red]")
+        raise typer.Exit(1)
+
+    checkpoints = runtime.checkpoints(console, project_path)
+    agent = agent or checkpoints.state.get("agent", "claude")
+    stale = StepFingerprints(project_path).stale_steps(checkpoints.state)
+    if not stale:
+        console.print("[green]✅ Every completed step is up to date[/green]")
+        return
+
+    console.print(f"[bold]Re-running:[/bold] {', '.join(stale)}")
+    for name in stale:
+        if name == "build":
+            checkpoints.state["current_step"] = "building"
+            checkpoints._save_state()
+            launcher = _get_launcher(agent)
+            if launcher is None:
+                console.print(f"[red]❌ Unknown agent: {agent}[/red]")
+                raise typer.Exit(1)
+            context = checkpoints._build_context("build")
+            if _run_parallel_build(launcher, checkpoints, context, project_path):
+                continue
+            result = launcher.launch(context, project_path)
+            ran = result is not None and result.ok
+            if ran:
+                _record_step(checkpoints, "build")
+        else:
+            context = checkpoints._build_context(name)
+            ran = _run_step_agent(agent, context, project_path, checkpoints)
+        if not ran:
+            console.print(f"\n[yellow]Stopped: {name} did not finish[/yellow]")
+            console.print("[dim]Run 'here-spec rebuild' again to continue[/dim]")
+            raise typer.Exit(1)
+
+
+@app.command()
+def cache(
+    clear: bool = typer.Option(False, "--clear", help="Delete every cached artifact"),
+):
+    """
+    Show hit/miss statistics of the step artifact cache
+    Enable it with HERE_SPEC_STEP_CACHE=1 (or a shared directory)
+    """
+    from here_spec.agents.step_cache import StepCache
+
+    step_cache = StepCache.from_settings()
+    if step_cache is None:
+        console.print("[yellow]The step cache is off[/yellow]")
+        console.print("[dim]Enable it with HERE_SPEC_STEP_CACHE=1 or a directory path[/dim]")
+        return
+    if clear:
+        removed = step_cache.clear()
+        console.print(f"[green]Removed {removed} cached artifacts[/green]")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"Step cache: {step_cache.directory}")
+    table.add_column("Step")
+    table.add_column("Entries", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit rate", justify="right")
+    for step, counts in sorted(step_cache.report().items()):
+        lookups = counts["hit"] + counts["miss"]
+        rate = f"{counts['hit'] / lookups:.0%}" if lookups else "-"
+        table.add_row(
+            step, str(counts.get("entries", 0)), str(counts["hit"]), str(counts["miss"]), rate
+        )
+    console.print(table)
+
+
+@app.command()
+def stats(
+    paths: Optional[List[str]] = typer.Argument(
+        None, help="Projects, or directories to search for projects (default: .)"
+    ),
+    depth: int = typer.Option(
+        DISCOVERY_DEPTH, "--depth", help="Directory levels to search below non-project paths"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the summary as JSON"),
+):
+    """
+    Show where time goes, per step, across one or many projects
+    Percentiles come from each project's .speckit/metrics.jsonl
+    """
+    from here_spec.core.metrics import read_metrics, summarize
+
+    projects: List[Path] = []
+    for raw in paths or ["."]:
+        path = Path(raw).resolve()
+        if (path / ".speckit").is_dir():
+            projects.append(path)
+        else:
+            projects.extend(Path(row["path"]) for row in _discover_projects(path, depth))
+
+    order = {name: i for i, name in enumerate(STEP_ORDER)}
+    rows = sorted(
+        summarize(read_metrics(projects)),
+        key=lambda row: (order.get(row["step"], len(order)), row["step"], row["phase"]),
+    )
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        console.print("[yellow]No metrics recorded yet (.speckit/metrics.jsonl)[/yellow]")
+        raise typer.Exit(1)
+
+    from rich.table import Table
+
+    table = Table(title=f"Step metrics ({len(projects)} project(s))")
+    for column in ("Step", "Phase"):
+        table.add_column(column)
+    for column in ("Calls", "p50", "p90", "p99", "Child CPU", "Peak RSS", "Subprocs"):
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            row["step"],
+            row["phase"],
+            str(row["count"]),
+            f"{row['p50_s']:.2f}s",
+            f"{row['p90_s']:.2f}s",
+            f"{row['p99_s']:.2f}s",
+            f"{row['child_cpu_mean_s']:.2f}s",
+            f"{max(row['peak_rss_kb'], row['child_peak_rss_kb']) / 1024:.0f} MiB",
+            str(row["subprocesses"]),
+        )
+    console.print(table)
+
+
+@app.command()
+def check(
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Re-detect installed tools instead of using the cache"
+    ),
+):
     """Check system requirements and installed agents"""
+    from here_spec.art.dog_art import display_art
+    from here_spec.cli import runtime
+
     display_art("detective", "System Check", "blue")
 
-    detector = SystemDetector()
-    info = detector.detect()
+    info = runtime.system_info(refresh=refresh)
     display_full_system_check(info)
 
 
 @app.command()
 def status(
-    path: str = typer.Argument(".", help="Project path"),
+    path: str = typer.Argument(".", help="Project path (with --all: directory to search)"),
+    all_projects: bool = typer.Option(
+        False, "--all", help="Stream a one-line status for every project below PATH"
+    ),
+    fmt: str = typer.Option("table", "--format", help="--all output: table, plain or ndjson"),
+    depth: int = typer.Option(
+        DISCOVERY_DEPTH, "--depth", help="With --all: directory levels to search"
+    ),
+    ignore: Optional[List[str]] = typer.Option(
+        None, "--ignore", help="With --all: extra directory globs to skip (repeatable)"
+    ),
 ):
     """Show project status and progress through checkpoints"""
+    from here_spec.cli.status import STATUS_FORMATS, show_all_status, show_status
+
+    if not all_projects:
+        show_status(console, Path(path).resolve())
+        return
+
+    if fmt not in STATUS_FORMATS:
+        console.print(f"[red]❌ Unknown format: {fmt}[/red]")
+        console.print(f"Valid formats: {', '.join(STATUS_FORMATS)}")
+        raise typer.Exit(1)
+    show_all_status(console, Path(path), fmt=fmt, depth=depth, ignore=ignore)
+
+
+@app.command()
+def build(
+    path: str = typer.Argument(".", help="Project path"),
+    workers: Optional[int] = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        min=1,
+        help="Concurrent agents (default: $HERE_SPEC_BUILD_WORKERS or build_workers, else 1)",
+    ),
+    agent: Optional[str] = typer.Option(None, "--agent", help="AI agent to use"),
+):
+    """
+    Implement the open tasks of tasks.md in parallel
+    Independent [P] tasks run in separate git worktrees and are merged back in order.
+    With one worker, or outside a git repository, a single agent runs the build.
+    """
+    from here_spec.agents.executor import build_workers
+    from here_spec.cli import runtime
+
     project_path = Path(path).resolve()
-    checkpoint_file = project_path / ".speckit" / "checkpoints.json"
+    if not (project_path / ".speckit" / "checkpoints.json").exists():
+        console.print(f"[red]❌ No project found at: {path}[/red]")
+        raise typer.Exit(1)
 
-    if not checkpoint_file.exists():
-        console.print("[yellow]⚠️  No project found[/yellow]")
+    auto_confirm = _env_flag(os.environ.get("HERE_SPEC_AUTO_CONFIRM"))
+    checkpoints = runtime.checkpoints(console, project_path, auto_confirm=auto_confirm)
+    missing = [s for s in STEP_ORDER[:4] if s not in checkpoints.state["completed_steps"]]
+    if missing:
+        console.print(f"[red]❌ Not ready to build: {', '.join(missing)} not done yet[/red]")
+        console.print("[dim]Run 'here-spec continue' to finish them[/dim]")
+        raise typer.Exit(1)
+
+    agent = agent or checkpoints.state.get("agent", "claude")
+    launcher = _get_launcher(agent)
+    if launcher is None:
+        console.print(f"[red]❌ Unknown agent: {agent}[/red]")
+        raise typer.Exit(1)
+
+    previous_step = checkpoints.state["current_step"]
+    if previous_step == "build":
+        # The build checkpoint has not been passed yet
+        context = checkpoints.run_checkpoint("build")
+        if context is None:
+            console.print("\n[yellow]⏸️  Build paused[/yellow]")
+            return
+    else:
+        context = checkpoints._build_context("build")
+
+    workers = workers or build_workers()
+    if _run_parallel_build(launcher, checkpoints, context, project_path, workers):
         return
+    _set_current_step(checkpoints, "building")
+    result = launcher.launch(context, project_path)
+    if result is None or not result.ok:
+        _set_current_step(checkpoints, previous_step)
+        raise typer.Exit(1)
+    _record_step(checkpoints, "build")
 
-    checkpoints = CheckpointManager(console, project_path)
-    progress = checkpoints.get_progress()
 
-    display_art("working", f"Project: {progress['project_name']}", "blue")
+@app.command()
+def tasks(
+    path: str = typer.Argument(".", help="tasks.md, or a project (uses its latest specs/<feature>/)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the full task graph as JSON"),
+):
+    """Show the task graph parsed from tasks.md"""
+    from here_spec.core.tasks import find_tasks_file, load_task_graph
 
-    steps = ["constitution", "spec", "plan", "tasks", "validate", "build"]
-    completed = progress.get("completed_steps", [])
-    current = progress.get("current_step", "constitution")
+    tasks_file = find_tasks_file(Path(path))
+    if tasks_file is None:
+        console.print(f"[red]❌ No tasks.md found at {path}[/red]")
+        raise typer.Exit(1)
+    graph = load_task_graph(tasks_file)
 
-    console.print("\n[bold]Progress:[/bold]")
-    for step in steps:
-        if step in completed:
-            console.print(f"  ✅ {step}")
-        elif step == current:
-            console.print(f"  ⏳ {step} (current)")
+    if as_json:
+        data = graph.to_dict()
+        data["file"] = str(tasks_file)
+        print(json.dumps(data, indent=2))
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"Tasks: {tasks_file}")
+    table.add_column("Phase")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Done", justify="right")
+    table.add_column("Parallel", justify="right")
+    for index, phase in enumerate(graph.phases):
+        ids = graph.phase_tasks(index)
+        items = [graph.by_id[i] for i in ids]
+        table.add_row(
+            phase or "(no phase)",
+            str(len(items)),
+            str(sum(t.done for t in items)),
+            str(sum(t.parallel for t in items)),
+        )
+    console.print(table)
+
+    ready = [t.id for t in graph.ready()]
+    if ready:
+        shown = ", ".join(ready[:20]) + (" …" if len(ready) > 20 else "")
+        console.print(f"[green]Ready now ({len(ready)}):[/green] {shown}")
+    elif graph.tasks:
+        console.print("[green]✅ All tasks done[/green]")
+    for warning in graph.warnings:
+        console.print(f"[yellow]⚠️  {warning}[/yellow]")
+
+
+@app.command()
+def section(
+    file: str = typer.Argument(..., help="Markdown artifact (spec.md, plan.md, tasks.md, ...)"),
+    query: Optional[str] = typer.Argument(
+        None, help="Heading title or path ('Tasks > Phase 1: Setup'); omit to list sections"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the outline as JSON"),
+    no_heading: bool = typer.Option(False, "--no-heading", help="Omit the heading line"),
+):
+    """Print one section of a markdown artifact, or its outline"""
+    from here_spec.core.sections import SectionIndex
+
+    try:
+        index = SectionIndex(Path(file))
+    except OSError as e:
+        console.print(f"[red]❌ Cannot read {file}: {e.strerror}[/red]")
+        raise typer.Exit(1)
+
+    if query is None:
+        if as_json:
+            print(json.dumps(list(index.outline()), indent=2))
         else:
-            console.print(f"  ⬜ {step}")
+            for item in index.sections():
+                print(f"{'  ' * (item.level - 1)}{item.title}  [{item.start}:{item.end}]")
+        return
+
+    found = index.find(query)
+    if found is None:
+        console.print(f"[red]❌ No section matching '{query}' in {file}[/red]")
+        raise typer.Exit(1)
+    sys.stdout.write(index.read(found, include_heading=not no_heading))
 
-    agent = checkpoints.state.get("agent", "not set")
-    console.print(f"\n[dim]Agent: {agent}[/dim]")
+
+@app.command("context-report")
+def context_report(
+    paths: Optional[List[str]] = typer.Argument(None, help="Project paths (default: .)"),
+):
+    """Show which cacheable prefix each generated agent context shares"""
+    from rich.table import Table
+
+    from here_spec.agents.context import layout_report, prefix_id
+
+    rows = layout_report(Path(p).resolve() for p in (paths or ["."]))
+    if not rows:
+        console.print("[yellow]No generated contexts found (.speckit/context-*.md)[/yellow]")
+        raise typer.Exit(1)
+
+    current = prefix_id()
+    table = Table(title=f"Context layout (current prefix {current})")
+    table.add_column("Context")
+    table.add_column("Prefix")
+    table.add_column("Facts")
+    table.add_column("Shared bytes", justify="right")
+    table.add_column("Total bytes", justify="right")
+    for row in rows:
+        prefix = row["prefix"] or "[red]stale[/red]"
+        shared = row["prefix_bytes"] + row["facts_bytes"]
+        table.add_row(
+            os.path.relpath(str(row["file"])),
+            prefix,
+            row["facts"] or "-",
+            f"{shared:,}",
+            f"{row['total_bytes']:,}",
+        )
+    console.print(table)
+
+    sharing = sum(1 for row in rows if row["prefix"] == current)
+    facts = {row["facts"] for row in rows if row["facts"]}
+    console.print(
+        f"{sharing}/{len(rows)} contexts share prefix {current}; "
+        f"{len(facts)} distinct project facts block(s)"
+    )
+    if sharing < len(rows):
+        console.print("[dim]Re-run the step to regenerate stale contexts[/dim]")
+
+
+@app.command()
+def serve(
+    socket: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket path (default: $HERE_SPEC_SOCKET or runtime dir)"
+    ),
+):
+    """
+    Run a warm daemon that answers here-spec-client requests
+    Keeps imports, checkpoint state and system detection loaded between calls
+    """
+    from here_spec.cli.client import socket_path
+    from here_spec.cli.daemon import serve_forever
+
+    path = Path(socket) if socket else socket_path()
+    if not serve_forever(path, console):
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -375,9 +946,12 @@ def config(
     reset: bool = typer.Option(False, "--reset", help="Reset to defaults"),
 ):
     """Configure here-spec preferences"""
+    from here_spec.art.dog_art import display_art
+    from here_spec.core import paths
+
     display_art("thinking", "Configuration", "blue")
 
-    config_path = Path.home() / ".config" / "here-spec" / "config.json"
+    config_path = paths.config_path()
 
     if show:
         if config_path.exists():
@@ -395,6 +969,8 @@ def config(
 
 def display_system_check(info: dict):
     """Display system check results"""
+    from rich.panel import Panel
+
     checks = []
 
     if info.get("git"):
@@ -446,17 +1022,36 @@ def select_agent(system_info: dict, free: bool) -> str:
 
 def display_full_system_check(info: dict):
     """Display detailed system check"""
+    from rich.panel import Panel
+
     os_info = f"[bold]OS:[/bold] {info.get('os', 'Unknown')}"
     python_info = f"[bold]Python:[/bold] {info.get('python_version', 'Not found')}"
 
+    versions = info.get("versions", {})
+
+    def _version(tool: str) -> str:
+        version = versions.get(tool)
+        if version == "timeout":
+            return " [yellow](version probe timed out)[/yellow]"
+        return f" [dim]{version}[/dim]" if version else ""
+
     agents_info = "[bold]AI Agents:[/bold]\n"
     for agent, installed in info.get("agents", {}).items():
         status = "✅" if installed else "❌"
-        agents_info += f"  {status} {agent}\n"
+        agents_info += f"  {status} {agent}{_version(agent) if installed else ''}\n"
+
+    tools_info = "[bold]Tools:[/bold]\n"
+    for tool, installed in (
+        ("git", info.get("git")),
+        ("node", info.get("node")),
+        ("npm", "npm" in info.get("package_managers", [])),
+    ):
+        status = "✅" if installed else "❌"
+        tools_info += f"  {status} {tool}{_version(tool) if installed else ''}\n"
 
     console.print(
         Panel(
-            f"{os_info}\n\n{python_info}\n\n{agents_info}",
+            f"{os_info}\n\n{python_info}\n\n{agents_info}\n{tools_info}",
             title="System Information",
             border_style="blue",
         )
@@ -465,7 +1060,9 @@ def display_full_system_check(info: dict):
 
 def interactive_config():
     """Interactive configuration - fully implemented"""
-    config_path = Path.home() / ".config" / "here-spec" / "config.json"
+    from here_spec.core import paths
+
+    config_path = paths.config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Load existing or defaults
@@ -513,17 +1110,22 @@ def interactive_config():
             break
 
 
-def _discover_projects(base_path: Path) -> List[Path]:
-    projects: List[Path] = []
-    for item in sorted(base_path.iterdir()):
-        checkpoint = item / ".speckit" / "checkpoints.json"
-        if item.is_dir() and checkpoint.exists():
-            projects.append(item)
-    return projects
+def _discover_projects(
+    base_path: Path, depth: int = DISCOVERY_DEPTH, ignore: Optional[List[str]] = None
+) -> List[dict]:
+    from here_spec.core.discovery import DEFAULT_IGNORES
+    from here_spec.core.workspace_index import discover_projects
 
+    patterns = list(DEFAULT_IGNORES) + list(ignore or [])
+    return discover_projects(base_path, max_depth=depth, ignore=patterns)
 
-def _choose_project_from_directory(base_path: Path) -> Optional[Path]:
-    projects = _discover_projects(base_path)
+
+def _choose_project_from_directory(
+    base_path: Path, depth: int = DISCOVERY_DEPTH, ignore: Optional[List[str]] = None
+) -> Optional[Path]:
+    from rich.prompt import IntPrompt
+
+    projects = _discover_projects(base_path, depth, ignore)
     if not projects:
         console.print("[red]❌ No projects found in this directory.[/red]")
         console.print("\n[dim]To start a new project:[/dim]")
@@ -531,18 +1133,19 @@ def _choose_project_from_directory(base_path: Path) -> Optional[Path]:
         return None
 
     if len(projects) == 1:
-        console.print(f"[dim]Found project: {projects[0].name}[/dim]")
+        console.print(f"[dim]Found project: {projects[0]['name']}[/dim]")
         console.print("[dim]Resuming automatically...[/dim]")
-        return projects[0]
+        return Path(projects[0]["path"])
 
     console.print("\n[bold]Select a project to continue:[/bold]")
     for idx, project in enumerate(projects, 1):
-        console.print(f"  {idx}. {project.name}")
+        label = os.path.relpath(project["path"], base_path.resolve())
+        console.print(f"  {idx}. {label} [dim]({project['current_step']})[/dim]")
 
     selection = IntPrompt.ask("Enter number", default=1, show_default=True)
 
     try:
-        return projects[selection - 1]
+        return Path(projects[selection - 1]["path"])
     except IndexError:
         console.print("[red]Invalid selection.[/red]")
         return None
@@ -555,7 +1158,14 @@ def _env_flag(value: Optional[str]) -> bool:
 
 
 @app.callback(invoke_without_command=True)
-def main_callback(ctx: Context):
+def main_callback(
+    ctx: Context,
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile the command into the project's .speckit/profiles/ (.pstats + stacks)",
+    ),
+):
     """
     Spec Kit Assistant - Just run 'here-spec' and go!
 
@@ -563,6 +1173,15 @@ def main_callback(ctx: Context):
     - In a project directory? Continue where you left off
     - Not in a project? Start creating a new one
     """
+    if profile or _env_flag(os.environ.get("HERE_SPEC_PROFILE")):
+        # Normally started by here_spec.cli.entry before the CLI is imported;
+        # this covers `python -m here_spec.cli.main` and embedded use.
+        from here_spec.core import profiling
+
+        profiler = profiling.start_profiling(ctx.invoked_subcommand or "here-spec")
+        if profiler is not None:
+            ctx.call_on_close(lambda: profiling.finish_profiling(profiler))
+
     if ctx.invoked_subcommand is not None:
         return
 
@@ -571,10 +1190,10 @@ def main_callback(ctx: Context):
 
     if checkpoint_file.exists():
         console.print("[dim]🐕 Detected project in current directory![/dim]")
-        ctx.invoke(continue_project, path=".")
+        ctx.invoke(continue_project, path=".", depth=DISCOVERY_DEPTH, ignore=None)
     else:
         console.print("[dim]🐕 Starting new project...[/dim]\n")
-        ctx.invoke(init, project_name=None, agent=None, free=False, quick=False)
+        ctx.invoke(init, project_name=None, agent=None, free=False, quick=False, refresh=False)
 
 
 def main():
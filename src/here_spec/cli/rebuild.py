@@ -0,0 +1,47 @@
+"""
+here-spec rebuild --dry-run
+Shared by the Typer command and the typer-free fast path in here_spec.cli.entry
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from rich.console import Console
+
+STATE_MARKS = {"fresh": "✅", "stale": "🔁", "pending": "⏳"}
+
+
+def load_state(project_path: Path) -> Optional[Dict]:
+    """Checkpoint state without loading the interview machinery (None if no project)"""
+    from here_spec.core.state_store import JournaledStateStore
+
+    state_file = project_path / ".speckit" / "checkpoints.json"
+    if not state_file.exists():
+        return None
+    return JournaledStateStore(state_file).load()
+
+
+def show_stale(console: Console, project_path: Path) -> int:
+    """Print each step's fingerprint status; returns the number of stale steps
+
+    Read-only: the refreshed hash cache is not saved, so a dry run writes nothing.
+    """
+    from here_spec.core.steps import StepFingerprints
+
+    state = load_state(project_path)
+    if state is None:
+        console.print("[yellow]⚠️  No project found[/yellow]")
+        return 0
+
+    fingerprints = StepFingerprints(project_path)
+    statuses = fingerprints.status(state)
+    for status in statuses:
+        reasons = f" [dim]({'; '.join(status.reasons)})[/dim]" if status.reasons else ""
+        console.print(f"  {STATE_MARKS[status.state]} {status.step}: {status.state}{reasons}")
+
+    stale = [s.step for s in statuses if s.state == "stale"]
+    if stale:
+        console.print(f"\n[bold]Would re-run:[/bold] {', '.join(stale)}")
+    else:
+        console.print("\n[green]Nothing to rebuild[/green]")
+    return len(stale)
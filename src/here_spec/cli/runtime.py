@@ -0,0 +1,73 @@
+"""
+Runtime providers for the CLI
+Commands get checkpoint managers and system info from here so that the warm
+daemon (`here-spec serve`) can hand out cached instances instead of new ones.
+"""
+
+import copy
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from rich.console import Console
+
+if TYPE_CHECKING:
+    from here_spec.checkpoint import CheckpointManager
+
+# None outside the daemon; dicts once enable_warm_cache() has been called
+_checkpoint_cache: Optional[Dict[Path, Tuple[tuple, "CheckpointManager"]]] = None
+_system_info: Optional[Dict] = None
+_warm = False
+
+
+def enable_warm_cache():
+    """Keep checkpoint managers and detection results across commands"""
+    global _checkpoint_cache, _warm
+    _checkpoint_cache = {}
+    _warm = True
+
+
+def is_warm() -> bool:
+    return _warm
+
+
+def _state_signature(project_path: Path) -> tuple:
+    from here_spec.core.state_store import state_signature
+
+    return state_signature(project_path / ".speckit" / "checkpoints.json")
+
+
+def checkpoints(
+    console: Console, project_path: Path, auto_confirm: bool = False
+) -> "CheckpointManager":
+    """Return a CheckpointManager for project_path (cached while warm)"""
+    from here_spec.checkpoint import CheckpointManager
+
+    if _checkpoint_cache is None:
+        return CheckpointManager(console, project_path, auto_confirm=auto_confirm)
+
+    key = project_path.resolve()
+    signature = _state_signature(key)
+    cached = _checkpoint_cache.get(key)
+    if cached and cached[0] == signature:
+        manager = cached[1]
+        manager.console = console
+        manager.auto_confirm = auto_confirm
+        return manager
+
+    manager = CheckpointManager(console, project_path, auto_confirm=auto_confirm)
+    _checkpoint_cache[key] = (signature, manager)
+    return manager
+
+
+def system_info(refresh: bool = False) -> Dict:
+    """Run SystemDetector (once per daemon while warm; refresh re-probes)"""
+    global _system_info
+    if _warm and _system_info is not None and not refresh:
+        return copy.deepcopy(_system_info)
+
+    from here_spec.core.system_detector import SystemDetector
+
+    info = SystemDetector().detect(refresh=refresh)
+    if _warm:
+        _system_info = copy.deepcopy(info)
+    return info
@@ -0,0 +1,193 @@
+"""
+here-spec status
+Shared by the Typer command and the typer-free fast path in here_spec.cli.entry
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.markup import escape
+
+STEPS = ["constitution", "spec", "plan", "tasks", "validate", "build"]
+
+
+def show_status(console: Console, project_path: Path):
+    """Show project status and progress through checkpoints"""
+    checkpoint_file = project_path / ".speckit" / "checkpoints.json"
+
+    if not checkpoint_file.exists():
+        console.print("[yellow]⚠️  No project found[/yellow]")
+        return
+
+    from here_spec.art.dog_art import display_art
+    from here_spec.cli import runtime
+
+    checkpoints = runtime.checkpoints(console, project_path)
+    progress = checkpoints.get_progress()
+
+    display_art("working", f"Project: {progress['project_name']}", "blue")
+
+    completed = progress.get("completed_steps", [])
+    current = progress.get("current_step", "constitution")
+
+    console.print("\n[bold]Progress:[/bold]")
+    for step in STEPS:
+        if step in completed:
+            console.print(f"  ✅ {step}")
+        elif step == current:
+            console.print(f"  ⏳ {step} (current)")
+        else:
+            console.print(f"  ⬜ {step}")
+
+    agent = checkpoints.state.get("agent", "not set")
+    console.print(f"\n[dim]Agent: {agent}[/dim]")
+
+
+# -- status --all -------------------------------------------------------------
+
+STATUS_FORMATS = ("table", "plain", "ndjson")
+ROW_FIELDS = ("project", "current_step", "completed", "agent", "modified", "stalled")
+# Fixed widths so table rows can be printed as soon as they are resolved
+TABLE_WIDTHS = {"project": 26, "current_step": 12, "completed": 6, "agent": 9, "modified": 9}
+
+
+def _format_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    seconds = max(0, int(seconds))
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+def status_row(project: Dict, root: Path, now: float) -> Dict:
+    """One dashboard row from a project's metadata (see workspace_index.project_rows)"""
+    row = {
+        "project": os.path.relpath(project["path"], str(root)),
+        "path": project["path"],
+        "current_step": project["current_step"],
+        "completed": len(project["completed_steps"]),
+        "agent": project["agent"],
+        "modified_at": project["modified_at"],
+        # Projects saved before step timestamps existed fall back to the last write
+        "step_started_at": project.get("step_started_at") or project["modified_at"],
+    }
+    if "error" in project:
+        row.update(current_step="?", error=project["error"])
+        return row
+    row["modified_age"] = None if row["modified_at"] is None else now - row["modified_at"]
+    row["stalled_seconds"] = (
+        None if row["step_started_at"] is None else now - row["step_started_at"]
+    )
+    return row
+
+
+def iter_status_rows(
+    root: Path, depth: int, ignore: Optional[List[str]] = None, workers: int = 16
+) -> Iterator[Dict]:
+    """
+    Yield a row per project below root, a batch at a time as discovery finds them.
+    Rows come from the workspace index; only projects it does not know or whose
+    checkpoint changed since are read from disk, concurrently. Batches keep
+    memory flat no matter how many projects there are.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from here_spec.core.discovery import DEFAULT_IGNORES, DiscoveryEngine
+    from here_spec.core.workspace_index import WorkspaceIndex, project_rows
+
+    root = root.resolve()
+    engine = DiscoveryEngine(max_depth=depth, ignore=list(DEFAULT_IGNORES) + list(ignore or []))
+    now = time.time()
+    batch_size = workers * 4
+
+    index = WorkspaceIndex()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batch: List[Path] = []
+            for project_path in engine.iter_projects(root):
+                batch.append(project_path)
+                if len(batch) >= batch_size:
+                    for project in project_rows(index, batch, pool):
+                        yield status_row(project, root, now)
+                    batch = []
+            for project in project_rows(index, batch, pool):
+                yield status_row(project, root, now)
+    finally:
+        index.close()
+
+
+def _ndjson_row(row: Dict) -> str:
+    record = {
+        "project": row["project"],
+        "path": row["path"],
+        "current_step": row["current_step"],
+        "completed": row["completed"],
+        "agent": row["agent"],
+        "modified_at": row["modified_at"],
+        "stalled_seconds": row.get("stalled_seconds"),
+    }
+    if "error" in row:
+        record["error"] = row["error"]
+    return json.dumps(record)
+
+
+def _cells(row: Dict) -> List[str]:
+    return [
+        row["project"],
+        row["current_step"],
+        f"{row['completed']}/{len(STEPS)}",
+        row["agent"] or "-",
+        _format_age(row.get("modified_age")),
+        _format_age(row.get("stalled_seconds")),
+    ]
+
+
+def _table_line(cells: List[str]) -> str:
+    parts = []
+    for field, cell in zip(ROW_FIELDS, cells):
+        width = TABLE_WIDTHS.get(field)
+        if width is None:
+            parts.append(cell)
+        else:
+            cell = cell if len(cell) <= width else cell[: width - 1] + "…"
+            parts.append(cell.ljust(width))
+    return " ".join(parts)
+
+
+def show_all_status(
+    console: Console,
+    root: Path,
+    fmt: str = "table",
+    depth: int = 3,
+    ignore: Optional[List[str]] = None,
+) -> int:
+    """Stream one line per project below root; returns the number of projects"""
+    headers = ["PROJECT", "STEP", "DONE", "AGENT", "MODIFIED", "STALLED"]
+    if fmt == "table":
+        console.print(f"[bold]{escape(_table_line(headers))}[/bold]", soft_wrap=True)
+    elif fmt == "plain":
+        print("\t".join(headers), flush=True)
+
+    count = 0
+    for row in iter_status_rows(root, depth, ignore):
+        count += 1
+        if fmt == "ndjson":
+            print(_ndjson_row(row), flush=True)
+        elif fmt == "plain":
+            print("\t".join(_cells(row)), flush=True)
+        else:
+            style = "red" if "error" in row else ("green" if row["completed"] == len(STEPS) else "")
+            line = escape(_table_line(_cells(row)))
+            console.print(
+                f"[{style}]{line}[/{style}]" if style else line, highlight=False, soft_wrap=True
+            )
+
+    if fmt == "table":
+        console.print(f"[dim]{count} project(s)[/dim]")
+    return count
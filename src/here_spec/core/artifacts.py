@@ -0,0 +1,223 @@
+"""
+Spec artifact extraction
+Pulls the parts of specs/<feature>/{spec,plan,tasks}.md an implementing agent
+needs first (headings, requirements, technical context, open tasks) so the
+build context can carry them instead of sending the agent to re-read every file.
+
+Extractions are cached per file in .speckit/artifacts.json, keyed by mtime and
+size, so repeated builds only reparse artifacts that changed.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from here_spec.core.fileio import atomic_write
+
+ARTIFACTS = ("spec.md", "plan.md", "tasks.md")
+CACHE_NAME = "artifacts.json"
+EXTRACT_VERSION = 1
+MAX_OPEN_TASKS = 40
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_REQUIREMENT = re.compile(r"\b(?:FR|NFR|SC|REQ)-\d+")
+_FACT = re.compile(r"^\s*[-*]?\s*\*\*[^*]+\*\*:\s*\S")
+_TASK = re.compile(r"^\s*[-*]\s+\[([ xX])\]\s+(.*\S)")
+
+
+def extract_markdown(text: str) -> Dict:
+    """Headings, requirement lines, key facts and tasks of one markdown file"""
+    title = ""
+    headings: List[Tuple[int, str]] = []
+    requirements: List[str] = []
+    facts: List[str] = []
+    open_tasks: List[Tuple[str, str]] = []
+    done = 0
+    section = ""
+    in_fence = False
+
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            level, name = len(heading.group(1)), heading.group(2)
+            if level == 1 and not title:
+                title = name
+            elif level in (2, 3):
+                headings.append((level, name))
+                if level == 2:
+                    section = name
+            continue
+
+        task = _TASK.match(line)
+        if task:
+            if task.group(1) == " ":
+                open_tasks.append((section, task.group(2)))
+            else:
+                done += 1
+            continue
+
+        if _REQUIREMENT.search(line):
+            requirements.append(line.strip())
+        elif _FACT.match(line) and section:
+            facts.append(line.strip())
+
+    return {
+        "title": title,
+        "headings": headings,
+        "requirements": requirements,
+        "facts": facts,
+        "open_tasks": open_tasks,
+        "done_tasks": done,
+    }
+
+
+def feature_dir(project_path: Path) -> Optional[Path]:
+    """The most recently touched specs/<feature>/ directory, if any"""
+    best: Optional[Tuple[int, str]] = None
+    found: Optional[Path] = None
+    specs = Path(project_path) / "specs"
+    try:
+        candidates = sorted(p for p in specs.iterdir() if p.is_dir())
+    except OSError:
+        return None
+    for candidate in candidates:
+        for name in ARTIFACTS:
+            try:
+                mtime = (candidate / name).stat().st_mtime_ns
+            except OSError:
+                continue
+            key = (mtime, candidate.name)
+            if best is None or key > best:
+                best, found = key, candidate
+    return found
+
+
+class ArtifactCache:
+    """Per-file extraction cache stored in a project's .speckit directory"""
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.cache_path = self.project_path / ".speckit" / CACHE_NAME
+        self.entries: Dict[str, Dict] = self._load()
+        self.dirty = False
+        self.stats = {"parsed": 0, "cached": 0}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != EXTRACT_VERSION:
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def extract(self, path: Path) -> Optional[Dict]:
+        """Extraction for path, reparsed only if its mtime or size changed"""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path.relative_to(self.project_path))
+        entry = self.entries.get(key)
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            self.stats["cached"] += 1
+            return entry["summary"]
+
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        summary = json.loads(json.dumps(extract_markdown(text)))
+        self.entries[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "summary": summary}
+        self.dirty = True
+        self.stats["parsed"] += 1
+        return summary
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": EXTRACT_VERSION, "files": self.entries}
+        atomic_write(self.cache_path, json.dumps(data, separators=(",", ":")).encode())
+        self.dirty = False
+
+
+def _render_spec(summary: Dict) -> List[str]:
+    lines = []
+    if summary["requirements"]:
+        lines.append("Requirements:")
+        lines.extend(
+            req if req.startswith(("- ", "* ")) else f"- {req}" for req in summary["requirements"]
+        )
+    return lines
+
+
+def _render_plan(summary: Dict) -> List[str]:
+    return [fact if fact.startswith(("- ", "* ")) else f"- {fact}" for fact in summary["facts"]]
+
+
+def _render_tasks(summary: Dict, max_open: int) -> List[str]:
+    open_tasks = summary["open_tasks"]
+    if not open_tasks:
+        return ["All tasks are checked off."]
+    lines = ["Open tasks:"]
+    section = None
+    for phase, task in open_tasks[:max_open]:
+        if phase != section:
+            section = phase
+            if phase:
+                lines.append(f"- {phase}")
+        lines.append(f"  - [ ] {task}" if phase else f"- [ ] {task}")
+    if len(open_tasks) > max_open:
+        lines.append(f"- … and {len(open_tasks) - max_open} more in tasks.md")
+    return lines
+
+
+def build_artifact_context(
+    project_path: Path, cache: Optional[ArtifactCache] = None, max_open_tasks: int = MAX_OPEN_TASKS
+) -> str:
+    """Markdown digest of the current feature's artifacts ('' if there are none)"""
+    project_path = Path(project_path)
+    feature = feature_dir(project_path)
+    if feature is None:
+        return ""
+
+    own_cache = cache is None
+    cache = cache or ArtifactCache(project_path)
+    rel = feature.relative_to(project_path)
+    lines = [f"## Spec Artifacts ({rel.as_posix()})", ""]
+    for name in ARTIFACTS:
+        summary = cache.extract(feature / name)
+        if summary is None:
+            continue
+
+        open_count = len(summary["open_tasks"])
+        total = open_count + summary["done_tasks"]
+        if name == "tasks.md":
+            label = f"{summary['done_tasks']} of {total} tasks done"
+        else:
+            label = summary["title"] or name
+        lines.append(f"### {name} — {label}")
+
+        sections = [text for level, text in summary["headings"] if level == 2]
+        if sections and name != "tasks.md":
+            lines.append(f"Sections: {'; '.join(sections)}")
+        if name == "spec.md":
+            lines.extend(_render_spec(summary))
+        elif name == "plan.md":
+            lines.extend(_render_plan(summary))
+        else:
+            lines.extend(_render_tasks(summary, max_open_tasks))
+        lines.append("")
+
+    if own_cache:
+        cache.save()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,199 @@
+"""
+Project Discovery Engine
+Finds here-spec projects below a directory
+
+- os.scandir walk, one tree level at a time, levels scanned in a thread pool
+- configurable depth and ignore globs (node_modules, .git, virtualenvs, ...)
+- a directory containing .speckit is a project boundary: never descended into
+- per-directory listings cached on disk and reused while the directory's
+  mtime is unchanged, so rescanning an unchanged tree costs one stat per
+  directory instead of one listing
+"""
+
+import fnmatch
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from here_spec.core.fileio import atomic_write
+from here_spec.core.paths import cache_dir
+
+DEFAULT_MAX_DEPTH = 3
+# Only names that are never a project someone would keep work in: generic
+# names like build, dist, env or .cache can be real project directories, so
+# they are left to --ignore
+DEFAULT_IGNORES = (
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "*.egg-info",
+    "site-packages",
+)
+CACHE_VERSION = 1
+
+# directory -> (mtime_ns, child directory names, has .speckit)
+Listing = Tuple[int, List[str], bool]
+
+
+def _cache_file() -> Path:
+    return cache_dir() / "discovery.json"
+
+
+class DiscoveryEngine:
+    """Recursive, cached, parallel search for .speckit projects"""
+
+    def __init__(
+        self,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        ignore: Iterable[str] = DEFAULT_IGNORES,
+        workers: int = 8,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+    ):
+        self.max_depth = max_depth
+        self.ignore = tuple(ignore)
+        self.workers = workers
+        self.cache_path = cache_path or _cache_file()
+        self.use_cache = use_cache
+        self._cache: Dict[str, Listing] = {}
+        self._dirty = False
+        self.stats = {"directories": 0, "listed": 0, "cached": 0}
+
+    def _ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.ignore)
+
+    def _load_cache(self):
+        if not self.use_cache:
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self._cache = {path: tuple(entry) for path, entry in data["dirs"].items()}
+
+    def _save_cache(self, root: str, seen: set):
+        if not self.use_cache:
+            return
+        prefix = root.rstrip(os.sep) + os.sep
+        for path in [p for p in self._cache if p.startswith(prefix) and p not in seen]:
+            del self._cache[path]
+            self._dirty = True
+        if not self._dirty:
+            return
+        data = {"version": CACHE_VERSION, "dirs": self._cache}
+        try:
+            atomic_write(self.cache_path, json.dumps(data, separators=(",", ":")).encode())
+        except OSError:
+            pass
+
+    def _list(self, directory: str) -> Tuple[Optional[Listing], bool]:
+        """
+        Child directories of directory and whether the cache answered.
+        Runs in worker threads: only reads the cache, never mutates state.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None, False
+
+        cached = self._cache.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached, True
+
+        children: List[str] = []
+        has_speckit = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name == ".speckit":
+                        has_speckit = True
+                    else:
+                        children.append(entry.name)
+        except OSError:
+            return None, False
+
+        return (mtime_ns, sorted(children), has_speckit), False
+
+    def _record(self, directory: str, listing: Listing, from_cache: bool):
+        self.stats["directories"] += 1
+        if from_cache:
+            self.stats["cached"] += 1
+        else:
+            self.stats["listed"] += 1
+            self._cache[directory] = listing
+            self._dirty = True
+
+    def find_projects(self, root: Path) -> List[Path]:
+        """Projects below root (not root itself), sorted by path"""
+        return sorted(self.iter_projects(root))
+
+    def iter_projects(self, root: Path) -> Iterator[Path]:
+        """Projects below root, yielded level by level as they are found"""
+        root_str = str(root.resolve())
+        self._load_cache()
+        self.stats = {"directories": 0, "listed": 0, "cached": 0}
+
+        seen = {root_str}
+        root_listing, from_cache = self._list(root_str)
+        level: List[str] = []
+        if root_listing is not None:
+            self._record(root_str, root_listing, from_cache)
+            level = [
+                os.path.join(root_str, name)
+                for name in root_listing[1]
+                if not self._ignored(name)
+            ]
+
+        depth = 1
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while level and depth <= self.max_depth:
+                    next_level: List[str] = []
+                    found: List[str] = []
+                    for directory, (listing, from_cache) in zip(
+                        level, pool.map(self._list, level)
+                    ):
+                        if listing is None:
+                            continue
+                        seen.add(directory)
+                        self._record(directory, listing, from_cache)
+                        _mtime, children, has_speckit = listing
+                        if has_speckit:
+                            checkpoint = os.path.join(directory, ".speckit", "checkpoints.json")
+                            if os.path.exists(checkpoint):
+                                found.append(directory)
+                            continue  # project boundary
+                        if depth < self.max_depth:
+                            next_level.extend(
+                                os.path.join(directory, name)
+                                for name in children
+                                if not self._ignored(name)
+                            )
+                    for directory in found:
+                        yield Path(directory)
+                    level = next_level
+                    depth += 1
+        finally:
+            if not level or depth > self.max_depth:
+                # Only a completed walk knows which cached directories are gone
+                self._save_cache(root_str, seen)
+            elif self._dirty:
+                self._save_cache(root_str, set(self._cache))
@@ -0,0 +1,105 @@
+"""
+Generated file writer
+Writes agent context and command files only when their content changes.
+
+Each project keeps a manifest (.speckit/generated.json) of the sha256, size and
+mtime of every file it generated. A write whose hash matches the manifest and
+whose file is untouched on disk is skipped, so unchanged context files keep
+their mtimes and do not wake editors, agents or file watchers.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from here_spec.core.fileio import atomic_write
+
+MANIFEST_NAME = "generated.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class GeneratedFiles:
+    """Hash-guarded writes for the files a launcher generates in one project"""
+
+    def __init__(self, project_path: Path, manifest_path: Optional[Path] = None):
+        self.project_path = Path(project_path)
+        self.manifest_path = manifest_path or self.project_path / ".speckit" / MANIFEST_NAME
+        self.entries: Dict[str, Dict] = self._load()
+        self.dirty = False
+        self.stats = {"written": 0, "skipped": 0, "bytes_written": 0}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _key(self, path: Path) -> str:
+        try:
+            return str(Path(path).relative_to(self.project_path))
+        except ValueError:
+            return str(Path(path).absolute())
+
+    def _unchanged(self, path: Path, entry: Optional[Dict], digest: str) -> bool:
+        """True when path already holds content with this digest"""
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if entry and entry.get("sha256") == digest:
+            if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                return True
+        # No trustworthy manifest entry (first run, or the file was touched):
+        # fall back to hashing what is on disk.
+        try:
+            return content_hash(path.read_bytes()) == digest
+        except OSError:
+            return False
+
+    def write(self, path: Path, text: str) -> bool:
+        """Write text to path unless it is unchanged; returns True if written"""
+        path = Path(path)
+        data = text.encode("utf-8")
+        digest = content_hash(data)
+        key = self._key(path)
+        entry = self.entries.get(key)
+
+        if self._unchanged(path, entry, digest):
+            self.stats["skipped"] += 1
+            written = False
+        else:
+            atomic_write(path, data)
+            self.stats["written"] += 1
+            self.stats["bytes_written"] += len(data)
+            written = True
+
+        st = path.stat()
+        fresh = {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if fresh != entry:
+            self.entries[key] = fresh
+            self.dirty = True
+        return written
+
+    def save(self):
+        """Persist the manifest if any entry changed"""
+        if not self.dirty:
+            return
+        data = {"version": MANIFEST_VERSION, "files": self.entries}
+        atomic_write(self.manifest_path, json.dumps(data, indent=2, sort_keys=True).encode())
+        self.dirty = False
+
+    def summary(self) -> str:
+        """One-line report of written and skipped files"""
+        return (
+            f"{self.stats['written']} written ({self.stats['bytes_written']:,} bytes), "
+            f"{self.stats['skipped']} unchanged"
+        )
@@ -0,0 +1,200 @@
+"""
+Run metrics
+Resource usage of every checkpoint interview, context generation and agent run,
+appended to .speckit/metrics.jsonl as one JSON object per measured call:
+
+    {"ts": ..., "step": "spec", "phase": "agent", "wall_s": 41.2,
+     "cpu_user_s": 0.02, "cpu_sys_s": 0.01, "child_user_s": 3.9,
+     "child_sys_s": 0.7, "peak_rss_kb": 61440, "child_peak_rss_kb": 212992,
+     "bytes_written": 5120, "child_blocks_out": 16, "subprocesses": 1}
+
+cpu_* is here-spec's own CPU time and child_* that of the subprocesses it
+reaped during the call (resource.getrusage). Peak RSS values are process-wide
+high-water marks, not per call. bytes_written is what here-spec itself wrote
+(/proc/self/io wchar, Linux only; terminal output included). Subprocesses are
+counted through an audit hook on subprocess.Popen. Checkpoint records also
+carry "state_lock" and "state_io": the checkpoint-state lock acquisitions,
+contention and wait time, and the save requests, skipped and coalesced writes
+of that interview (CheckpointManager.lock_stats() and io_stats()).
+
+Set HERE_SPEC_METRICS=0 to turn recording off.
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+METRICS_FILE = "metrics.jsonl"
+
+_spawned = 0
+_hook_installed = False
+
+
+def _audit(event: str, args):
+    global _spawned
+    if event in ("subprocess.Popen", "os.system"):
+        _spawned += 1
+
+
+def _install_hook():
+    global _hook_installed
+    if not _hook_installed:
+        sys.addaudithook(_audit)
+        _hook_installed = True
+
+
+def metrics_enabled() -> bool:
+    value = os.environ.get("HERE_SPEC_METRICS", "1")
+    return value.strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _rss_kb(maxrss: int) -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+
+def _bytes_written() -> Optional[int]:
+    try:
+        with open("/proc/self/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"wchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _snapshot() -> Dict:
+    snap = {"wall": time.perf_counter(), "bytes": _bytes_written(), "spawned": _spawned}
+    if resource is not None:
+        snap["self"] = resource.getrusage(resource.RUSAGE_SELF)
+        snap["children"] = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return snap
+
+
+class Measurement:
+    """Resource usage between construction and stop(), appended to metrics.jsonl"""
+
+    def __init__(self, project_path: Path, step: str, phase: str, **extra):
+        self.enabled = metrics_enabled()
+        self.path = Path(project_path) / ".speckit" / METRICS_FILE
+        self.record: Dict = {"step": step, "phase": phase}
+        self.record.update(extra)
+        if self.enabled:
+            _install_hook()
+            self._start = _snapshot()
+
+    def stop(self, **extra) -> Optional[Dict]:
+        """Finish the measurement and append it; returns the record (None if disabled)"""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        end = _snapshot()
+        start = self._start
+        record = {"ts": round(time.time(), 3)}
+        record.update(self.record)
+        record.update(extra)
+        record["wall_s"] = round(end["wall"] - start["wall"], 4)
+        if "self" in end:
+            own, children = end["self"], end["children"]
+            record["cpu_user_s"] = round(own.ru_utime - start["self"].ru_utime, 4)
+            record["cpu_sys_s"] = round(own.ru_stime - start["self"].ru_stime, 4)
+            record["child_user_s"] = round(children.ru_utime - start["children"].ru_utime, 4)
+            record["child_sys_s"] = round(children.ru_stime - start["children"].ru_stime, 4)
+            record["peak_rss_kb"] = _rss_kb(own.ru_maxrss)
+            record["child_peak_rss_kb"] = _rss_kb(children.ru_maxrss)
+            record["child_blocks_out"] = children.ru_oublock - start["children"].ru_oublock
+        if start["bytes"] is not None and end["bytes"] is not None:
+            record["bytes_written"] = end["bytes"] - start["bytes"]
+        record["subprocesses"] = end["spawned"] - start["spawned"]
+        append_record(self.path, record)
+        return record
+
+
+@contextmanager
+def measure(project_path: Path, step: str, phase: str, **extra) -> Iterator[Dict]:
+    """Measure the block; fields added to the yielded dict end up in the record"""
+    meter = Measurement(project_path, step, phase, **extra)
+    fields: Dict = {}
+    try:
+        yield fields
+    except BaseException as e:
+        fields["error"] = type(e).__name__
+        raise
+    finally:
+        meter.stop(**fields)
+
+
+def append_record(path: Path, record: Dict):
+    """Append one JSON line (a single write, so concurrent appenders do not interleave)"""
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+    except OSError:
+        pass
+
+
+def read_metrics(paths: Iterable[Path]) -> Iterator[Dict]:
+    """Records from each project's metrics.jsonl (malformed lines are skipped)"""
+    for project_path in paths:
+        try:
+            with open(Path(project_path) / ".speckit" / METRICS_FILE) as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                record["project"] = str(project_path)
+                yield record
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (which must not be empty)"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records: Iterable[Dict]) -> List[Dict]:
+    """Per (step, phase): call count, wall-time percentiles, mean child CPU, peak RSS"""
+    groups: Dict[tuple, List[Dict]] = {}
+    for record in records:
+        groups.setdefault((record.get("step", "?"), record.get("phase", "?")), []).append(record)
+
+    rows = []
+    for (step, phase), items in groups.items():
+        wall = [r.get("wall_s", 0.0) for r in items]
+        child_cpu = [r.get("child_user_s", 0.0) + r.get("child_sys_s", 0.0) for r in items]
+        rows.append(
+            {
+                "step": step,
+                "phase": phase,
+                "count": len(items),
+                "projects": len({r.get("project") for r in items}),
+                "p50_s": percentile(wall, 50),
+                "p90_s": percentile(wall, 90),
+                "p99_s": percentile(wall, 99),
+                "child_cpu_mean_s": round(sum(child_cpu) / len(child_cpu), 4),
+                "peak_rss_kb": max(r.get("peak_rss_kb", 0) for r in items),
+                "child_peak_rss_kb": max(r.get("child_peak_rss_kb", 0) for r in items),
+                "bytes_written": sum(r.get("bytes_written", 0) for r in items),
+                "subprocesses": sum(r.get("subprocesses", 0) for r in items),
+            }
+        )
+    return rows
@@ -0,0 +1,69 @@
+"""
+PATH Index
+Answers many `which` lookups from a single listing of each PATH directory
+
+shutil.which walks every PATH directory for every tool. PathIndex lists each
+directory once (names only, no per-file stat), remembers where every name
+occurs in PATH order, and checks only the candidates of names actually looked
+up. Adding more tools therefore costs nothing extra in directory scans.
+"""
+
+import os
+import shutil
+from typing import Dict, List, Optional
+
+
+class PathIndex:
+    """One-pass index of the executables on PATH"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = os.environ.get("PATH", "") if path is None else path
+        self._candidates: Optional[Dict[str, List[str]]] = None
+        self._resolved: Dict[str, Optional[str]] = {}
+        self.directories_scanned = 0
+
+    def _directories(self) -> List[str]:
+        seen = set()
+        directories = []
+        for directory in self.path.split(os.pathsep):
+            directory = directory or os.curdir
+            key = os.path.normcase(os.path.abspath(directory))
+            if key not in seen:
+                seen.add(key)
+                directories.append(directory)
+        return directories
+
+    def _build(self) -> Dict[str, List[str]]:
+        candidates: Dict[str, List[str]] = {}
+        for directory in self._directories():
+            try:
+                with os.scandir(directory) as entries:
+                    names = [entry.name for entry in entries]
+            except OSError:
+                continue
+            self.directories_scanned += 1
+            for name in names:
+                candidates.setdefault(name, []).append(os.path.join(directory, name))
+        return candidates
+
+    def which(self, name: str) -> Optional[str]:
+        """Like shutil.which(name) for the PATH this index was built from"""
+        if name in self._resolved:
+            return self._resolved[name]
+
+        if os.name == "nt":  # PATHEXT resolution: leave it to shutil
+            resolved = shutil.which(name, path=self.path)
+        else:
+            if self._candidates is None:
+                self._candidates = self._build()
+            resolved = None
+            for candidate in self._candidates.get(name, []):
+                if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                    resolved = candidate
+                    break
+
+        self._resolved[name] = resolved
+        return resolved
+
+    def lookup(self, names: List[str]) -> Dict[str, Optional[str]]:
+        return {name: self.which(name) for name in names}
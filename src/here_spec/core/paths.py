@@ -0,0 +1,35 @@
+"""
+Per-user locations for here-spec caches
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """$HERE_SPEC_CACHE_DIR, else $XDG_CACHE_HOME/here-spec, else ~/.cache/here-spec"""
+    env_dir = os.environ.get("HERE_SPEC_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "here-spec"
+
+
+def config_path() -> Path:
+    """$HERE_SPEC_CONFIG, else ~/.config/here-spec/config.json"""
+    env_path = os.environ.get("HERE_SPEC_CONFIG")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / ".config" / "here-spec" / "config.json"
+
+
+def load_config() -> dict:
+    """User preferences from config_path(), or {} when missing or unreadable"""
+    try:
+        with open(config_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
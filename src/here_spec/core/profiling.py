@@ -0,0 +1,230 @@
+"""
+Command profiling
+`here-spec --profile <command>` (or HERE_SPEC_PROFILE=1) runs the command
+under cProfile and writes two files to the profiles/ directory in the
+.speckit of the project containing the current directory, or in the cache
+directory outside a project (or to $HERE_SPEC_PROFILE_DIR). A .speckit is
+never created just for a profile: discovery treats one as a project.
+
+- <command>-<time>.pstats: load with `python -m pstats` or snakeviz
+- <command>-<time>.collapsed: "a;b;c <microseconds>" lines for flamegraph.pl
+  or speedscope
+
+The profiler's clock is wall time, except while an agent child is running:
+then only this thread's CPU time advances. Time blocked on the agent is left
+out and the report shows here-spec's own overhead, including the work of
+relaying the agent's output.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+# cProfile and pstats are only imported once profiling is requested, so the
+# agent runner can use agent_wait() for free
+if TYPE_CHECKING:
+    import pstats
+
+PROFILE_DIR = Path(".speckit") / "profiles"
+MAX_STACK_DEPTH = 64
+
+_active: Optional["CommandProfiler"] = None
+
+
+class OverheadClock:
+    """Wall clock that only advances by thread CPU time while paused"""
+
+    def __init__(self):
+        self._offset = 0.0
+        self._depth = 0
+        self._base = 0.0
+        self._cpu_mark = 0.0
+        self._wall_mark = 0.0
+        self.excluded = 0.0  # seconds of wall time left out
+
+    def __call__(self) -> float:
+        if self._depth:
+            return self._base + (time.thread_time() - self._cpu_mark)
+        return time.perf_counter() - self._offset
+
+    def pause(self):
+        if self._depth == 0:
+            self._base = self()
+            self._cpu_mark = time.thread_time()
+            self._wall_mark = time.perf_counter()
+        self._depth += 1
+
+    def resume(self):
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            cpu = time.thread_time() - self._cpu_mark
+            now = time.perf_counter()
+            self.excluded += max(0.0, (now - self._wall_mark) - cpu)
+            self._offset = now - (self._base + cpu)
+
+
+@contextmanager
+def agent_wait() -> Iterator[None]:
+    """Mark a block as waiting on an agent child (a no-op unless profiling)"""
+    clock = _active.clock if _active is not None else None
+    if clock is None:
+        yield
+        return
+    clock.pause()
+    try:
+        yield
+    finally:
+        clock.resume()
+
+
+def profiling_requested(argv: List[str]) -> bool:
+    """True for `--profile` before the command, or HERE_SPEC_PROFILE=1"""
+    if argv and argv[0] == "--profile":
+        return True
+    flag = os.environ.get("HERE_SPEC_PROFILE", "").strip().lower()
+    return flag in {"1", "true", "yes", "on"}
+
+
+def is_active() -> bool:
+    return _active is not None
+
+
+def _enclosing_project(directory: Path) -> Optional[Path]:
+    for candidate in [directory, *directory.parents]:
+        if (candidate / ".speckit" / "checkpoints.json").is_file():
+            return candidate
+    return None
+
+
+def profile_dir() -> Path:
+    env_dir = os.environ.get("HERE_SPEC_PROFILE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    project = _enclosing_project(Path.cwd())
+    if project is not None:
+        return project / PROFILE_DIR
+    from here_spec.core.paths import cache_dir
+
+    return cache_dir() / "profiles"
+
+
+class CommandProfiler:
+    """cProfile around one here-spec command"""
+
+    def __init__(self, command: str):
+        import cProfile
+
+        self.command = command or "here-spec"
+        self.clock = OverheadClock()
+        self.profile = cProfile.Profile(self.clock)
+        self.started = 0.0
+
+    def start(self) -> "CommandProfiler":
+        global _active
+        _active = self
+        self.started = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def stop(self, directory: Optional[Path] = None) -> Tuple[Path, Path]:
+        """Stop profiling and write the .pstats and .collapsed files"""
+        import pstats
+
+        global _active
+        self.profile.disable()
+        _active = None
+        directory = directory or profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = directory / f"{self.command}-{stamp}-{os.getpid()}"
+        stats_path = base.with_suffix(".pstats")
+        collapsed_path = base.with_suffix(".collapsed")
+        self.profile.dump_stats(str(stats_path))
+        lines = collapsed_stacks(pstats.Stats(str(stats_path)))
+        collapsed_path.write_text("".join(f"{stack} {value}\n" for stack, value in lines))
+        return stats_path, collapsed_path
+
+    def summary(self) -> str:
+        wall = time.perf_counter() - self.started
+        return (
+            f"{wall - self.clock.excluded:.3f}s of here-spec overhead "
+            f"({self.clock.excluded:.3f}s waiting on agents excluded)"
+        )
+
+
+def start_profiling(command: str) -> Optional[CommandProfiler]:
+    """Start a profiler unless one is already running"""
+    if _active is not None:
+        return None
+    return CommandProfiler(command).start()
+
+
+def finish_profiling(profiler: Optional[CommandProfiler]):
+    """Stop profiler and report where its files went (on stderr)"""
+    if profiler is None:
+        return
+    try:
+        stats_path, collapsed_path = profiler.stop()
+    except OSError as e:
+        print(f"here-spec: could not write profile: {e}", file=sys.stderr)
+        return
+    print(f"here-spec: {profiler.summary()}", file=sys.stderr)
+    print(f"here-spec: profile written to {stats_path} and {collapsed_path}", file=sys.stderr)
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(" ", "_")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ":").replace(" ", "_")
+
+
+def collapsed_stacks(stats: "pstats.Stats") -> List[Tuple[str, int]]:
+    """Approximate call stacks with self time in microseconds
+
+    cProfile keeps caller->callee edges, not whole stacks, so each function's
+    time is split between its callers in proportion to the time each caller
+    spent in it (the approach of flameprof and similar tools).
+    """
+    entries: Dict = stats.stats  # func -> (cc, nc, tt, ct, callers)
+    callees: Dict = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    totals: Dict[str, float] = {}
+
+    def walk(func, share: float, path: List[str], on_path: set):
+        cc, nc, tt, ct, callers = entries[func]
+        label = _label(func)
+        stack = path + [label]
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0.0) + tt * share
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, []):
+            if callee in on_path:
+                continue
+            callee_ct = entries[callee][3]
+            if callee_ct <= 0:
+                continue
+            child_share = share * min(1.0, edge_ct / callee_ct)
+            if child_share * callee_ct < 1e-6:
+                continue
+            walk(callee, child_share, stack, on_path | {callee})
+
+    for root in roots:
+        walk(root, 1.0, [], {root})
+
+    lines = []
+    for stack, seconds in sorted(totals.items()):
+        micros = int(round(seconds * 1e6))
+        if micros > 0:
+            lines.append((stack, micros))
+    return lines
@@ -0,0 +1,245 @@
+"""
+Markdown section index
+Heading hierarchy and byte offsets for spec artifacts, persisted next to each
+file as .<name>.idx.json, so a single section can be read through mmap without
+loading the whole document.
+
+The index stores a hash of every chunk of bytes between consecutive headings.
+When the file changes, chunks are re-hashed in order until the first one that
+differs and only the rest of the file is rescanned: appending to a document
+rescans its last section, and editing one section rescans from there on.
+"""
+
+import hashlib
+import json
+import mmap
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from here_spec.core.fileio import atomic_write
+
+INDEX_VERSION = 1
+PATH_SEPARATOR = " > "
+
+_LINE = re.compile(
+    rb"^(?:(?P<hashes>#{1,6})[ \t]+(?P<title>[^\r\n]*?)[ \t#]*|(?P<fence>```|~~~)[^\r\n]*)\r?$",
+    re.M,
+)
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(f".{path.name}.idx.json")
+
+
+@dataclass
+class Section:
+    """One heading and the byte range it covers (including subsections)"""
+
+    title: str
+    level: int
+    path: List[str]
+    start: int  # heading line
+    body: int  # first byte after the heading line
+    end: int  # next heading of the same or a higher level, or EOF
+
+    @property
+    def key(self) -> str:
+        return PATH_SEPARATOR.join(self.path)
+
+
+def _chunk_hash(data, start: int, end: int) -> str:
+    return hashlib.sha1(data[start:end]).hexdigest()
+
+
+def _scan_headings(data, pos: int) -> List[Tuple[int, int, int, str]]:
+    """(start, body, level, title) for every heading at or after pos"""
+    headings = []
+    in_fence = False
+    for match in _LINE.finditer(data, pos):
+        if match.group("fence"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        body = match.end()
+        if body < len(data) and data[body : body + 1] == b"\n":
+            body += 1
+        title = match.group("title").decode("utf-8", errors="replace")
+        headings.append((match.start(), body, len(match.group("hashes")), title))
+    return headings
+
+
+class SectionIndex:
+    """Section lookup for one markdown file, kept in sync with its contents"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.index_file = index_path_for(self.path)
+        self.size = 0
+        self.mtime_ns = 0
+        # (start, body, level, title) per heading and a hash per chunk:
+        # chunk 0 is the preamble, chunk i+1 runs from heading i to heading i+1.
+        self.headings: List[Tuple[int, int, int, str]] = []
+        self.chunks: List[str] = []
+        self.stats = {"rescanned_bytes": 0, "reused_sections": 0}
+        self._sections: Optional[List[Section]] = None
+        self._table: Optional[Dict[str, Section]] = None
+        self._load()
+        self.refresh()
+
+    # Persistence
+
+    def _load(self):
+        try:
+            data = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return
+        self.size = data.get("size", 0)
+        self.mtime_ns = data.get("mtime_ns", 0)
+        self.headings = [tuple(h) for h in data.get("headings", [])]
+        self.chunks = list(data.get("chunks", []))
+        if len(self.chunks) != len(self.headings) + 1:
+            self.headings, self.chunks, self.size, self.mtime_ns = [], [], 0, 0
+
+    def _save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "headings": self.headings,
+            "chunks": self.chunks,
+        }
+        atomic_write(self.index_file, json.dumps(data, separators=(",", ":")).encode())
+
+    # Maintenance
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the file; returns True if it changed"""
+        st = self.path.stat()
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime_ns and self.chunks:
+            return False
+        with self._mapped() as data:
+            self._update(data)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self._sections = self._table = None
+        self._save()
+        return True
+
+    def _update(self, data):
+        size = len(data)
+        bounds = [0] + [h[0] for h in self.headings] + [self.size]
+        # First chunk that differs; the last chunk is open-ended (appends extend
+        # it), so it is always rescanned.
+        changed = len(self.headings)
+        for i in range(len(self.headings)):
+            start, end = bounds[i], bounds[i + 1]
+            if end > size or _chunk_hash(data, start, end) != self.chunks[i]:
+                changed = i
+                break
+
+        # Chunk i >= 1 starts at heading i - 1, which is always outside a code
+        # fence, so scanning can resume there with a fresh fence state.
+        resume = bounds[changed]
+        headings = self.headings[: max(changed - 1, 0)]
+        chunks = self.chunks[:changed]
+        headings.extend(_scan_headings(data, resume))
+        starts = [0] + [h[0] for h in headings] + [size]
+        for i in range(len(chunks), len(starts) - 1):
+            chunks.append(_chunk_hash(data, starts[i], starts[i + 1]))
+
+        self.stats["rescanned_bytes"] += size - resume
+        self.stats["reused_sections"] += max(changed - 1, 0)
+        self.headings = headings
+        self.chunks = chunks
+
+    def _mapped(self):
+        return _MappedFile(self.path)
+
+    # Lookup
+
+    def sections(self) -> List[Section]:
+        """Every heading with its hierarchy path and byte range"""
+        if self._sections is not None:
+            return self._sections
+        result: List[Section] = []
+        stack: List[Section] = []
+        for start, body, level, title in self.headings:
+            while stack and stack[-1].level >= level:
+                stack.pop().end = start
+            section = Section(title, level, [s.title for s in stack] + [title], start, body, 0)
+            stack.append(section)
+            result.append(section)
+        for section in stack:
+            section.end = self.size
+        self._sections = result
+        return result
+
+    def lookup(self) -> Dict[str, Section]:
+        """Sections by hierarchy key ('Tasks > Phase 1: Setup') and by bare title"""
+        if self._table is None:
+            table: Dict[str, Section] = {}
+            for section in self.sections():
+                table.setdefault(section.key, section)
+            for section in self.sections():
+                table.setdefault(section.title, section)
+            self._table = table
+        return self._table
+
+    def find(self, query: str) -> Optional[Section]:
+        """Exact key or title first, then a case-insensitive title prefix match"""
+        table = self.lookup()
+        if query in table:
+            return table[query]
+        folded = query.casefold()
+        for section in self.sections():
+            if section.title.casefold().startswith(folded):
+                return section
+        return None
+
+    def read(self, section: Section, include_heading: bool = True) -> str:
+        """Text of one section, sliced out of an mmap of the file"""
+        start = section.start if include_heading else section.body
+        with self._mapped() as data:
+            return bytes(data[start : section.end]).decode("utf-8", errors="replace")
+
+    def outline(self) -> Iterator[Dict]:
+        """Sections as plain dicts (for JSON output)"""
+        for section in self.sections():
+            yield asdict(section)
+
+
+class _MappedFile:
+    """Context manager yielding a read-only mmap (or b'' for empty files)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self._map = None
+
+    def __enter__(self):
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b""
+        return self._map
+
+    def __exit__(self, *exc):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+        return False
+
+
+def read_section(path: Path, query: str, include_heading: bool = True) -> Optional[str]:
+    """Convenience: refresh path's index and return one section's text"""
+    index = SectionIndex(path)
+    section = index.find(query)
+    if section is None:
+        return None
+    return index.read(section, include_heading=include_heading)
@@ -0,0 +1,355 @@
+"""
+Journaled State Store
+Snapshot + append-only journal persistence for checkpoint state
+
+Layout (next to each other in .speckit/):
+  checkpoints.json     full snapshot, only ever replaced atomically
+  checkpoints.journal  one JSON line per save:
+                       {"seq": n, "set": [[path, value], ...], "unset": [path, ...]}
+  checkpoints.lock     advisory flock(2) target shared by all here-spec processes
+
+A save appends only what changed since the last persisted state. Once the
+journal grows past COMPACT_EVERY entries it is folded into a fresh snapshot
+(temp file + fsync + rename) and truncated. A torn trailing journal line from
+a killed process is ignored on load and cut off before the next append.
+
+Every write takes the next sequence number: journal entries carry theirs and
+the snapshot records the last one it folded in (under SEQ_KEY, which load
+strips). Replay skips entries at or below the snapshot's number, so journal
+lines left behind by a compaction that died before truncating are never
+applied on top of the newer snapshot.
+
+Saves take an exclusive lock, re-read whatever other processes persisted since
+this store last looked, and apply only this process's own changes on top, so
+concurrent writers merge per key path instead of the last one winning
+wholesale. Lists (completed_steps, ...) merge item-wise: this process's
+additions and removals are applied to the latest list, so two writers that
+append at the same time both keep their item. Other values are last writer
+wins per key path.
+
+Loads try a shared lock without waiting and read lock-free when a writer
+holds it. The journal is read before the snapshot, and sequence numbers drop
+entries that a concurrent compaction already folded in, so a lock-free load
+sees the state as of some complete save, never a mix of two.
+"""
+
+import copy
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from here_spec.core.fileio import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: no advisory locking
+    fcntl = None
+
+COMPACT_EVERY = 32
+SEQ_KEY = "_journal_seq"
+
+Delta = Tuple[List[Tuple[List[str], Any]], List[List[str]]]
+
+
+def journal_path_for(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(".journal")
+
+
+def lock_path_for(snapshot_path: Path) -> Path:
+    return snapshot_path.with_suffix(".lock")
+
+
+def state_signature(snapshot_path: Path) -> tuple:
+    """Cheap change detector covering both the snapshot and its journal"""
+    signature = []
+    for path in (snapshot_path, journal_path_for(snapshot_path)):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def diff_state(old: Dict, new: Dict, prefix: Optional[List[str]] = None) -> Delta:
+    """Key-path delta turning old into new (dicts recurse, other values replace)"""
+    prefix = prefix or []
+    sets: List[Tuple[List[str], Any]] = []
+    unsets: List[List[str]] = []
+    for key, value in new.items():
+        path = prefix + [key]
+        if key not in old:
+            sets.append((path, value))
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub_sets, sub_unsets = diff_state(old[key], value, path)
+            sets.extend(sub_sets)
+            unsets.extend(sub_unsets)
+        elif old[key] != value:
+            sets.append((path, value))
+    for key in old:
+        if key not in new:
+            unsets.append(prefix + [key])
+    return sets, unsets
+
+
+def apply_delta(state: Dict, entry: Dict):
+    for path, value in entry.get("set", []):
+        target = state
+        for key in path[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[path[-1]] = copy.deepcopy(value)
+    for path in entry.get("unset", []):
+        target = state
+        for key in path[:-1]:
+            target = target.get(key)
+            if not isinstance(target, dict):
+                break
+        else:
+            target.pop(path[-1], None)
+
+
+def merge_list(base: List, mine: List, latest: List) -> List:
+    """latest with the items mine added to base appended and those it dropped removed"""
+    kept = [item for item in latest if item in mine or item not in base]
+    return kept + [item for item in mine if item not in base and item not in kept]
+
+
+def _lookup(state: Dict, path: List[str]) -> Any:
+    for key in path:
+        if not isinstance(state, dict) or key not in state:
+            return None
+        state = state[key]
+    return state
+
+
+class JournaledStateStore:
+    """Persists a JSON-able dict as snapshot + journal"""
+
+    def __init__(self, snapshot_path: Path, compact_every: int = COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path_for(snapshot_path)
+        self.lock_path = lock_path_for(snapshot_path)
+        self.compact_every = compact_every
+        self._persisted: Optional[Dict] = None
+        self._disk_signature: Optional[tuple] = None
+        self._journal_entries = 0
+        self._journal_valid_bytes = 0
+        self._seq = 0
+        self.stats = {
+            "lock_acquisitions": 0,
+            "lock_wait_seconds": 0.0,
+            "lock_contended": 0,
+            "lockless_reads": 0,
+            "writes": 0,
+            "bytes_written": 0,
+            "compactions": 0,
+        }
+
+    @contextmanager
+    def _lock(self, exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+        """flock the lock file; yields whether the lock was obtained"""
+        if fcntl is None:
+            yield False
+            return
+
+        if exclusive:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        else:
+            # No lock file means no writer has ever run: nothing to wait for,
+            # and a read-only command should not create files
+            try:
+                fd = os.open(str(self.lock_path), os.O_RDONLY)
+            except FileNotFoundError:
+                yield True
+                return
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        acquired = False
+        try:
+            try:
+                fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                acquired = True
+            except BlockingIOError:
+                self.stats["lock_contended"] += 1
+                if blocking:
+                    started = time.perf_counter()
+                    fcntl.flock(fd, mode)
+                    self.stats["lock_wait_seconds"] += time.perf_counter() - started
+                    acquired = True
+            if acquired:
+                self.stats["lock_acquisitions"] += 1
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def load(self) -> Optional[Dict]:
+        """
+        Return the persisted state, or None if nothing has been saved yet.
+        Raises ValueError if the snapshot itself is unreadable.
+        Never waits for a writer.
+        """
+        with self._lock(exclusive=False, blocking=False) as locked:
+            if not locked and fcntl is not None:
+                self.stats["lockless_reads"] += 1
+            return self._read()
+
+    def _read(self) -> Optional[Dict]:
+        self._persisted = None
+        self._journal_entries = 0
+        self._journal_valid_bytes = 0
+        self._seq = 0
+        self._disk_signature = state_signature(self.snapshot_path)
+
+        # Journal first: a compaction racing this read then either leaves the
+        # old snapshot + old journal, or the new snapshot + journal entries
+        # it already folded in, which the sequence check below skips
+        entries = self._read_journal()
+
+        state: Optional[Dict] = None
+        # Unnumbered entries come from before sequence numbers existed: they
+        # predate a numbered snapshot and apply on top of an unnumbered one
+        unnumbered: Optional[int] = None
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "rb") as f:
+                state = json.loads(f.read())
+            if not isinstance(state, dict):
+                raise ValueError("snapshot is not a JSON object")
+            if SEQ_KEY in state:
+                self._seq = state.pop(SEQ_KEY)
+                unnumbered = 0
+
+        if state is None and not entries:
+            return None
+
+        state = state if state is not None else {}
+        snapshot_seq = self._seq
+        for entry in entries:
+            seq = entry.get("seq", unnumbered)
+            if seq is not None:
+                if seq <= snapshot_seq:
+                    continue
+                self._seq = max(self._seq, seq)
+            apply_delta(state, entry)
+        self._persisted = copy.deepcopy(state)
+        return state
+
+    def _read_journal(self) -> List[Dict]:
+        try:
+            raw = self.journal_path.read_bytes()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        offset = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # torn write from an interrupted save
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            entries.append(entry)
+            offset += len(line)
+        self._journal_entries = len(entries)
+        self._journal_valid_bytes = offset
+        return entries
+
+    def persisted_value(self, key: str, default: Any = None) -> Any:
+        """A top-level value as last read from / written to disk"""
+        if self._persisted is None:
+            return default
+        return self._persisted.get(key, default)
+
+    def is_dirty(self, state: Dict) -> bool:
+        """Whether saving state would write anything (no locking, no I/O beyond stat)"""
+        if self._persisted is None or not self.snapshot_path.exists():
+            return True
+        sets, unsets = diff_state(self._persisted, state)
+        return bool(sets or unsets)
+
+    def save(self, state: Dict) -> Dict:
+        """
+        Persist this process's changes to state.
+        Returns the merged state, which includes changes saved concurrently
+        by other processes.
+        """
+        with self._lock(exclusive=True):
+            base = self._persisted
+            if base is not None and state_signature(self.snapshot_path) != self._disk_signature:
+                try:
+                    latest = self._read()
+                except ValueError:
+                    latest = None
+                if latest is not None:
+                    sets, unsets = diff_state(base, state)
+                    for i, (path, value) in enumerate(sets):
+                        old, theirs = _lookup(base, path), _lookup(latest, path)
+                        if all(isinstance(v, list) for v in (value, old, theirs)):
+                            sets[i] = (path, merge_list(old, value, theirs))
+                    apply_delta(latest, {"set": sets, "unset": unsets})
+                    state = latest
+
+            if self._persisted is None or not self.snapshot_path.exists():
+                self.compact(state)
+            else:
+                self._append(state)
+            self._disk_signature = state_signature(self.snapshot_path)
+        return state
+
+    def _append(self, state: Dict):
+        sets, unsets = diff_state(self._persisted, state)
+        if not sets and not unsets:
+            return
+        if self._journal_entries + 1 > self.compact_every:
+            self.compact(state)
+            return
+
+        entry = {"seq": self._seq + 1, "set": sets, "unset": unsets}
+        line = json.dumps(entry, separators=(",", ":")).encode() + b"\n"
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.journal_path), os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size != self._journal_valid_bytes:
+                # Drop a torn tail so the new entry starts on a clean line
+                os.ftruncate(fd, self._journal_valid_bytes)
+            os.lseek(fd, self._journal_valid_bytes, os.SEEK_SET)
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        self.stats["writes"] += 1
+        self.stats["bytes_written"] += len(line)
+        self._journal_entries += 1
+        self._journal_valid_bytes += len(line)
+        self._seq += 1
+        self._persisted = copy.deepcopy(state)
+
+    def compact(self, state: Dict):
+        """Fold everything into a fresh snapshot and empty the journal"""
+        seq = self._seq + 1
+        if self._persisted is None:
+            # Never read: number past whatever the journal on disk holds
+            seq = max([seq] + [entry.get("seq", 0) + 1 for entry in self._read_journal()])
+        data = json.dumps({**state, SEQ_KEY: seq}, indent=2).encode()
+        atomic_write(self.snapshot_path, data)
+        # A crash before this truncate leaves journal entries numbered at or
+        # below seq, which _read skips
+        self._seq = seq
+        if self.journal_path.exists():
+            with open(self.journal_path, "wb") as f:
+                os.fsync(f.fileno())
+        self._journal_entries = 0
+        self._journal_valid_bytes = 0
+        self._persisted = copy.deepcopy(state)
+        self.stats["writes"] += 1
+        self.stats["compactions"] += 1
+        self.stats["bytes_written"] += len(data)
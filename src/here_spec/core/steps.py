@@ -0,0 +1,231 @@
+"""
+Step fingerprints
+Content hashes of what each workflow step reads and writes, recorded in
+.speckit/steps.json after the step's agent finishes.
+
+A step is stale, the way a make target is, when:
+- one of its inputs no longer hashes to what was recorded (the interview
+  answers it asks for, or the artifacts of the steps it reads from)
+- one of the outputs it recorded is gone
+- a step it reads from is stale
+
+File hashes are cached by size and mtime, so checking an unchanged project
+only stats its artifacts. Checkboxes in tasks.md are hashed as unchecked:
+ticking tasks off during the build does not make anything stale.
+"""
+
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from here_spec.core.artifacts import feature_dir
+from here_spec.core.fileio import atomic_write
+
+STEPS = ["constitution", "spec", "plan", "tasks", "validate", "build"]
+FINGERPRINT_VERSION = 1
+STEPS_FILE = "steps.json"
+
+# Interview answers each step asks for (state keys outside "answers" are
+# prefixed with "state.")
+STEP_ANSWERS = {
+    "constitution": ("state.project_name", "big_picture", "audience"),
+    "spec": ("features", "constraints"),
+    "plan": ("tech_stack", "quality_level"),
+    "tasks": (),
+    "validate": (),
+    "build": (),
+}
+
+# Steps whose artifacts each step reads
+STEP_INPUTS = {
+    "constitution": (),
+    "spec": ("constitution",),
+    "plan": ("constitution", "spec"),
+    "tasks": ("spec", "plan"),
+    "validate": ("spec", "plan", "tasks"),
+    "build": ("plan", "tasks"),
+}
+
+CONSTITUTION = Path(".specify") / "memory" / "constitution.md"
+FEATURE_OUTPUTS = {
+    "spec": ("spec.md",),
+    "plan": ("plan.md", "research.md", "data-model.md", "quickstart.md"),
+    "tasks": ("tasks.md",),
+}
+
+_CHECKED = re.compile(rb"^(\s*[-*]\s+\[)[xX](\])", re.M)
+
+
+@dataclass
+class StepStatus:
+    step: str
+    state: str  # fresh, stale or pending (not run yet)
+    reasons: List[str] = field(default_factory=list)
+
+
+def step_outputs(project_path: Path, step: str) -> List[Path]:
+    """Artifacts step has written (only those that exist)"""
+    project_path = Path(project_path)
+    if step == "constitution":
+        candidates = [project_path / CONSTITUTION]
+    elif step in FEATURE_OUTPUTS or step == "validate":
+        feature = feature_dir(project_path)
+        if feature is None:
+            return []
+        if step == "validate":
+            checklists = feature / "checklists"
+            return sorted(checklists.glob("*.md")) if checklists.is_dir() else []
+        candidates = [feature / name for name in FEATURE_OUTPUTS[step]]
+    else:
+        return []
+    return [path for path in candidates if path.is_file()]
+
+
+def is_step_output(step: str, rel: str) -> bool:
+    """Whether a project-relative POSIX path is one step_outputs() could return"""
+    parts = rel.split("/")
+    if any(part in ("", ".", "..") or "\\" in part for part in parts):
+        return False
+    if step == "constitution":
+        return rel == CONSTITUTION.as_posix()
+    if len(parts) < 3 or parts[0] != "specs":
+        return False
+    if step == "validate":
+        return len(parts) == 4 and parts[2] == "checklists" and parts[3].endswith(".md")
+    return len(parts) == 3 and parts[2] in FEATURE_OUTPUTS.get(step, ())
+
+
+def _answer_value(state: Dict, key: str):
+    if key.startswith("state."):
+        return state.get(key[len("state.") :])
+    return state.get("answers", {}).get(key)
+
+
+class StepFingerprints:
+    """Recorded input/output hashes of one project's steps"""
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.path = self.project_path / ".speckit" / STEPS_FILE
+        self.steps: Dict[str, Dict] = {}
+        # relative path -> [size, mtime_ns, sha256]
+        self.files: Dict[str, List] = {}
+        self.dirty = False
+        self.stats = {"hashed": 0, "cached": 0}
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != FINGERPRINT_VERSION:
+            return
+        self.steps = data.get("steps") or {}
+        self.files = data.get("files") or {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": FINGERPRINT_VERSION, "steps": self.steps, "files": self.files}
+        atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True).encode())
+        self.dirty = False
+
+    # Hashing
+
+    def file_digest(self, path: Path) -> Optional[str]:
+        """sha256 of path's content (None if missing), reused while size and mtime match"""
+        key = path.relative_to(self.project_path).as_posix()
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        known = self.files.get(key)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            self.stats["cached"] += 1
+            return known[2]
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if path.name == "tasks.md":
+            data = _CHECKED.sub(rb"\1 \2", data)
+        digest = hashlib.sha256(data).hexdigest()
+        self.files[key] = [st.st_size, st.st_mtime_ns, digest]
+        self.dirty = True
+        self.stats["hashed"] += 1
+        return digest
+
+    def _digests(self, paths: List[Path]) -> Dict[str, str]:
+        digests = {}
+        for path in paths:
+            digest = self.file_digest(path)
+            if digest is not None:
+                digests[path.relative_to(self.project_path).as_posix()] = digest
+        return digests
+
+    def inputs(self, step: str, state: Dict) -> Dict[str, str]:
+        """Current input hashes of step: 'answers' plus one entry per upstream artifact"""
+        values = {key: _answer_value(state, key) for key in STEP_ANSWERS[step]}
+        encoded = json.dumps(values, sort_keys=True, default=str).encode()
+        digests = {"answers": hashlib.sha256(encoded).hexdigest()}
+        for upstream in STEP_INPUTS[step]:
+            digests.update(self._digests(step_outputs(self.project_path, upstream)))
+        return digests
+
+    def outputs(self, step: str) -> Dict[str, str]:
+        return self._digests(step_outputs(self.project_path, step))
+
+    # Recording and checking
+
+    def record(self, step: str, state: Dict):
+        """Fingerprint step as just run with the current answers and artifacts"""
+        self.steps[step] = {
+            "inputs": self.inputs(step, state),
+            "outputs": self.outputs(step),
+            "recorded_at": time.time(),
+        }
+        self.dirty = True
+        self.save()
+
+    def status(self, state: Dict) -> List[StepStatus]:
+        """Every step in workflow order, with why it is stale"""
+        completed = state.get("completed_steps", [])
+        stale = set()
+        result = []
+        for step in STEPS:
+            if step not in completed:
+                result.append(StepStatus(step, "pending"))
+                continue
+
+            reasons = []
+            record = self.steps.get(step)
+            if record is None:
+                reasons.append("no fingerprint recorded")
+            else:
+                current = self.inputs(step, state)
+                before = record.get("inputs", {})
+                changed = sorted(
+                    k for k in set(current) | set(before) if current.get(k) != before.get(k)
+                )
+                if changed:
+                    reasons.append(f"inputs changed: {', '.join(changed)}")
+                outputs = record.get("outputs", {})
+                missing = [rel for rel in outputs if not (self.project_path / rel).exists()]
+                if missing:
+                    reasons.append(f"outputs missing: {', '.join(sorted(missing))}")
+            upstream = [name for name in STEP_INPUTS[step] if name in stale]
+            if upstream:
+                reasons.append(f"upstream stale: {', '.join(upstream)}")
+
+            if reasons:
+                stale.add(step)
+            result.append(StepStatus(step, "stale" if reasons else "fresh", reasons))
+        return result
+
+    def stale_steps(self, state: Dict) -> List[str]:
+        return [s.step for s in self.status(state) if s.state == "stale"]
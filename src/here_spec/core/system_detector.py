@@ -1,29 +1,216 @@
 """
 System Detector Module
 Detects OS, installed tools, and AI agents
+
+Results are cached in the user cache directory (see here_spec.core.paths),
+keyed by PATH plus the location and mtime of every tool we look for, so a
+new install, upgrade or PATH change invalidates them automatically. Entries
+also expire after DETECTION_TTL seconds ($HERE_SPEC_DETECT_TTL); refresh=True
+bypasses the cache.
+
+Tool versions (and python3's, when it is not this interpreter) are probed
+concurrently, each with a hard timeout ($HERE_SPEC_PROBE_TIMEOUT), so
+detection takes as long as the slowest single probe rather than the sum of
+all of them, and a hung binary cannot stall it. Results containing a timed-out
+probe are only cached for TIMEOUT_TTL seconds, so a transient hang is retried
+soon instead of being remembered for a day.
 """
 
+import hashlib
+import json
+import os
 import platform
-import shutil
+import re
+import signal
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from here_spec.core.fileio import atomic_write
+from here_spec.core.path_index import PathIndex
+from here_spec.core.paths import cache_dir
+
+DETECTION_TTL = 24 * 60 * 60
+TIMEOUT_TTL = 5 * 60
+CACHE_VERSION = 2
+PROBE_TIMEOUT = 3.0
+
+AGENT_TOOLS = ["claude", "opencode"]
+PACKAGE_MANAGERS = ["pip3", "npm", "brew", "apt"]
+TOOLS = ["git", "python3", "node"] + AGENT_TOOLS + PACKAGE_MANAGERS
+
+# tool -> arguments that print its version
+VERSION_PROBES = {
+    "claude": ["--version"],
+    "opencode": ["--version"],
+    "node": ["--version"],
+    "git": ["--version"],
+    "npm": ["--version"],
+}
+TIMED_OUT = "timeout"
+
+_VERSION_PATTERN = re.compile(r"\d+(?:\.\d+)+(?:[-+][0-9A-Za-z.]+)?")
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _probe_timeout() -> float:
+    return _env_seconds("HERE_SPEC_PROBE_TIMEOUT", PROBE_TIMEOUT)
+
+
+def _detection_ttl() -> float:
+    return _env_seconds("HERE_SPEC_DETECT_TTL", DETECTION_TTL)
+
+
+def parse_version(output: str) -> Optional[str]:
+    """First dotted version number in a tool's --version output"""
+    match = _VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def run_probe(argv: List[str], timeout: float) -> Tuple[Optional[str], bool]:
+    """
+    Run argv and return (output, timed_out).
+    The probe gets its own process group so that a timeout also kills any
+    children it spawned (npm and friends are shell wrappers).
+    """
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            start_new_session=(os.name == "posix"),
+        )
+    except OSError:
+        return None, False
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+        return output, False
+    except subprocess.TimeoutExpired:
+        if os.name == "posix":
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        else:  # pragma: no cover
+            proc.kill()
+        proc.communicate()
+        return None, True
 
 
 class SystemDetector:
     """Detects system configuration and available tools"""
 
-    def detect(self) -> Dict:
-        """Run full system detection"""
-        return {
-            "os": self._detect_os(),
-            "git": self._check_git(),
-            "python": self._check_python(),
-            "python_version": self._get_python_version(),
-            "node": self._check_node(),
-            "agents": self._detect_agents(),
-            "package_managers": self._detect_package_managers(),
+    def __init__(self, cache_path: Optional[Path] = None, path_index: Optional[PathIndex] = None):
+        self.cache_path = cache_path or cache_dir() / "system.json"
+        self.paths = path_index or PathIndex()
+        self._agents: Optional[Dict[str, bool]] = None
+        self._timed_out = False
+        self.cache_hit = False
+
+    def detect(self, refresh: bool = False) -> Dict:
+        """Run full system detection (served from cache when nothing changed)"""
+        key = self._cache_key()
+        if not refresh:
+            cached = self._load_cached(key)
+            if cached is not None:
+                self.cache_hit = True
+                self._agents = dict(cached.get("agents", {}))
+                return cached
+
+        self.cache_hit = False
+        self._timed_out = False
+        with ThreadPoolExecutor(max_workers=len(VERSION_PROBES) + 1) as pool:
+            python_version = pool.submit(self._get_python_version)
+            versions = self._probe_versions(pool)
+            info = {
+                "os": self._detect_os(),
+                "git": self._check_git(),
+                "python": self._check_python(),
+                "python_version": python_version.result(),
+                "node": self._check_node(),
+                "agents": self._detect_agents(),
+                "package_managers": self._detect_package_managers(),
+                "versions": versions,
+            }
+        self._store_cached(key, info)
+        return info
+
+    def _cache_key(self) -> str:
+        """Hash of PATH and where (and how fresh) each tool binary is"""
+        parts = [self.paths.path, platform.system(), platform.release()]
+        for tool, resolved in self.paths.lookup(TOOLS).items():
+            mtime = ""
+            if resolved:
+                try:
+                    mtime = str(os.stat(resolved).st_mtime_ns)
+                except OSError:
+                    pass
+            parts.append(f"{tool}={resolved or ''}@{mtime}")
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("key") != key:
+            return None
+        ttl = _detection_ttl()
+        if data.get("timed_out"):
+            ttl = min(ttl, TIMEOUT_TTL)
+        if time.time() - data.get("created_at", 0) > ttl:
+            return None
+        return data.get("info")
+
+    def _store_cached(self, key: str, info: Dict):
+        data = {"version": CACHE_VERSION, "key": key, "created_at": time.time(), "info": info}
+        if self._timed_out:
+            data["timed_out"] = True
+        try:
+            atomic_write(self.cache_path, json.dumps(data, indent=2).encode())
+        except OSError:
+            pass  # caching is an optimisation only
+
+    def _probe_versions(
+        self, pool: Optional[ThreadPoolExecutor] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Versions of installed tools, probed in parallel (on pool if given).
+        Values are a version string, None if unparseable, or TIMED_OUT.
+        """
+        timeout = _probe_timeout()
+        probes = {
+            tool: [resolved] + args
+            for tool, args in VERSION_PROBES.items()
+            for resolved in [self.paths.which(tool)]
+            if resolved
         }
+        if not probes:
+            return {}
+
+        def probe(argv: List[str]) -> Optional[str]:
+            output, timed_out = run_probe(argv, timeout)
+            if timed_out:
+                self._timed_out = True
+                return TIMED_OUT
+            return parse_version(output or "")
+
+        if pool is not None:
+            return dict(zip(probes, pool.map(probe, probes.values())))
+        with ThreadPoolExecutor(max_workers=len(probes)) as own_pool:
+            return dict(zip(probes, own_pool.map(probe, probes.values())))
 
     def _detect_os(self) -> str:
         """Detect operating system"""
@@ -41,51 +228,38 @@ class SystemDetector:
 
     def _check_git(self) -> bool:
         """Check if git is installed"""
-        return shutil.which("git") is not None
+        return self.paths.which("git") is not None
 
     def _check_python(self) -> bool:
         """Check if python3 is installed"""
-        return shutil.which("python3") is not None
+        return self.paths.which("python3") is not None
 
     def _get_python_version(self) -> str:
-        """Get Python version"""
-        try:
-            result = subprocess.run(["python3", "--version"], capture_output=True, text=True)
-            return result.stdout.strip() or result.stderr.strip()
-        except:
-            return "Unknown"
+        """Get Python version (without a subprocess when python3 is this interpreter)"""
+        python3 = self.paths.which("python3")
+        if python3 and os.path.realpath(python3) == os.path.realpath(sys.executable):
+            return f"Python {platform.python_version()}"
+        output, timed_out = run_probe([python3 or "python3", "--version"], _probe_timeout())
+        if timed_out:
+            self._timed_out = True
+        return (output or "").strip() or "Unknown"
 
     def _check_node(self) -> bool:
         """Check if Node.js is installed"""
-        return shutil.which("node") is not None
+        return self.paths.which("node") is not None
 
     def _detect_agents(self) -> Dict[str, bool]:
         """Detect installed AI agents - only Claude and Opencode are supported"""
-        agents = {
-            "claude": False,
-            "opencode": False,
-        }
-
-        # Check for each supported agent
-        agents["claude"] = shutil.which("claude") is not None
-        agents["opencode"] = shutil.which("opencode") is not None
+        if self._agents is not None:
+            return dict(self._agents)
 
-        return agents
+        agents = {agent: self.paths.which(agent) is not None for agent in AGENT_TOOLS}
+        self._agents = agents
+        return dict(agents)
 
     def _detect_package_managers(self) -> List[str]:
         """Detect available package managers"""
-        managers = []
-
-        if shutil.which("pip3"):
-            managers.append("pip3")
-        if shutil.which("npm"):
-            managers.append("npm")
-        if shutil.which("brew"):
-            managers.append("brew")
-        if shutil.which("apt"):
-            managers.append("apt")
-
-        return managers
+        return [manager for manager in PACKAGE_MANAGERS if self.paths.which(manager)]
 
     def check_agent_installation(self, agent: str) -> bool:
         """Check if a specific agent is installed"""
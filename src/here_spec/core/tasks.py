@@ -0,0 +1,386 @@
+"""
+Task graph for tasks.md
+Parses the tasks-template.md format (T001 IDs, [P] parallel markers, [US1]
+story tags, phase headings, file paths) into a typed dependency graph.
+
+Dependencies are inferred the way /speckit.implement reads the file:
+- phases run in order (every task waits for all earlier phases to finish)
+- within a phase, a task without [P] waits for everything before it in the
+  phase, and a [P] task only waits for the last task without [P]
+- tasks touching the same file never run concurrently (each waits for the
+  previous task that touched that file)
+- explicit "(depends: T001)" notes and "T008 blocks T009" / "T004-T007 before
+  T008" lines in a Dependencies section are honoured
+
+Parses are cached by content hash, in memory and under the user cache dir,
+which keeps the DISK_SLOTS most recently used graphs.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from here_spec.core.fileio import atomic_write
+from here_spec.core.paths import cache_dir
+
+GRAPH_VERSION = 1
+MEMORY_SLOTS = 8
+DISK_SLOTS = 64
+
+_TASK = re.compile(r"^\s*[-*]\s+\[([ xX])\]\s+(T\d+)\b[ \t]*(.*?)\s*$")
+_CHECKBOX = re.compile(r"^\s*[-*]\s+\[[ xX]\]")
+_BARE_ID = re.compile(r"^\s*[-*]\s+T\d+\b")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_MARKER = re.compile(r"^\[(P|US\d+)\]\s*")
+_DEPENDS = re.compile(r"\(\s*depends(?:\s+on)?\s*:?\s*([^)]*)\)", re.I)
+_ID_OR_RANGE = re.compile(r"T(\d+)(?:\s*[-–]\s*T(\d+))?")
+_FILE = re.compile(
+    r"(?<![\w/.-])`?((?:[\w.-]+/)+(?:[\w-][\w.-]*\.\w+)?|[\w-]+(?:\.[\w-]+)*\.(?:"
+    r"py|pyi|js|jsx|ts|tsx|mjs|cjs|json|md|ya?ml|toml|ini|cfg|sh|go|rs|java|kt|rb|php|"
+    r"c|h|cc|cpp|hpp|cs|swift|sql|css|scss|html|vue|svelte|txt|lock))`?(?![\w/])"
+)
+
+
+@dataclass
+class Task:
+    """One checkbox line of tasks.md"""
+
+    id: str
+    description: str
+    done: bool
+    parallel: bool
+    story: Optional[str]
+    phase: str
+    phase_index: int
+    files: List[str]
+    line: int  # 1-based
+    offset: int  # byte offset of the line
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TaskGraph:
+    """Tasks in file order plus the dependency edges between them
+
+    ``depends_on`` holds only direct edges within a phase (plus file-overlap and
+    explicit ones); the phase barrier is implied by ``phase_index`` so large
+    phases do not need an edge per task pair. ``prerequisites`` combines both.
+    """
+
+    tasks: List[Task]
+    phases: List[str]
+    digest: str = ""
+    warnings: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.by_id: Dict[str, Task] = {t.id: t for t in self.tasks}
+        self._phase_tasks: Dict[int, List[str]] = {}
+        for t in self.tasks:
+            self._phase_tasks.setdefault(t.phase_index, []).append(t.id)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.tasks)
+
+    def phase_tasks(self, phase_index: int) -> List[str]:
+        return self._phase_tasks.get(phase_index, [])
+
+    def prerequisites(self, task_id: str) -> Set[str]:
+        """Direct edges plus every task of the earlier phases"""
+        task = self.by_id[task_id]
+        before = set(task.depends_on)
+        for phase_index in range(task.phase_index):
+            before.update(self.phase_tasks(phase_index))
+        return before
+
+    def open_tasks(self) -> List[Task]:
+        return [t for t in self.tasks if not t.done]
+
+    def ready(self, finished: Iterable[str] = ()) -> List[Task]:
+        """Open tasks whose prerequisites are all done or in finished"""
+        complete = {t.id for t in self.tasks if t.done}
+        complete.update(finished)
+        remaining = [t for t in self.tasks if t.id not in complete]
+        # Only the earliest phase with open tasks can make progress
+        first_open = min((t.phase_index for t in remaining), default=None)
+        return [
+            t
+            for t in remaining
+            if t.phase_index == first_open and all(dep in complete for dep in t.depends_on)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": GRAPH_VERSION,
+            "digest": self.digest,
+            "phases": self.phases,
+            "tasks": [dict(vars(t)) for t in self.tasks],
+            "warnings": self.warnings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TaskGraph":
+        return cls(
+            tasks=[Task(**t) for t in data["tasks"]],
+            phases=data["phases"],
+            digest=data.get("digest", ""),
+            warnings=data.get("warnings", []),
+        )
+
+
+def _expand_ids(text: str) -> List[str]:
+    ids = []
+    for match in _ID_OR_RANGE.finditer(text):
+        first = match.group(1)
+        if match.group(2) is None:
+            ids.append(f"T{first}")
+            continue
+        width = len(first)
+        for number in range(int(first), int(match.group(2)) + 1):
+            ids.append(f"T{number:0{width}d}")
+    return ids
+
+
+def _dependency_rule(line: str) -> Optional[tuple]:
+    """('T008', ['T009']) style pairs from a Dependencies section line"""
+    for word, forward in ((" blocks ", True), (" before ", True), (" after ", False)):
+        if word in line:
+            left, right = line.split(word, 1)
+            left_ids, right_ids = _expand_ids(left), _expand_ids(right)
+            if left_ids and right_ids:
+                return (left_ids, right_ids) if forward else (right_ids, left_ids)
+    return None
+
+
+def parse_lines(lines: Iterable[str], digest: str = "") -> TaskGraph:
+    """Build a TaskGraph from tasks.md lines (streamed; one pass plus linking)"""
+    tasks: List[Task] = []
+    phases: List[str] = []
+    warnings: List[str] = []
+    seen: Set[str] = set()
+    rules = []
+    explicit: Dict[str, List[str]] = {}
+
+    heading = ""
+    phase_index = -1
+    phase_heading = None
+    in_fence = False
+    in_dependencies = False
+    offset = 0
+
+    for number, line in enumerate(lines, start=1):
+        line_offset = offset
+        offset += len(line.encode("utf-8")) if not line.isascii() else len(line)
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        if line.startswith("#"):
+            match = _HEADING.match(line)
+            if match and len(match.group(1)) <= 2:
+                heading = match.group(2)
+                in_dependencies = heading.lower().startswith("dependencies")
+            continue
+
+        match = _TASK.match(line)
+        if not match:
+            if in_dependencies:
+                rule = _dependency_rule(line)
+                if rule:
+                    rules.append(rule)
+            elif heading != phase_heading:
+                pass  # checklists outside task phases are not tasks
+            elif _CHECKBOX.match(line):
+                warnings.append(f"line {number}: checkbox without a task ID")
+            elif _BARE_ID.match(line):
+                warnings.append(f"line {number}: task without a checkbox")
+            continue
+
+        task_id = match.group(2)
+        if task_id in seen:
+            warnings.append(f"line {number}: duplicate task ID {task_id}")
+            continue
+        seen.add(task_id)
+
+        if heading != phase_heading:
+            phase_heading = heading
+            phase_index += 1
+            phases.append(heading)
+
+        rest = match.group(3)
+        parallel = False
+        story = None
+        marker = _MARKER.match(rest)
+        while marker:
+            if marker.group(1) == "P":
+                parallel = True
+            else:
+                story = marker.group(1)
+            rest = rest[marker.end() :]
+            marker = _MARKER.match(rest)
+
+        depends = _DEPENDS.search(rest)
+        if depends:
+            explicit[task_id] = _expand_ids(depends.group(1))
+
+        tasks.append(
+            Task(
+                id=task_id,
+                description=rest,
+                done=match.group(1) != " ",
+                parallel=parallel,
+                story=story,
+                phase=heading,
+                phase_index=phase_index,
+                files=list(dict.fromkeys(m.group(1) for m in _FILE.finditer(rest))),
+                line=number,
+                offset=line_offset,
+            )
+        )
+
+    _link(tasks, explicit, rules, seen, warnings)
+    return TaskGraph(tasks=tasks, phases=phases, digest=digest, warnings=warnings)
+
+
+def _link(tasks: List[Task], explicit, rules, known: Set[str], warnings: List[str]):
+    """Fill depends_on from phase order, [P] markers, file overlap and explicit notes"""
+    last_writer: Dict[str, str] = {}
+    phase = -1
+    barrier: Optional[str] = None  # last task without [P] in this phase
+    since_barrier: List[str] = []  # tasks after the barrier in this phase
+    index = {t.id: i for i, t in enumerate(tasks)}
+
+    for task in tasks:
+        if task.phase_index != phase:
+            phase, barrier, since_barrier = task.phase_index, None, []
+        deps: Dict[str, None] = {}
+        if task.parallel:
+            if barrier:
+                deps[barrier] = None
+        else:
+            if since_barrier:
+                deps.update(dict.fromkeys(since_barrier))
+            elif barrier:
+                deps[barrier] = None
+        for path in task.files:
+            previous = last_writer.get(path)
+            if previous and tasks[index[previous]].phase_index == phase:
+                deps[previous] = None
+            last_writer[path] = task.id
+        task.depends_on = list(deps)
+
+        if task.parallel:
+            since_barrier.append(task.id)
+        else:
+            barrier, since_barrier = task.id, []
+
+    extra: Dict[str, List[str]] = {}
+    for task_id, before in explicit.items():
+        extra.setdefault(task_id, []).extend(before)
+    for left, right in rules:
+        for later in right:
+            extra.setdefault(later, []).extend(left)
+    for task_id, before in extra.items():
+        if task_id not in index:
+            continue
+        task = tasks[index[task_id]]
+        for dep in before:
+            if dep == task_id:
+                continue
+            if dep not in known:
+                warnings.append(f"{task_id} depends on unknown task {dep}")
+                continue
+            if index[dep] > index[task_id]:
+                warnings.append(f"{task_id} depends on later task {dep}; ignored")
+                continue
+            if tasks[index[dep]].phase_index < task.phase_index:
+                continue  # already implied by the phase barrier
+            if dep not in task.depends_on:
+                task.depends_on.append(dep)
+
+
+_memory: Dict[str, TaskGraph] = {}
+
+
+def _cache_file(digest: str) -> Path:
+    return cache_dir() / "tasks" / f"{digest}.json"
+
+
+def _prune_disk_cache():
+    """Drop the least recently used cached graphs beyond DISK_SLOTS"""
+    entries = []
+    for path in (cache_dir() / "tasks").glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime_ns, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _mtime, path in entries[DISK_SLOTS:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def parse_tasks(text: str, use_cache: bool = True) -> TaskGraph:
+    """Parse tasks.md content, reusing a cached graph for identical content"""
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    if use_cache:
+        cached = _memory.get(digest)
+        if cached is not None:
+            return cached
+        cache_file = _cache_file(digest)
+        try:
+            graph = TaskGraph.from_dict(json.loads(cache_file.read_text()))
+        except (OSError, ValueError, KeyError, TypeError):
+            graph = None
+        if graph is not None and graph.digest == digest:
+            try:
+                os.utime(cache_file)  # mtime marks the most recent use
+            except OSError:
+                pass
+            _memory[digest] = graph
+            return graph
+
+    graph = parse_lines(text.splitlines(keepends=True), digest=digest)
+    if use_cache:
+        if len(_memory) >= MEMORY_SLOTS:
+            _memory.clear()
+        _memory[digest] = graph
+        try:
+            atomic_write(
+                _cache_file(digest), json.dumps(graph.to_dict(), separators=(",", ":")).encode()
+            )
+        except OSError:
+            pass
+        else:
+            _prune_disk_cache()
+    return graph
+
+
+def load_task_graph(path: Path, use_cache: bool = True) -> TaskGraph:
+    """Parse a tasks.md file (see parse_tasks)"""
+    return parse_tasks(Path(path).read_text(encoding="utf-8", errors="replace"), use_cache)
+
+
+def find_tasks_file(path: Path) -> Optional[Path]:
+    """tasks.md itself, or the current feature's tasks.md inside a project"""
+    from here_spec.core.artifacts import feature_dir
+
+    path = Path(path)
+    if path.is_file():
+        return path
+    feature = feature_dir(path)
+    if feature is not None and (feature / "tasks.md").exists():
+        return feature / "tasks.md"
+    return None
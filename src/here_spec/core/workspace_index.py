@@ -0,0 +1,291 @@
+"""
+Workspace Index
+SQLite catalogue of every here-spec project on this machine
+
+CheckpointManager records each project whenever it saves, so project
+metadata (step, agent, timestamps) for project selection and `status --all`
+comes from indexed queries instead of opening and replaying every checkpoint
+file. A row is only trusted while the project's checkpoint files are no newer
+than its updated_at: projects changed outside here-spec (or missing from the
+index) are re-read once and their rows refreshed.
+
+Which directories are projects is still answered by walking the tree with
+here_spec.core.discovery, whose per-directory mtime cache makes that cheap on
+an unchanged tree; the index does not replace that walk.
+
+Location: $HERE_SPEC_INDEX, else $XDG_DATA_HOME/here-spec/index.sqlite, else
+~/.local/share/here-spec/index.sqlite. HERE_SPEC_INDEX=off disables it.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    project_name TEXT NOT NULL DEFAULT '',
+    current_step TEXT NOT NULL DEFAULT 'init',
+    completed_steps TEXT NOT NULL DEFAULT '[]',
+    agent TEXT NOT NULL DEFAULT '',
+    step_started_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_parent ON projects (parent);
+"""
+
+# Columns added after the first release, for databases created before them
+MIGRATIONS = {"step_started_at": "ALTER TABLE projects ADD COLUMN step_started_at REAL"}
+
+LOOKUP_CHUNK = 500
+
+DISABLED_VALUES = {"0", "off", "false", "no", "none"}
+
+
+def index_path() -> Optional[Path]:
+    """Where the index lives, or None when disabled"""
+    env_path = os.environ.get("HERE_SPEC_INDEX")
+    if env_path:
+        if env_path.strip().lower() in DISABLED_VALUES:
+            return None
+        return Path(env_path)
+    data_home = os.environ.get("XDG_DATA_HOME")
+    base = Path(data_home) if data_home else Path.home() / ".local" / "share"
+    return base / "here-spec" / "index.sqlite"
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict:
+    project = dict(row)
+    project["completed_steps"] = json.loads(project["completed_steps"])
+    return project
+
+
+class WorkspaceIndex:
+    """Thin wrapper around the index database"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or index_path()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(projects)")}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def upsert(self, project_path: Path, state: Dict, now: Optional[float] = None):
+        """Record (or refresh) a project from its checkpoint state"""
+        if not self.enabled:
+            return
+        project_path = project_path.resolve()
+        now = time.time() if now is None else now
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO projects (path, parent, name, project_name, current_step,
+                                      completed_steps, agent, step_started_at,
+                                      created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    project_name = excluded.project_name,
+                    current_step = excluded.current_step,
+                    completed_steps = excluded.completed_steps,
+                    agent = excluded.agent,
+                    step_started_at = excluded.step_started_at,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    str(project_path),
+                    str(project_path.parent),
+                    project_path.name,
+                    state.get("project_name", ""),
+                    state.get("current_step", "init"),
+                    json.dumps(state.get("completed_steps") or []),
+                    state.get("agent", ""),
+                    state.get("step_started_at"),
+                    now,
+                    now,
+                ),
+            )
+
+    def remove(self, project_path: Path):
+        if not self.enabled:
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM projects WHERE path = ?", (str(project_path),))
+
+    def get(self, project_path: Path) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        row = (
+            self._connect()
+            .execute("SELECT * FROM projects WHERE path = ?", (str(project_path.resolve()),))
+            .fetchone()
+        )
+        return _row_to_dict(row) if row else None
+
+    def projects(self, parent: Optional[Path] = None) -> List[Dict]:
+        """Indexed projects (optionally only direct children of parent), by path"""
+        if not self.enabled:
+            return []
+        conn = self._connect()
+        if parent is None:
+            rows = conn.execute("SELECT * FROM projects ORDER BY path")
+        else:
+            rows = conn.execute(
+                "SELECT * FROM projects WHERE parent = ? ORDER BY path",
+                (str(parent.resolve()),),
+            )
+        return [_row_to_dict(row) for row in rows]
+
+    def lookup(self, project_paths: List[Path]) -> Dict[str, Dict]:
+        """Indexed rows for many projects at once, keyed by resolved path"""
+        if not self.enabled:
+            return {}
+        keys = [str(path.resolve()) for path in project_paths]
+        conn = self._connect()
+        found: Dict[str, Dict] = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start : start + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT * FROM projects WHERE path IN ({placeholders})", chunk
+            ):
+                found[row["path"]] = _row_to_dict(row)
+        return found
+
+
+def record_project(project_path: Path, state: Dict):
+    """Best-effort index update: a broken index must never break a save"""
+    index = WorkspaceIndex()
+    if not index.enabled:
+        return
+    try:
+        index.upsert(project_path, state)
+    except (sqlite3.Error, OSError):
+        pass
+    finally:
+        index.close()
+
+
+def load_project_state(project_path: Path) -> Tuple[Dict, Optional[str]]:
+    """Checkpoint state of a project and the error reading it, if any"""
+    from here_spec.core.state_store import JournaledStateStore
+
+    store = JournaledStateStore(project_path / ".speckit" / "checkpoints.json")
+    try:
+        return store.load() or {}, None
+    except (ValueError, OSError) as exc:
+        return {}, str(exc)
+
+
+def checkpoint_mtime(project_path: Path) -> Optional[float]:
+    """Last modification of a project's checkpoint snapshot or journal"""
+    from here_spec.core.state_store import journal_path_for
+
+    snapshot = project_path / ".speckit" / "checkpoints.json"
+    mtimes = []
+    for path in (snapshot, journal_path_for(snapshot)):
+        try:
+            mtimes.append(path.stat().st_mtime)
+        except OSError:
+            pass
+    return max(mtimes) if mtimes else None
+
+
+def _state_row(project_path: Path, state: Dict) -> Dict:
+    return {
+        "path": str(project_path),
+        "name": project_path.name,
+        "project_name": state.get("project_name", ""),
+        "current_step": state.get("current_step", "init"),
+        "completed_steps": state.get("completed_steps") or [],
+        "agent": state.get("agent", ""),
+        "step_started_at": state.get("step_started_at"),
+    }
+
+
+def project_rows(
+    index: WorkspaceIndex, paths: List[Path], pool: Optional[Executor] = None
+) -> List[Dict]:
+    """
+    Metadata rows for paths, in order, each with the checkpoint's modified_at.
+    Rows come from the index; a project it does not know, or whose checkpoint
+    files changed after its row was written, is re-read (on pool, if given)
+    and its row refreshed. Unreadable projects get an "error" and no row.
+    """
+    try:
+        known = index.lookup(paths)
+    except (sqlite3.Error, OSError):
+        known = {}
+
+    rows: List[Optional[Dict]] = []
+    stale = []
+    for path in paths:
+        mtime = checkpoint_mtime(path)
+        row = known.get(str(path.resolve()))
+        if row is None or (mtime is not None and mtime > row["updated_at"]):
+            stale.append(len(rows))
+            row = None
+        else:
+            row = dict(row, modified_at=mtime)
+        rows.append(row)
+
+    stale_paths = [paths[i] for i in stale]
+    loaded = (pool.map if pool is not None else map)(load_project_state, stale_paths)
+    for i, path, (state, error) in zip(stale, stale_paths, loaded):
+        row = _state_row(path, state)
+        row["modified_at"] = checkpoint_mtime(path)
+        if error is not None:
+            row["error"] = error
+        else:
+            try:
+                index.upsert(path, state)
+            except (sqlite3.Error, OSError):
+                pass
+        rows[i] = row
+    return rows
+
+
+def discover_projects(base_path: Path, max_depth: int = 1, ignore=None) -> List[Dict]:
+    """
+    Projects below base_path (up to max_depth levels) with their metadata.
+    Metadata comes from the index and is re-read only for projects it does
+    not know or whose checkpoint changed since (see project_rows).
+    """
+    from here_spec.core.discovery import DEFAULT_IGNORES, DiscoveryEngine
+
+    engine = DiscoveryEngine(
+        max_depth=max_depth, ignore=DEFAULT_IGNORES if ignore is None else ignore
+    )
+    paths = engine.find_projects(base_path)
+
+    index = WorkspaceIndex()
+    try:
+        return project_rows(index, paths)
+    finally:
+        index.close()
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_user_dirs(tmp_path_factory, monkeypatch):
+    """Keep the workspace index, caches and config out of $HOME"""
+    user_dir = tmp_path_factory.mktemp("user")
+    monkeypatch.setenv("HERE_SPEC_INDEX", str(user_dir / "index.sqlite"))
+    monkeypatch.setenv("HERE_SPEC_CACHE_DIR", str(user_dir / "cache"))
+    monkeypatch.setenv("HERE_SPEC_CONFIG", str(user_dir / "config.json"))
@@ -0,0 +1,135 @@
+import asyncio
+import io
+import os
+import signal
+import stat
+import sys
+import textwrap
+
+import pytest
+
+from here_spec.agents.runner import run_agent, run_agent_async
+
+FAKE_AGENT = textwrap.dedent(
+    """
+    import os, signal, sys, time
+
+    mode = sys.argv[1]
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], "w") as f:
+            f.write(str(os.getpid()))
+
+    def on_sigint(signum, frame):
+        print("got SIGINT", flush=True)
+        sys.exit(130)
+
+    signal.signal(signal.SIGINT, on_sigint)
+    print("starting", flush=True)
+    print("warming up", file=sys.stderr, flush=True)
+    if mode == "quick":
+        print("done", flush=True)
+        sys.exit(3)
+    time.sleep(30)
+    """
+)
+
+
+@pytest.fixture
+def fake_agent(tmp_path):
+    script = tmp_path / "fake_agent.py"
+    script.write_text(FAKE_AGENT)
+    return [sys.executable, str(script)]
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_streams_lines_to_terminal_and_log(fake_agent, tmp_path):
+    out, err = io.StringIO(), io.StringIO()
+    log_path = tmp_path / "logs" / "run.log"
+
+    result = asyncio.run(
+        run_agent_async(fake_agent + ["quick"], tmp_path, log_path=log_path, stdout=out, stderr=err)
+    )
+
+    assert result.returncode == 3
+    assert not result.ok
+    assert out.getvalue() == "starting\ndone\n"
+    assert err.getvalue() == "warming up\n"
+    log = log_path.read_text()
+    assert "[out] starting" in log
+    assert "[err] warming up" in log
+    assert log.rstrip().endswith("# exit 3")
+
+
+def test_timeout_terminates_agent(fake_agent, tmp_path):
+    pid_file = tmp_path / "pid"
+    result = run_agent(fake_agent + ["slow", str(pid_file)], tmp_path, timeout=0.5, stream=True)
+
+    assert result.timed_out
+    assert result.duration < 6
+    assert not _alive(int(pid_file.read_text()))
+
+
+def test_cancellation_cleans_up_agent(fake_agent, tmp_path):
+    pid_file = tmp_path / "pid"
+
+    async def scenario():
+        task = asyncio.ensure_future(
+            run_agent_async(fake_agent + ["slow", str(pid_file)], tmp_path, stdout=io.StringIO())
+        )
+        while not pid_file.exists() or not pid_file.read_text():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert not _alive(int(pid_file.read_text()))
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX signals")
+def test_sigint_is_forwarded_to_agent(fake_agent, tmp_path):
+    out = io.StringIO()
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.5, os.kill, os.getpid(), signal.SIGINT)
+        return await run_agent_async(fake_agent + ["slow"], tmp_path, stdout=out)
+
+    result = asyncio.run(scenario())
+    assert result.interrupted
+    assert result.returncode == 130
+    assert "got SIGINT" in out.getvalue()
+
+
+def test_launcher_runs_agent_through_runner(tmp_path, monkeypatch):
+    from here_spec.agents import claude as claude_module
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "claude"
+    fake.write_text("#!/bin/sh\necho \"claude called with $1\"\n")
+    fake.chmod(fake.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("HERE_SPEC_AGENT_STREAM", "1")
+    monkeypatch.setattr(claude_module.sys.stdin, "isatty", lambda: True)
+
+    project = tmp_path / "project"
+    project.mkdir()
+    context = {
+        "project_name": "demo",
+        "step": "spec",
+        "next_command": "/speckit.specify",
+        "answers": {},
+        "completed_steps": [],
+    }
+    claude_module.ClaudeLauncher().launch_for_step(context, project)
+
+    (log,) = (project / ".speckit" / "logs").glob("spec-*.log")
+    assert "[out] claude called with --system-prompt" in log.read_text()
@@ -0,0 +1,73 @@
+import os
+import shutil
+from pathlib import Path
+
+from here_spec.core.artifacts import ArtifactCache, build_artifact_context, extract_markdown
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _project(tmp_path):
+    project = tmp_path / "project"
+    shutil.copytree(FIXTURES / "projects" / "full-feature", project)
+    return project
+
+
+def test_extracts_headings_requirements_and_open_tasks():
+    text = (FIXTURES / "tasks" / "sample-tasks.md").read_text()
+    summary = extract_markdown(text)
+
+    assert summary["title"] == "Tasks: Sample Feature"
+    assert (2, "Phase 2: Implementation") in summary["headings"]
+    assert summary["done_tasks"] == 1
+    assert ("Phase 1: Setup", "T002 [P] Configure dependencies") in summary["open_tasks"]
+
+    spec = extract_markdown("# Spec\n\n## Requirements\n\n- **FR-001**: Upload\n```\n- [ ] x\n```\n")
+    assert spec["requirements"] == ["- **FR-001**: Upload"]
+    assert spec["open_tasks"] == []
+
+
+def test_build_artifact_context_digests_latest_feature(tmp_path):
+    project = _project(tmp_path)
+    older = project / "specs" / "000-old"
+    older.mkdir()
+    (older / "spec.md").write_text("# Old\n")
+    os.utime(older / "spec.md", (1, 1))
+
+    text = build_artifact_context(project)
+
+    assert text.startswith("## Spec Artifacts (specs/001-test-feature)")
+    assert "- **FR-001**: Feature requirement" in text
+    assert "- **Language/Version**: Node.js 18+" in text
+    assert "### tasks.md — 3 of 3 tasks done" in text
+    assert build_artifact_context(tmp_path / "nothing") == ""
+
+
+def test_unchanged_artifacts_are_served_from_cache(tmp_path):
+    project = _project(tmp_path)
+    first = ArtifactCache(project)
+    text = build_artifact_context(project, cache=first)
+    first.save()
+    assert first.stats == {"parsed": 3, "cached": 0}
+
+    tasks = project / "specs" / "001-test-feature" / "tasks.md"
+    tasks.write_text(tasks.read_text() + "\n- [ ] T004 Ship it\n")
+
+    second = ArtifactCache(project)
+    updated = build_artifact_context(project, cache=second)
+    assert second.stats == {"parsed": 1, "cached": 2}
+    assert updated != text
+    assert "- [ ] T004 Ship it" in updated
+
+
+def test_build_context_includes_artifacts(monkeypatch, tmp_path):
+    from here_spec.agents import claude as claude_module
+
+    project = _project(tmp_path)
+    monkeypatch.setattr(claude_module.sys.stdin, "isatty", lambda: False)
+    claude_module.ClaudeLauncher().launch({"project_name": "demo", "answers": {}}, project)
+
+    text = (project / ".speckit" / "launcher-context.md").read_text()
+    assert "## Spec Artifacts (specs/001-test-feature)" in text
+    assert text.index("Spec Artifacts") < text.index("## Implementation Notes")
+    assert (project / ".speckit" / "artifacts.json").exists()
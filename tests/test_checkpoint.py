@@ -45,3 +45,108 @@ def test_checkpoint_version_mismatch(tmp_path):
 
     cm = CheckpointManager(Console(), tmp_path)
     assert cm.state["project_name"] == ""
+
+
+def test_checkpoint_replays_journal(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path)
+    cm._save_state()
+    cm.state["answers"]["features"] = "Albums"
+    cm.state["current_step"] = "plan"
+    cm._save_state()
+
+    assert (tmp_path / ".speckit" / "checkpoints.journal").exists()
+    cm2 = CheckpointManager(Console(), tmp_path)
+    assert cm2.get_next_step() == "plan"
+    assert cm2.state["answers"]["features"] == "Albums"
+
+
+def test_checkpoint_invalid_json_keeps_backup(tmp_path):
+    state_file = tmp_path / ".speckit" / "checkpoints.json"
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text("not-json")
+
+    CheckpointManager(Console(), tmp_path)
+    assert (tmp_path / ".speckit" / "checkpoints.json.corrupt").read_text() == "not-json"
+
+
+def test_checkpoint_skips_identical_writes(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path)
+    cm._save_state()
+    cm._save_state()
+    cm.state["agent"] = cm.state["agent"]
+    cm._save_state()
+
+    stats = cm.io_stats()
+    assert stats["save_requests"] == 3
+    assert stats["flushes"] == 1
+    assert stats["writes_skipped"] == 2
+
+
+def test_checkpoint_batch_coalesces_writes(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path, auto_confirm=True)
+    cm.state["project_name"] = "demo"
+    cm.state["answers"] = {"features": "Albums", "constraints": []}
+    cm._save_state()
+
+    with cm.batch():
+        cm.state["current_step"] = "plan"
+        cm._save_state()
+        cm._mark_complete("constitution")
+        cm._save_state()
+        assert CheckpointManager(Console(), tmp_path).get_next_step() == "init"
+
+    assert CheckpointManager(Console(), tmp_path).get_next_step() == "plan"
+    stats = cm.io_stats()
+    assert stats["flushes"] == 2
+    assert stats["writes_coalesced"] == 1
+
+
+def test_run_checkpoint_flushes_once(tmp_path, monkeypatch):
+    from here_spec import checkpoint as checkpoint_module
+
+    monkeypatch.setattr(checkpoint_module, "display_art", lambda *args, **kwargs: None)
+    cm = CheckpointManager(Console(), tmp_path, auto_confirm=True)
+    cm.state["project_name"] = "demo"
+    cm.state["answers"] = {"features": "Albums", "constraints": []}
+    cm._save_state()
+
+    context = cm.run_checkpoint("spec")
+    assert context["step"] == "spec"
+    assert cm.io_stats()["flushes"] == 2
+    assert CheckpointManager(Console(), tmp_path).state["completed_steps"] == ["constitution"]
+
+
+TASKS_MD = """\
+## Phase 1: Setup
+
+- [x] T001 Create project structure
+- [ ] T002 [P] Add model in src/a.py
+- [ ] T003 [P] Add model in src/b.py
+"""
+
+
+def test_reconcile_tasks_follows_checkboxes(tmp_path):
+    from here_spec.core.tasks import parse_tasks
+
+    cm = CheckpointManager(Console(), tmp_path)
+    cm.record_task("T002", "merged", commit="abc")
+    cm.record_task("T003", "failed", detail="agent exited 1")
+    cm.record_task("T099", "merged")
+
+    assert cm.reconcile_tasks(parse_tasks(TASKS_MD)) == ["T002", "T003"]
+
+    cm2 = CheckpointManager(Console(), tmp_path)
+    tasks = cm2.state["build_tasks"]
+    assert tasks["T001"]["status"] == "done"
+    assert tasks["T002"]["status"] == "reopened"
+    assert tasks["T003"]["status"] == "failed"
+    assert "T099" not in tasks
+
+    # Unchanged tasks.md: nothing to write
+    flushes = cm2.write_stats["flushes"]
+    assert cm2.reconcile_tasks(parse_tasks(TASKS_MD)) == ["T002", "T003"]
+    assert cm2.write_stats["flushes"] == flushes
+
+    ticked = TASKS_MD.replace("[ ] T002", "[x] T002")
+    assert cm2.reconcile_tasks(parse_tasks(ticked)) == ["T003"]
+    assert cm2.state["build_tasks"]["T002"]["status"] == "done"
@@ -0,0 +1,99 @@
+import json
+
+from here_spec.agents.budget import (
+    estimate_tokens,
+    facts_budget,
+    fit_context,
+    step_budget,
+    truncate_tokens,
+)
+
+PRD = "Users upload photos into shared albums. " * 400
+
+
+def _context(**answers):
+    return {"project_name": "demo", "step": "spec", "answers": answers, "completed_steps": []}
+
+
+def test_estimator_is_deterministic_and_roughly_proportional():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") == 4
+    assert estimate_tokens("a, b.") == 4
+    assert estimate_tokens("🐕") == 1
+    assert estimate_tokens(PRD) == estimate_tokens(PRD)
+    assert estimate_tokens(PRD * 2) == 2 * estimate_tokens(PRD)
+
+
+def test_truncate_keeps_whole_sentences_within_limit():
+    short = truncate_tokens(PRD, 100)
+    assert estimate_tokens(short) <= 100
+    assert short.startswith("Users upload photos")
+    assert "albums. … [trimmed" in short
+    assert truncate_tokens(PRD, 100) == short
+    assert truncate_tokens("tiny", 100) == "tiny"
+
+
+def test_lower_priority_answers_are_trimmed_first():
+    fitted = fit_context(
+        "step", _context(big_picture=PRD, features="Albums and sharing", audience=PRD), 2500, 1500
+    )
+
+    assert fitted.tokens <= 2500
+    assert list(fitted.trimmed) == ["audience", "big_picture"]
+    assert fitted.trimmed["audience"][1] < fitted.trimmed["big_picture"][1]
+    assert "Albums and sharing" in fitted.text
+    assert 1400 <= fitted.sections["facts"] <= 1500
+
+
+def test_step_budgets_never_change_the_facts_block():
+    from here_spec.agents.context import describe_layout
+
+    answers = {"big_picture": PRD, "features": "Albums and sharing"}
+    tight = fit_context("step", dict(_context(**answers), step="spec"), 1000)
+    loose = fit_context("step", dict(_context(**answers), step="plan"), 8000)
+    build = fit_context("build", dict(_context(**answers), artifacts=PRD), 3000)
+
+    facts = {describe_layout(f.text)["facts"] for f in (tight, loose, build)}
+    assert len(facts) == 1
+    assert tight.over_budget and not loose.over_budget
+    assert list(build.trimmed) == ["big_picture", "artifacts"]
+    assert build.tokens <= 3000
+
+
+def test_contexts_within_budget_are_untouched():
+    from here_spec.agents.context import render_context
+
+    context = _context(big_picture="A photo app")
+    fitted = fit_context("step", context, 3000)
+    assert fitted.trimmed == {}
+    assert fitted.text == render_context("step", context)
+    assert fit_context("step", _context(big_picture=PRD), 0, 0).trimmed == {}
+
+
+def test_budget_comes_from_env_then_config(monkeypatch, tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps({"context_budgets": {"plan": 5000, "default": 1200, "facts": 900}})
+    )
+    monkeypatch.setenv("HERE_SPEC_CONFIG", str(config))
+
+    assert step_budget("plan") == 5000
+    assert step_budget("spec") == 1200
+    monkeypatch.setenv("HERE_SPEC_CONTEXT_BUDGET", "800")
+    assert step_budget("plan") == 800
+    assert facts_budget() == 900
+
+
+def test_launcher_records_token_estimates(monkeypatch, tmp_path):
+    from here_spec.agents import claude as claude_module
+
+    monkeypatch.setattr(claude_module.sys.stdin, "isatty", lambda: False)
+    monkeypatch.setenv("HERE_SPEC_CONTEXT_BUDGET", "2000")
+    claude_module.ClaudeLauncher().launch_for_step(_context(big_picture=PRD), tmp_path)
+
+    usage = json.loads((tmp_path / ".speckit" / "context-tokens.json").read_text())
+    assert usage["spec"]["budget"] == 2000
+    assert usage["spec"]["tokens"] <= 2000
+    assert usage["spec"]["trimmed"]["big_picture"][0] > 2000
+    text = (tmp_path / ".speckit" / "context-spec.md").read_text()
+    assert estimate_tokens(text) == usage["spec"]["tokens"]
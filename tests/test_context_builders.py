@@ -141,3 +141,101 @@ def test_opencode_build_context_saved(monkeypatch, tmp_path):
 
     assert (tmp_path / ".speckit" / "launcher-context.md").exists()
     assert (tmp_path / ".opencode" / "commands" / "interview-context.md").exists()
+
+
+def test_context_engine_compiles_once_and_renders_batches(monkeypatch):
+    from here_spec.agents import context as context_engine
+    from here_spec.agents.opencode import OpencodeLauncher
+
+    calls = []
+    monkeypatch.setattr(
+        context_engine, "get_spec_personality", lambda: calls.append(1) or "PERSONALITY"
+    )
+    caches = [
+        context_engine.static_prefix,
+        context_engine.prefix_id,
+        context_engine.static_fragments,
+        context_engine.compiled,
+    ]
+    for cache in caches:
+        cache.cache_clear()
+    try:
+        contexts = [
+            {"project_name": f"p{i}", "step": step, "answers": {"features": "{x} $y"}}
+            for i, step in enumerate(["constitution", "spec", "plan", "tasks"] * 25)
+        ]
+        batch = context_engine.render_batch("step", contexts)
+
+        assert calls == [1]
+        assert context_engine.compiled("step") is context_engine.compiled("step")
+        assert batch == [context_engine.render_context("step", c) for c in contexts]
+        assert "# Project: p1\n" in batch[1]
+        assert "# Step: Spec\n" in batch[1]
+        assert "**Features**: {x} $y" in batch[1]
+        assert "PERSONALITY\n## Communication Style" in batch[0]
+        assert ClaudeLauncher()._build_build_context(contexts[0]) == (
+            OpencodeLauncher()._build_build_context(contexts[0])
+        )
+    finally:
+        for cache in caches:
+            cache.cache_clear()
+
+
+def test_contexts_share_a_stable_prefix_then_project_facts():
+    from here_spec.agents.context import describe_layout, prefix_id, render_context, static_prefix
+
+    base = {"answers": {"big_picture": "A photo app"}, "completed_steps": []}
+    demo_spec = render_context("step", {**base, "project_name": "demo", "step": "spec"})
+    demo_plan = render_context(
+        "step", {**base, "project_name": "demo", "step": "plan", "completed_steps": ["spec"]}
+    )
+    demo_build = render_context("build", {**base, "project_name": "demo"})
+    other = render_context("step", {**base, "project_name": "other", "step": "spec"})
+
+    for text in (demo_spec, demo_plan, demo_build, other):
+        assert text.startswith(static_prefix())
+
+    layouts = [describe_layout(t) for t in (demo_spec, demo_plan, demo_build, other)]
+    assert {layout["prefix"] for layout in layouts} == {prefix_id()}
+    assert prefix_id().startswith("v1:")
+    assert layouts[0]["facts"] == layouts[1]["facts"] == layouts[2]["facts"]
+    assert layouts[3]["facts"] != layouts[0]["facts"]
+
+    facts_end = layouts[0]["prefix_bytes"] + layouts[0]["facts_bytes"]
+    assert demo_spec.encode()[:facts_end] == demo_plan.encode()[:facts_end]
+    assert describe_layout("# hand written")["prefix"] is None
+
+
+def test_context_report_command(monkeypatch, tmp_path):
+    from typer.testing import CliRunner
+
+    from here_spec.agents import claude as claude_module
+    from here_spec.agents.context import prefix_id
+    from here_spec.cli.main import app
+
+    monkeypatch.setattr(claude_module.sys.stdin, "isatty", lambda: False)
+    launcher = claude_module.ClaudeLauncher()
+    for step in ("constitution", "spec"):
+        launcher.launch_for_step({"project_name": "demo", "step": step, "answers": {}}, tmp_path)
+    (tmp_path / ".speckit" / "context-old.md").write_text("# Step: Old\n")
+
+    result = CliRunner().invoke(app, ["context-report", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert f"2/3 contexts share prefix {prefix_id()}" in result.output
+    assert "1 distinct project facts block(s)" in result.output
+    assert "stale" in result.output
+
+
+def test_build_context_lists_only_outstanding_tasks_on_resume():
+    from here_spec.agents.context import render_context
+    from here_spec.core.tasks import parse_tasks
+
+    graph = parse_tasks("## Phase 1\n\n- [x] T001 Scaffold\n- [ ] T002 Add API in src/api.py\n")
+    context = {"project_name": "demo", "answers": {}, "completed_steps": []}
+
+    assert "## Resuming" not in render_context("build", context)
+    text = render_context("build", dict(context, resume_tasks=graph.open_tasks()))
+    assert "## Resuming" in text
+    assert "- T002 Add API in src/api.py" in text
+    assert "T001" not in text
@@ -0,0 +1,80 @@
+import json
+import threading
+
+import pytest
+
+from here_spec.cli import client, daemon, runtime
+
+
+def _write_project(path, name="demo", step="plan"):
+    state_file = path / ".speckit" / "checkpoints.json"
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text(json.dumps({"version": 1, "project_name": name, "current_step": step}))
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    sock = tmp_path / "d.sock"
+    monkeypatch.setenv("HERE_SPEC_SOCKET", str(sock))
+    monkeypatch.setattr(runtime, "_checkpoint_cache", None)
+    monkeypatch.setattr(runtime, "_system_info", None)
+    monkeypatch.setattr(runtime, "_warm", False)
+    runtime.enable_warm_cache()
+
+    server = daemon.create_server(sock)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield sock
+    server.shutdown()
+    server.server_close()
+
+
+def test_should_forward_rules():
+    assert client.should_forward(["status"])
+    assert client.should_forward(["check"])
+    assert not client.should_forward(["step", "plan"])
+    assert not client.should_forward(["continue"])
+    assert not client.should_forward(["init"])
+    assert not client.should_forward(["status", "--help"])
+
+
+def test_client_falls_back_without_daemon(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("HERE_SPEC_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.chdir(tmp_path)
+
+    assert client.forward(["status"]) is None
+    with pytest.raises(SystemExit) as exc:
+        client.main(["status"])
+    assert exc.value.code == 0
+    assert "No project found" in capsys.readouterr().out
+
+
+def test_daemon_serves_status_and_reuses_manager(running_daemon, tmp_path, capsys):
+    project = tmp_path / "proj"
+    _write_project(project)
+
+    assert client.forward(["status", str(project)], running_daemon) == 0
+    out = capsys.readouterr().out
+    assert "Project: demo" in out
+    assert "plan (current)" in out
+    assert "\x1b[" not in out
+
+    cached = runtime._checkpoint_cache[project.resolve()][1]
+    assert client.forward(["status", str(project)], running_daemon) == 0
+    assert runtime._checkpoint_cache[project.resolve()][1] is cached
+
+
+def test_daemon_reports_exit_codes(running_daemon, tmp_path, capsys):
+    argv = ["status", str(tmp_path), "--all", "--format", "bogus"]
+    assert client.forward(argv, running_daemon) == 1
+    assert "Unknown format" in capsys.readouterr().out
+
+
+def test_daemon_refuses_commands_that_can_run_an_agent(running_daemon, tmp_path, capsys):
+    assert client.forward(["step", "nonsense", "--path", str(tmp_path)], running_daemon) is None
+    assert capsys.readouterr().out == ""
+
+
+def test_create_server_refuses_live_socket(running_daemon):
+    with pytest.raises(FileExistsError):
+        daemon.create_server(running_daemon)
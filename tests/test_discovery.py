@@ -0,0 +1,76 @@
+import os
+
+from here_spec.core.discovery import DiscoveryEngine
+
+
+def _project(path):
+    (path / ".speckit").mkdir(parents=True)
+    (path / ".speckit" / "checkpoints.json").write_text("{}")
+
+
+def _names(projects, root):
+    return [os.path.relpath(p, root) for p in projects]
+
+
+def test_finds_nested_projects_within_depth(tmp_path):
+    _project(tmp_path / "a")
+    _project(tmp_path / "team" / "b")
+    _project(tmp_path / "team" / "deep" / "er" / "c")
+
+    assert _names(DiscoveryEngine(max_depth=1).find_projects(tmp_path), tmp_path) == ["a"]
+    assert _names(DiscoveryEngine(max_depth=2).find_projects(tmp_path), tmp_path) == [
+        "a",
+        os.path.join("team", "b"),
+    ]
+    assert len(DiscoveryEngine(max_depth=4).find_projects(tmp_path)) == 3
+
+
+def test_skips_ignored_dirs_and_prunes_at_projects(tmp_path):
+    _project(tmp_path / "node_modules" / "pkg")
+    _project(tmp_path / "app.egg-info" / "x")
+    _project(tmp_path / "outer")
+    _project(tmp_path / "outer" / "inner")
+
+    assert _names(DiscoveryEngine().find_projects(tmp_path), tmp_path) == ["outer"]
+    assert _names(DiscoveryEngine(ignore=()).find_projects(tmp_path), tmp_path) == [
+        os.path.join("app.egg-info", "x"),
+        os.path.join("node_modules", "pkg"),
+        "outer",
+    ]
+
+
+def test_generic_directory_names_are_not_ignored(tmp_path):
+    for name in ("build", "dist", "env", ".cache"):
+        _project(tmp_path / name)
+
+    assert _names(DiscoveryEngine().find_projects(tmp_path), tmp_path) == [
+        ".cache",
+        "build",
+        "dist",
+        "env",
+    ]
+
+
+def test_unchanged_tree_is_served_from_cache(tmp_path):
+    for name in ["a", "b", "c"]:
+        _project(tmp_path / "group" / name)
+        (tmp_path / "other" / name / "src").mkdir(parents=True)
+
+    first = DiscoveryEngine()
+    assert len(first.find_projects(tmp_path)) == 3
+    assert first.stats["listed"] > 0
+
+    second = DiscoveryEngine()
+    assert len(second.find_projects(tmp_path)) == 3
+    assert second.stats["listed"] == 0
+    assert second.stats["cached"] == first.stats["directories"]
+
+
+def test_cache_notices_new_projects(tmp_path):
+    _project(tmp_path / "a")
+    assert len(DiscoveryEngine().find_projects(tmp_path)) == 1
+
+    _project(tmp_path / "nested" / "b")
+    engine = DiscoveryEngine()
+    assert len(engine.find_projects(tmp_path)) == 2
+    assert engine.stats["listed"] >= 1
@@ -0,0 +1,230 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from here_spec.agents.executor import (
+    CONFLICT,
+    FAILED,
+    MERGED,
+    NO_CHANGES,
+    SKIPPED,
+    GitError,
+    ParallelExecutor,
+    build_workers,
+    command_override,
+)
+from here_spec.core.tasks import load_task_graph
+
+TASKS = textwrap.dedent(
+    """\
+    # Tasks
+
+    ## Phase 1: Setup
+
+    - [x] T001 Create project structure
+
+    ## Phase 2: Core
+
+    - [ ] T002 [P] Add model in src/a.py
+    - [ ] T003 [P] Add model in src/b.py
+    - [ ] T004 [P] Add model in src/c.py
+    - [ ] T005 Wire models together in src/app.py
+    """
+)
+
+FAKE_AGENT = textwrap.dedent(
+    """
+    import os, sys, time
+
+    context, task = sys.argv[1], sys.argv[2]
+    events = os.environ["FAKE_AGENT_EVENTS"]
+    with open(os.path.join(events, task + ".start"), "w") as f:
+        f.write(str(time.time()))
+    assert open(context).read().count("# Task " + task) == 1
+    time.sleep(0.3)
+    print("working on", task, flush=True)
+    if task in os.environ.get("FAKE_AGENT_FAIL", "").split(","):
+        sys.exit(1)
+    if task in os.environ.get("FAKE_AGENT_NOOP", "").split(","):
+        sys.exit(0)
+    shared = task in os.environ.get("FAKE_AGENT_SHARED", "").split(",")
+    with open("shared.txt" if shared else task + ".txt", "w") as f:
+        f.write(task + "\\n")
+    if task in os.environ.get("FAKE_AGENT_FAIL_LATE", "").split(","):
+        sys.exit(1)
+    with open(os.path.join(events, task + ".end"), "w") as f:
+        f.write(str(time.time()))
+    """
+)
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _task_branches(repo):
+    return _git(repo, "branch", "--list", "--format=%(refname:short)", "here-spec/*")
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.name", "Test")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "commit.gpgsign", "false")
+    (repo / ".gitignore").write_text(".speckit/\n")
+    tasks_file = repo / "specs" / "001-feature" / "tasks.md"
+    tasks_file.parent.mkdir(parents=True)
+    tasks_file.write_text(TASKS)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "initial")
+
+    events = tmp_path / "events"
+    events.mkdir()
+    script = tmp_path / "fake_agent.py"
+    script.write_text(FAKE_AGENT)
+    monkeypatch.setenv("FAKE_AGENT_EVENTS", str(events))
+    monkeypatch.setenv("HERE_SPEC_TASK_AGENT", f"{sys.executable} {script} {{context}} {{task}}")
+    return repo, tasks_file, events
+
+
+def _executor(repo, tasks_file, workers, progress=None):
+    return ParallelExecutor(
+        repo,
+        load_task_graph(tasks_file, use_cache=False),
+        tasks_file,
+        command_override(),
+        workers=workers,
+        context={"project_name": "demo", "answers": {}},
+        progress=progress,
+        stdout=open("/dev/null", "w"),
+    )
+
+
+def test_parallel_tasks_overlap_and_merge_in_order(project):
+    repo, tasks_file, events = project
+    seen = []
+    executor = _executor(repo, tasks_file, 3, lambda *event: seen.append(event[:2]))
+
+    results = executor.run()
+
+    assert [(r.task_id, r.status) for r in results] == [
+        ("T002", MERGED),
+        ("T003", MERGED),
+        ("T004", MERGED),
+        ("T005", MERGED),
+    ]
+    assert executor.stats["max_concurrency"] == 3
+    # T005 is not [P]: it starts only after every [P] task before it finished
+    start = lambda t: float((events / f"{t}.start").read_text())
+    end = lambda t: float((events / f"{t}.end").read_text())
+    assert start("T005") >= max(end("T002"), end("T003"), end("T004"))
+    assert start("T003") < end("T002")
+
+    log = _git(repo, "log", "--first-parent", "--format=%s").splitlines()
+    assert [line.split(":")[0] for line in log[:4]] == [
+        "Merge T005",
+        "Merge T004",
+        "Merge T003",
+        "Merge T002",
+    ]
+    for task_id in ("T002", "T003", "T004", "T005"):
+        assert (repo / f"{task_id}.txt").exists()
+    graph = load_task_graph(tasks_file, use_cache=False)
+    assert not graph.open_tasks()
+    assert _git(repo, "status", "--porcelain") == ""
+    assert _task_branches(repo) == ""
+    assert ("T002", "running") in seen and ("T005", MERGED) in seen
+
+
+def test_failed_task_skips_its_dependents(project, monkeypatch):
+    repo, tasks_file, events = project
+    monkeypatch.setenv("FAKE_AGENT_FAIL", "T003")
+
+    results = {r.task_id: r for r in _executor(repo, tasks_file, 2).run()}
+
+    assert results["T002"].status == MERGED
+    assert results["T003"].status == FAILED
+    assert results["T004"].status == MERGED
+    assert results["T005"].status == SKIPPED
+    assert "T003" in results["T005"].detail
+    assert not (events / "T005.start").exists()
+    assert results["T003"].log_path.read_text().count("working on T003") == 1
+
+    open_ids = [t.id for t in load_task_graph(tasks_file, use_cache=False).open_tasks()]
+    assert open_ids == ["T003", "T005"]
+
+
+def test_conflicting_task_keeps_its_branch(project, monkeypatch):
+    repo, tasks_file, events = project
+    monkeypatch.setenv("FAKE_AGENT_SHARED", "T002,T003")
+
+    results = {r.task_id: r for r in _executor(repo, tasks_file, 3).run()}
+
+    assert results["T002"].status == MERGED
+    assert results["T003"].status == CONFLICT
+    assert "here-spec/tasks/T003" in results["T003"].detail
+    assert results["T005"].status == SKIPPED
+    assert _task_branches(repo) == "here-spec/tasks/T003"
+    assert _git(repo, "show", "here-spec/tasks/T003:shared.txt") == "T003"
+    assert _git(repo, "worktree", "list").count("\n") == 1
+
+
+def test_failed_agent_with_changes_keeps_its_work(project, monkeypatch):
+    repo, tasks_file, events = project
+    monkeypatch.setenv("FAKE_AGENT_FAIL_LATE", "T003")
+    executor = _executor(repo, tasks_file, 2)
+
+    results = {r.task_id: r for r in executor.run()}
+
+    assert results["T003"].status == FAILED
+    worktree = executor.worktree_root / "T003"
+    assert str(worktree) in results["T003"].detail
+    assert "here-spec/tasks/T003" in results["T003"].detail
+    assert _task_branches(repo) == "here-spec/tasks/T003"
+    assert (worktree / "T003.txt").read_text() == "T003\n"
+
+    # A rerun leaves the kept work alone instead of starting over on top of it
+    rerun = {r.task_id: r for r in _executor(repo, tasks_file, 2).run()}
+    assert rerun["T003"].status == FAILED
+    assert "earlier attempt" in rerun["T003"].detail
+    assert (worktree / "T003.txt").exists()
+
+
+def test_task_that_changes_nothing_is_not_ticked(project, monkeypatch):
+    repo, tasks_file, events = project
+    monkeypatch.setenv("FAKE_AGENT_NOOP", "T002")
+
+    results = {r.task_id: r for r in _executor(repo, tasks_file, 2).run()}
+
+    assert results["T002"].status == NO_CHANGES
+    assert results["T005"].status == SKIPPED
+    open_ids = [t.id for t in load_task_graph(tasks_file, use_cache=False).open_tasks()]
+    assert open_ids == ["T002", "T005"]
+    assert _task_branches(repo) == ""
+
+
+def test_dirty_checkout_is_refused(project):
+    repo, tasks_file, events = project
+    (repo / "README.md").write_text("staged\n")
+    _git(repo, "add", "README.md")
+
+    with pytest.raises(GitError, match="uncommitted changes"):
+        _executor(repo, tasks_file, 2).run()
+    assert "Merge" not in _git(repo, "log", "--format=%s")
+
+
+def test_build_workers_from_env_and_config(monkeypatch, tmp_path):
+    assert build_workers() == 1
+    config = tmp_path / "config.json"
+    config.write_text('{"build_workers": 3}')
+    monkeypatch.setenv("HERE_SPEC_CONFIG", str(config))
+    assert build_workers() == 3
+    monkeypatch.setenv("HERE_SPEC_BUILD_WORKERS", "5")
+    assert build_workers() == 5
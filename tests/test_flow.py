@@ -24,3 +24,101 @@ def test_quick_init_and_continue_flow():
         result2 = runner.invoke(app, [], env={"HERE_SPEC_AUTO_CONFIRM": "1"})
         assert result2.exit_code == 0
         assert "Detected project" in result2.stdout
+
+
+def test_continue_resumes_build_with_outstanding_tasks(monkeypatch):
+    from rich.console import Console
+
+    from here_spec.checkpoint import CheckpointManager
+    from here_spec.cli import main
+
+    launched = []
+
+    class FakeLauncher:
+        def launch(self, context, project_path):
+            launched.append(context)
+
+    monkeypatch.setattr(main, "_get_launcher", lambda agent: FakeLauncher())
+    with runner.isolated_filesystem():
+        project = Path("resume-demo").resolve()
+        tasks_file = project / "specs" / "001-demo" / "tasks.md"
+        tasks_file.parent.mkdir(parents=True)
+        tasks_file.write_text(
+            "## Phase 1: Core\n\n- [x] T001 Scaffold\n- [ ] T002 Add API\n- [ ] T003 Add UI\n"
+        )
+        cm = CheckpointManager(Console(), project)
+        cm.state.update(project_name="resume-demo", current_step="building")
+        cm._save_state()
+
+        result = runner.invoke(app, ["continue-project", str(project)])
+        assert result.exit_code == 0, result.stdout
+        assert "1 of 3 tasks done" in result.stdout
+        assert [t.id for t in launched[0]["resume_tasks"]] == ["T002", "T003"]
+
+        tasks_file.write_text(tasks_file.read_text().replace("[ ]", "[x]"))
+        result = runner.invoke(app, ["continue-project", str(project)])
+        assert "All 3 tasks in tasks.md are done" in result.stdout
+        assert len(launched) == 1
+        state = CheckpointManager(Console(), project).state
+        assert state["current_step"] == "complete"
+        assert "build" in state["completed_steps"]
+
+
+def test_build_with_one_worker_runs_a_single_agent(monkeypatch):
+    from rich.console import Console
+
+    from here_spec.agents.runner import AgentRunResult
+    from here_spec.checkpoint import CheckpointManager
+    from here_spec.cli import main
+
+    launched = []
+    outcome = {"returncode": 0}
+
+    class FakeLauncher:
+        def launch(self, context, project_path):
+            launched.append(context["step"])
+            return AgentRunResult(returncode=outcome["returncode"], duration=0.0)
+
+        def task_command(self, context_file, task):
+            return ["true"]
+
+    monkeypatch.setattr(main, "_get_launcher", lambda agent: FakeLauncher())
+    with runner.isolated_filesystem():
+        project = Path("build-demo").resolve()
+        tasks_file = project / "specs" / "001-demo" / "tasks.md"
+        tasks_file.parent.mkdir(parents=True)
+        tasks_file.write_text("## Phase 1: Core\n\n- [ ] T001 Scaffold\n- [ ] T002 [P] Add API\n")
+        cm = CheckpointManager(Console(), project)
+        cm.state.update(project_name="build-demo", current_step="plan")
+        cm.state["completed_steps"] = ["constitution", "spec"]
+        cm._save_state()
+        step = lambda: CheckpointManager(Console(), project).state["current_step"]
+
+        result = runner.invoke(app, ["build", str(project)])
+        assert result.exit_code == 1
+        assert "plan, tasks not done yet" in result.stdout
+        assert launched == [] and step() == "plan"
+
+        cm.state.update(current_step="build", completed_steps=main.STEP_ORDER[:4])
+        cm._save_state()
+        outcome["returncode"] = 1
+        env = {"HERE_SPEC_BUILD_WORKERS": "1", "HERE_SPEC_AUTO_CONFIRM": "1"}
+        result = runner.invoke(app, ["build", str(project)], env=env)
+        assert result.exit_code == 1
+        assert launched == ["build"] and step() == "build"
+
+        outcome["returncode"] = 0
+        result = runner.invoke(app, ["build", str(project)], env=env)
+        assert result.exit_code == 0, result.stdout
+        assert len(launched) == 2 and step() == "building"
+
+        result = runner.invoke(app, ["build", str(project), "--workers", "0"])
+        assert result.exit_code != 0
+        assert len(launched) == 2
+
+        # Not a git repository: the parallel executor bows out to one agent
+        result = runner.invoke(app, ["build", str(project), "--workers", "2"])
+        assert result.exit_code == 0, result.stdout
+        assert "using a single agent" in result.stdout
+        assert "Nothing to run" not in result.stdout
+        assert len(launched) == 3
@@ -0,0 +1,102 @@
+import json
+import os
+
+from here_spec.core.generated import GeneratedFiles
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    target = tmp_path / ".speckit" / "context-spec.md"
+    writer = GeneratedFiles(tmp_path)
+    assert writer.write(target, "hello\n")
+    writer.save()
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+
+    writer = GeneratedFiles(tmp_path)
+    assert not writer.write(target, "hello\n")
+    assert writer.write(target, "hello again\n")
+    writer.save()
+
+    assert writer.stats == {"written": 1, "skipped": 1, "bytes_written": 12}
+    assert target.read_text() == "hello again\n"
+    manifest = json.loads((tmp_path / ".speckit" / "generated.json").read_text())
+    assert manifest["files"][".speckit/context-spec.md"]["size"] == 12
+
+
+def test_unchanged_write_keeps_mtime_and_skips_manifest(tmp_path):
+    target = tmp_path / "out.md"
+    writer = GeneratedFiles(tmp_path)
+    writer.write(target, "same")
+    writer.save()
+    os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+    writer = GeneratedFiles(tmp_path)
+    writer.write(target, "same")
+    writer.save()
+    manifest = writer.manifest_path.stat().st_mtime_ns
+
+    writer = GeneratedFiles(tmp_path)
+    assert not writer.write(target, "same")
+    writer.save()
+
+    assert target.stat().st_mtime_ns == 1_000_000_000
+    assert writer.manifest_path.stat().st_mtime_ns == manifest
+    assert not writer.dirty
+
+
+def test_external_edits_and_missing_files_are_rewritten(tmp_path):
+    target = tmp_path / "out.md"
+    writer = GeneratedFiles(tmp_path)
+    writer.write(target, "generated")
+    writer.save()
+
+    target.write_text("edited by hand")
+    assert GeneratedFiles(tmp_path).write(target, "generated")
+    assert target.read_text() == "generated"
+
+    target.unlink()
+    assert GeneratedFiles(tmp_path).write(target, "generated")
+
+
+def test_existing_identical_file_without_manifest_is_skipped(tmp_path):
+    target = tmp_path / "out.md"
+    target.write_text("already here")
+    writer = GeneratedFiles(tmp_path)
+    assert not writer.write(target, "already here")
+    assert writer.dirty
+
+
+def test_launcher_rerun_skips_identical_files(monkeypatch, tmp_path):
+    from here_spec.agents import claude as claude_module
+
+    context = {"project_name": "demo", "step": "plan", "answers": {}, "completed_steps": []}
+    monkeypatch.setattr(claude_module.sys.stdin, "isatty", lambda: False)
+    launcher = claude_module.ClaudeLauncher()
+    launcher.launch_for_step(context, tmp_path)
+    context_file = tmp_path / ".speckit" / "context-plan.md"
+    command_file = tmp_path / ".claude" / "commands" / "interview-context.md"
+    before = (context_file.stat().st_mtime_ns, command_file.stat().st_mtime_ns)
+
+    writes = []
+    monkeypatch.setattr(
+        "here_spec.core.generated.atomic_write", lambda path, data: writes.append(path)
+    )
+    launcher.launch_for_step(context, tmp_path)
+
+    assert writes == []
+    assert (context_file.stat().st_mtime_ns, command_file.stat().st_mtime_ns) == before
+
+
+def test_written_files_get_umask_mode_or_keep_their_own(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        writer = GeneratedFiles(tmp_path)
+        fresh = tmp_path / "fresh.md"
+        writer.write(fresh, "new")
+        existing = tmp_path / "script.sh"
+        existing.write_text("old")
+        existing.chmod(0o755)
+        writer.write(existing, "new")
+    finally:
+        os.umask(old_umask)
+
+    assert fresh.stat().st_mode & 0o777 == 0o644
+    assert existing.stat().st_mode & 0o777 == 0o755
@@ -0,0 +1,112 @@
+import json
+import subprocess
+import sys
+
+from rich.console import Console
+from typer.testing import CliRunner
+
+from here_spec.checkpoint import CheckpointManager
+from here_spec.core.metrics import METRICS_FILE, measure, percentile, read_metrics, summarize
+
+BURN = "import time\nend = time.process_time() + 0.2\nwhile time.process_time() < end: pass"
+
+
+def _records(project):
+    return list(read_metrics([project]))
+
+
+def test_measure_records_child_usage(tmp_path):
+    with measure(tmp_path, "spec", "agent", agent="fake") as metrics:
+        subprocess.run([sys.executable, "-c", BURN], check=True)
+        metrics["returncode"] = 0
+
+    (record,) = _records(tmp_path)
+    assert record["step"] == "spec" and record["phase"] == "agent"
+    assert record["agent"] == "fake" and record["returncode"] == 0
+    assert record["subprocesses"] == 1
+    assert record["child_user_s"] + record["child_sys_s"] >= 0.1
+    assert record["wall_s"] >= 0.2
+    assert record["child_peak_rss_kb"] > 0 and record["peak_rss_kb"] > 0
+
+
+def test_measure_notes_errors_and_can_be_disabled(tmp_path, monkeypatch):
+    try:
+        with measure(tmp_path, "plan", "context"):
+            raise KeyError("boom")
+    except KeyError:
+        pass
+    assert _records(tmp_path)[0]["error"] == "KeyError"
+
+    monkeypatch.setenv("HERE_SPEC_METRICS", "0")
+    with measure(tmp_path, "plan", "context"):
+        pass
+    assert len(_records(tmp_path)) == 1
+
+
+def test_run_checkpoint_is_measured(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path)
+    cm._checkpoint_tasks = lambda: None
+
+    assert cm.run_checkpoint("tasks") is None
+    (record,) = _records(tmp_path)
+    assert (record["step"], record["phase"], record["paused"]) == ("tasks", "checkpoint", True)
+
+
+def test_run_checkpoint_records_state_lock_activity(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path)
+    cm._save_state()
+
+    def answer():
+        cm.state["answers"]["tech_stack"] = "auto"
+        cm._save_state()
+        return {}
+
+    cm._checkpoint_plan = answer
+    cm.run_checkpoint("plan")
+    (record,) = _records(tmp_path)
+    lock = record["state_lock"]
+    assert lock["lock_acquisitions"] >= 1
+    assert lock["lock_contended"] == 0
+    assert lock["lock_wait_seconds"] >= 0
+
+
+def test_run_checkpoint_records_skipped_and_coalesced_writes(tmp_path):
+    cm = CheckpointManager(Console(), tmp_path)
+    cm._save_state()
+
+    def answer():
+        cm._save_state()
+        cm.state["answers"]["tech_stack"] = "auto"
+        cm._save_state()
+        return {}
+
+    cm._checkpoint_plan = answer
+    cm.run_checkpoint("plan")
+    (record,) = _records(tmp_path)
+    io = record["state_io"]
+    assert io["save_requests"] == 2
+    assert io["writes_coalesced"] == 1
+    assert io["flushes"] == 1
+
+
+def test_percentiles_and_stats_across_projects(tmp_path):
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([5, 1, 3, 2, 4], 90) == 5
+    assert percentile([7], 99) == 7
+
+    for name, walls in (("a", [1.0, 2.0, 3.0]), ("b", [4.0])):
+        metrics = tmp_path / name / ".speckit" / METRICS_FILE
+        metrics.parent.mkdir(parents=True)
+        lines = [json.dumps({"step": "spec", "phase": "agent", "wall_s": w}) for w in walls]
+        metrics.write_text("\n".join(lines + ["not json"]) + "\n")
+
+    (row,) = summarize(read_metrics([tmp_path / "a", tmp_path / "b"]))
+    assert (row["count"], row["projects"], row["p50_s"], row["p99_s"]) == (4, 2, 2.0, 4.0)
+
+    from here_spec.cli.main import app
+
+    result = CliRunner().invoke(app, ["stats", str(tmp_path / "a"), str(tmp_path / "b"), "--json"])
+    assert result.exit_code == 0, result.stdout
+    assert json.loads(result.stdout)[0]["p90_s"] == 4.0
+    result = CliRunner().invoke(app, ["stats", str(tmp_path / "a")])
+    assert "spec" in result.stdout and "2.00s" in result.stdout
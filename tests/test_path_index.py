@@ -0,0 +1,39 @@
+import os
+import stat
+
+from here_spec.core.path_index import PathIndex
+
+
+def _tool(directory, name, executable=True):
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_text("#!/bin/sh\n")
+    if executable:
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def test_first_executable_on_path_wins(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    _tool(first, "node", executable=False)
+    expected = _tool(second, "node")
+    _tool(first, "git")
+    _tool(second, "git")
+
+    index = PathIndex(os.pathsep.join([str(first), str(second), str(tmp_path / "missing")]))
+    assert index.which("node") == expected
+    assert index.which("git") == str(first / "git")
+    assert index.which("claude") is None
+
+
+def test_each_directory_is_scanned_once(tmp_path):
+    dirs = [tmp_path / name for name in "abc"]
+    for directory in dirs:
+        _tool(directory, f"tool-{directory.name}")
+
+    index = PathIndex(os.pathsep.join(str(d) for d in dirs + dirs))
+    tools = [f"tool-{n}" for n in "abc"] + [f"absent-{i}" for i in range(50)]
+    found = index.lookup(tools)
+
+    assert index.directories_scanned == 3
+    assert [name for name, path in found.items() if path] == ["tool-a", "tool-b", "tool-c"]
@@ -0,0 +1,77 @@
+import pstats
+import sys
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from here_spec.agents.runner import run_agent
+from here_spec.core.paths import cache_dir
+from here_spec.core.profiling import CommandProfiler, OverheadClock, agent_wait
+
+
+def test_clock_skips_blocked_time():
+    clock = OverheadClock()
+    before = clock()
+    clock.pause()
+    clock.pause()  # overlapping agents
+    time.sleep(0.2)
+    clock.resume()
+    clock.resume()
+    assert clock() - before < 0.1
+    assert clock.excluded >= 0.15
+    time.sleep(0.05)
+    assert clock() - before >= 0.05
+
+
+def test_agent_child_time_is_excluded(tmp_path):
+    profiler = CommandProfiler("demo").start()
+    run_agent([sys.executable, "-c", "import time; time.sleep(0.5)"], tmp_path, stream=False)
+    with agent_wait():
+        time.sleep(0.2)
+    stats_path, collapsed_path = profiler.stop(tmp_path / "profiles")
+
+    stats = pstats.Stats(str(stats_path))
+    assert stats.total_tt < 0.4
+    assert profiler.clock.excluded >= 0.6
+    for line in collapsed_path.read_text().splitlines():
+        stack, value = line.rsplit(" ", 1)
+        assert stack and int(value) > 0 and " " not in stack
+    assert "run_agent" in collapsed_path.read_text()
+
+
+def test_profile_flag_on_entry_point(tmp_path, monkeypatch):
+    from here_spec.cli.entry import main
+
+    monkeypatch.setenv("HERE_SPEC_PROFILE_DIR", str(tmp_path / "profiles"))
+    with pytest.raises(SystemExit):
+        main(["--profile", "status", str(tmp_path)])
+
+    (stats_path,) = (tmp_path / "profiles").glob("status-*.pstats")
+    assert stats_path.with_suffix(".collapsed").exists()
+    functions = {name for _file, _line, name in pstats.Stats(str(stats_path)).stats}
+    assert "show_status" in functions
+
+
+def test_profile_env_with_typer_app(tmp_path, monkeypatch):
+    from here_spec.cli.main import app
+
+    monkeypatch.chdir(tmp_path)
+    tasks = tmp_path / "tasks.md"
+    tasks.write_text("## Phase 1\n\n- [ ] T001 Do it\n")
+    result = CliRunner().invoke(app, ["tasks", str(tasks)], env={"HERE_SPEC_PROFILE": "1"})
+
+    assert result.exit_code == 0, result.output
+    assert not (tmp_path / ".speckit").exists()
+    assert list((cache_dir() / "profiles").glob("tasks-*.pstats"))
+
+
+def test_profiles_go_to_the_enclosing_project(tmp_path, monkeypatch):
+    from here_spec.core.profiling import profile_dir
+
+    project = tmp_path / "proj"
+    (project / ".speckit").mkdir(parents=True)
+    (project / ".speckit" / "checkpoints.json").write_text("{}")
+    (project / "src").mkdir()
+    monkeypatch.chdir(project / "src")
+    assert profile_dir() == project / ".speckit" / "profiles"
@@ -0,0 +1,110 @@
+import json
+import os
+
+from typer.testing import CliRunner
+
+from here_spec.core.sections import SectionIndex, index_path_for, read_section
+
+DOC = """\
+# Tasks: Demo
+
+Intro text.
+
+## Phase 1: Setup
+
+- [ ] T001 Create project
+
+```markdown
+# not a heading
+```
+
+### Notes
+
+Setup notes.
+
+## Phase 2: Build
+
+- [ ] T002 Build it
+"""
+
+
+def _doc(tmp_path, text=DOC):
+    path = tmp_path / "tasks.md"
+    path.write_text(text)
+    return path
+
+
+def _bump(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_index_records_hierarchy_and_offsets(tmp_path):
+    path = _doc(tmp_path)
+    index = SectionIndex(path)
+
+    keys = [s.key for s in index.sections()]
+    assert keys == [
+        "Tasks: Demo",
+        "Tasks: Demo > Phase 1: Setup",
+        "Tasks: Demo > Phase 1: Setup > Notes",
+        "Tasks: Demo > Phase 2: Build",
+    ]
+    setup = index.find("Phase 1: Setup")
+    data = path.read_bytes()
+    assert data[setup.start : setup.end].decode() == index.read(setup)
+    assert index.read(setup).startswith("## Phase 1: Setup\n")
+    assert "Setup notes." in index.read(setup)
+    assert "Phase 2" not in index.read(setup)
+    assert index.read(index.find("phase 2"), include_heading=False) == "\n- [ ] T002 Build it\n"
+    assert index.find("Missing") is None
+    assert index_path_for(path).exists()
+
+
+def test_index_is_reused_and_updated_incrementally(tmp_path):
+    path = _doc(tmp_path)
+    SectionIndex(path)
+
+    unchanged = SectionIndex(path)
+    assert unchanged.stats == {"rescanned_bytes": 0, "reused_sections": 0}
+
+    with open(path, "a") as f:
+        f.write("- [ ] T003 More\n\n## Phase 3: Polish\n\nDone.\n")
+    _bump(path)
+    appended = SectionIndex(path)
+    build_start = appended.find("Phase 2: Build").start
+    assert appended.stats["reused_sections"] == 3
+    assert appended.stats["rescanned_bytes"] == path.stat().st_size - build_start
+    assert appended.read(appended.find("Phase 3")).startswith("## Phase 3: Polish")
+
+    path.write_text(path.read_text().replace("Setup notes.", "Longer setup notes here."))
+    _bump(path)
+    edited = SectionIndex(path)
+    assert edited.stats["reused_sections"] == 2
+    assert "Longer setup notes" in edited.read(edited.find("Notes"))
+    assert edited.read(edited.find("Phase 3")).startswith("## Phase 3: Polish")
+    fresh = tmp_path / "fresh"
+    fresh.mkdir()
+    rebuilt = SectionIndex(_doc(fresh, path.read_text()))
+    assert edited.headings == rebuilt.headings
+
+
+def test_empty_file_and_read_section_helper(tmp_path):
+    empty = tmp_path / "spec.md"
+    empty.write_text("")
+    assert SectionIndex(empty).sections() == []
+    assert read_section(_doc(tmp_path), "Notes", include_heading=False) == "\nSetup notes.\n\n"
+
+
+def test_section_command(tmp_path):
+    from here_spec.cli.main import app
+
+    path = _doc(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(app, ["section", str(path), "Phase 2: Build"])
+    assert result.exit_code == 0
+    assert result.output == "## Phase 2: Build\n\n- [ ] T002 Build it\n"
+
+    outline = runner.invoke(app, ["section", str(path), "--json"])
+    assert [s["title"] for s in json.loads(outline.output)][-1] == "Phase 2: Build"
+    assert runner.invoke(app, ["section", str(path), "Nope"]).exit_code == 1
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+from here_spec.cli.entry import STARTUP_BUDGET_MS, _fast_path
+
+HEAVY_MODULES = {
+    "here_spec.agents.claude",
+    "here_spec.agents.opencode",
+    "here_spec.core.system_detector",
+    "rich.prompt",
+}
+
+
+def _import_times(argv, cwd):
+    """Run the entry point under -X importtime; return {module: self_time_us}"""
+    code = "import sys; from here_spec.cli.entry import main; main(sys.argv[1:])"
+    command = [sys.executable, "-X", "importtime", "-c", code, *argv]
+    # First run writes any missing .pyc files; only the warm run is measured
+    subprocess.run(command, capture_output=True, cwd=str(cwd))
+    result = subprocess.run(command, capture_output=True, text=True, cwd=str(cwd))
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def _own_ms(times):
+    return sum(us for name, us in times.items() if name.startswith("here_spec")) / 1000
+
+
+def test_fast_path_only_matches_plain_status():
+    assert _fast_path(["status"]) is not None
+    assert _fast_path(["status", "some/path"]) is not None
+    assert _fast_path(["status", "--help"]) is None
+    assert _fast_path(["init"]) is None
+    assert _fast_path([]) is None
+
+
+def test_help_skips_command_dependencies(tmp_path):
+    times = _import_times(["--help"], tmp_path)
+    assert not HEAVY_MODULES & set(times)
+    assert "here_spec.checkpoint" not in times
+    assert "here_spec.art.dog_art" not in times
+    assert _own_ms(times) < STARTUP_BUDGET_MS
+
+
+def test_status_fast_path_skips_typer(tmp_path):
+    state_file = tmp_path / ".speckit" / "checkpoints.json"
+    state_file.parent.mkdir()
+    state_file.write_text('{"version": 1, "project_name": "demo", "current_step": "plan"}')
+
+    times = _import_times(["status"], tmp_path)
+    assert "typer" not in times
+    assert "here_spec.checkpoint" in times
+    assert not (HEAVY_MODULES - {"rich.prompt"}) & set(times)
+    assert _own_ms(times) < STARTUP_BUDGET_MS
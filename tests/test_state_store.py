@@ -0,0 +1,170 @@
+import json
+import threading
+
+import pytest
+
+from here_spec.core.state_store import JournaledStateStore, diff_state
+
+
+def _state(**overrides):
+    state = {"version": 1, "current_step": "init", "completed_steps": [], "answers": {}}
+    state.update(overrides)
+    return state
+
+
+def test_first_save_writes_snapshot(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    store.save(_state())
+    assert json.loads((tmp_path / "checkpoints.json").read_text())["current_step"] == "init"
+    assert not (tmp_path / "checkpoints.journal").exists()
+
+
+def test_saves_append_only_the_delta(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    state = _state(answers={"big_picture": "x" * 500})
+    store.save(state)
+
+    state["answers"]["audience"] = "team"
+    store.save(state)
+    assert (tmp_path / "checkpoints.journal").stat().st_size < 100
+    assert json.loads((tmp_path / "checkpoints.json").read_text())["answers"] == {
+        "big_picture": "x" * 500
+    }
+
+    reloaded = JournaledStateStore(tmp_path / "checkpoints.json").load()
+    assert reloaded == state
+
+
+def test_unchanged_state_writes_nothing(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    store.save(_state())
+    store.save(_state())
+    assert not (tmp_path / "checkpoints.journal").exists()
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json", compact_every=3)
+    state = _state()
+    store.save(state)
+    for step in ["constitution", "spec", "plan", "tasks"]:
+        state["completed_steps"] = state["completed_steps"] + [step]
+        store.save(state)
+
+    snapshot = json.loads((tmp_path / "checkpoints.json").read_text())
+    assert snapshot["completed_steps"] == ["constitution", "spec", "plan", "tasks"]
+    assert (tmp_path / "checkpoints.journal").read_bytes() == b""
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_torn_journal_tail_is_ignored_and_repaired(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    state = _state()
+    store.save(state)
+    state["current_step"] = "spec"
+    store.save(state)
+
+    journal = tmp_path / "checkpoints.journal"
+    with open(journal, "ab") as f:
+        f.write(b'{"set": [[["current_step"], "pl')  # killed mid-append
+
+    store2 = JournaledStateStore(tmp_path / "checkpoints.json")
+    loaded = store2.load()
+    assert loaded["current_step"] == "spec"
+
+    loaded["current_step"] = "tasks"
+    store2.save(loaded)
+    assert JournaledStateStore(tmp_path / "checkpoints.json").load()["current_step"] == "tasks"
+
+
+def test_diff_state_recurses_into_dicts():
+    sets, unsets = diff_state(
+        {"answers": {"a": 1, "b": 2}, "gone": True},
+        {"answers": {"a": 1, "b": 3}},
+    )
+    assert sets == [(["answers", "b"], 3)]
+    assert unsets == [["gone"]]
+
+
+def test_concurrent_writers_merge_per_key(tmp_path):
+    first = JournaledStateStore(tmp_path / "checkpoints.json")
+    first.save(_state())
+    second = JournaledStateStore(tmp_path / "checkpoints.json")
+    state_a = first.load()
+    state_b = second.load()
+
+    state_a["answers"]["features"] = "Albums"
+    first.save(state_a)
+    state_b["agent"] = "opencode"
+    merged = second.save(state_b)
+
+    assert merged["answers"] == {"features": "Albums"}
+    assert merged["agent"] == "opencode"
+    assert JournaledStateStore(tmp_path / "checkpoints.json").load() == merged
+
+
+def test_reader_does_not_wait_for_writer(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    store.save(_state(current_step="plan"))
+
+    with open(tmp_path / "checkpoints.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        reader = JournaledStateStore(tmp_path / "checkpoints.json")
+        assert reader.load()["current_step"] == "plan"
+        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    assert reader.stats["lockless_reads"] == 1
+    assert reader.stats["lock_contended"] == 1
+
+
+def test_writer_waits_and_reports_lock_time(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    store = JournaledStateStore(tmp_path / "checkpoints.json")
+    store.save(_state())
+
+    lock = open(tmp_path / "checkpoints.lock", "w")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    timer = threading.Timer(0.1, lambda: (fcntl.flock(lock, fcntl.LOCK_UN), lock.close()))
+    timer.start()
+    store.save(_state(current_step="spec"))
+    timer.join()
+
+    assert store.stats["lock_contended"] == 1
+    assert store.stats["lock_wait_seconds"] >= 0.05
+
+
+def test_journal_left_by_interrupted_compaction_is_not_replayed(tmp_path):
+    store = JournaledStateStore(tmp_path / "checkpoints.json", compact_every=2)
+    state = _state()
+    store.save(state)
+    state["current_step"] = "plan"
+    store.save(state)
+    state["completed_steps"] = ["spec"]
+    store.save(state)
+    journal = tmp_path / "checkpoints.journal"
+    stale_journal = journal.read_bytes()
+
+    state.update(current_step="tasks", completed_steps=["spec", "plan"])
+    store.save(state)  # compacts
+    assert journal.read_bytes() == b""
+    journal.write_bytes(stale_journal)  # as if killed before the truncate
+
+    reloaded = JournaledStateStore(tmp_path / "checkpoints.json").load()
+    assert reloaded == state
+    assert "_journal_seq" not in reloaded
+
+
+def test_concurrent_list_appends_are_both_kept(tmp_path):
+    first = JournaledStateStore(tmp_path / "checkpoints.json")
+    first.save(_state(completed_steps=["constitution", "spec"]))
+    second = JournaledStateStore(tmp_path / "checkpoints.json")
+    state_a = first.load()
+    state_b = second.load()
+
+    state_a["completed_steps"].append("plan")
+    first.save(state_a)
+    state_b["completed_steps"] = ["spec", "tasks"]  # drops one item, adds another
+    merged = second.save(state_b)
+
+    assert merged["completed_steps"] == ["spec", "plan", "tasks"]
+    assert JournaledStateStore(tmp_path / "checkpoints.json").load() == merged
@@ -0,0 +1,97 @@
+import json
+import os
+import time
+
+from rich.console import Console
+from typer.testing import CliRunner
+
+from here_spec.checkpoint import CheckpointManager
+from here_spec.cli.main import app
+from here_spec.cli.status import iter_status_rows
+
+runner = CliRunner()
+
+
+def _make_project(path, step, completed=()):
+    cm = CheckpointManager(Console(), path)
+    cm.state["project_name"] = path.name
+    cm.state["current_step"] = step
+    cm.state["completed_steps"] = list(completed)
+    cm._save_state()
+    return cm
+
+
+def test_rows_cover_nested_projects(tmp_path):
+    _make_project(tmp_path / "a", "plan", ["constitution", "spec"])
+    _make_project(tmp_path / "team" / "b", "spec", ["constitution"])
+    (tmp_path / "node_modules" / "c" / ".speckit").mkdir(parents=True)
+
+    rows = {row["project"]: row for row in iter_status_rows(tmp_path, depth=3)}
+    assert set(rows) == {"a", os.path.join("team", "b")}
+    assert rows["a"]["current_step"] == "plan"
+    assert rows["a"]["completed"] == 2
+    assert rows["a"]["agent"] == "claude"
+
+
+def test_stalled_time_counts_from_step_change(tmp_path):
+    cm = _make_project(tmp_path / "a", "plan")
+    entered = cm.state["step_started_at"]
+    cm.state["answers"]["tech_stack"] = "auto"
+    cm._save_state()
+    assert cm.state["step_started_at"] == entered
+
+    cm.state["step_started_at"] = time.time() - 7200
+    cm._save_state()
+    (row,) = iter_status_rows(tmp_path, depth=1)
+    assert 7100 < row["stalled_seconds"] < 7300
+
+    cm.state["current_step"] = "tasks"
+    cm._save_state()
+    (row,) = iter_status_rows(tmp_path, depth=1)
+    assert row["stalled_seconds"] < 60
+
+
+def test_status_all_ndjson(tmp_path):
+    _make_project(tmp_path / "a", "plan")
+    _make_project(tmp_path / "b", "build", ["constitution", "spec", "plan", "tasks", "validate"])
+
+    result = runner.invoke(app, ["status", str(tmp_path), "--all", "--format", "ndjson"])
+    assert result.exit_code == 0
+    records = sorted((json.loads(line) for line in result.stdout.splitlines()), key=str)
+    assert {r["project"]: r["completed"] for r in records} == {"a": 0, "b": 5}
+
+
+def test_status_all_table_and_bad_format(tmp_path):
+    _make_project(tmp_path / "a", "plan")
+
+    result = runner.invoke(app, ["status", str(tmp_path), "--all"])
+    assert result.exit_code == 0
+    assert "PROJECT" in result.stdout
+    assert "1 project(s)" in result.stdout
+
+    result = runner.invoke(app, ["status", str(tmp_path), "--all", "--format", "xml"])
+    assert result.exit_code == 1
+    assert "Unknown format" in result.stdout
+
+
+def test_status_all_does_not_create_lock_files(tmp_path):
+    _make_project(tmp_path / "a", "plan")
+    lock = tmp_path / "a" / ".speckit" / "checkpoints.lock"
+    lock.unlink()
+
+    list(iter_status_rows(tmp_path, depth=1))
+    assert not lock.exists()
+
+
+def test_status_all_reads_unchanged_projects_from_the_index(tmp_path, monkeypatch):
+    from here_spec.core import workspace_index
+
+    _make_project(tmp_path / "a", "plan", ["constitution", "spec"])
+
+    def fail_read(project_path):
+        raise AssertionError("checkpoint file was opened")
+
+    monkeypatch.setattr(workspace_index, "load_project_state", fail_read)
+    (row,) = iter_status_rows(tmp_path, depth=1)
+    assert (row["current_step"], row["completed"]) == ("plan", 2)
+    assert row["stalled_seconds"] < 60
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+from rich.console import Console
+from typer.testing import CliRunner
+
+from here_spec.agents.runner import AgentRunResult
+from here_spec.agents.step_cache import StepCache, cache_key, step_cache_dir
+from here_spec.checkpoint import CheckpointManager
+from here_spec.cli import main
+
+CONSTITUTION = Path(".specify") / "memory" / "constitution.md"
+
+
+def _project(root: Path, name: str, **answers) -> CheckpointManager:
+    cm = CheckpointManager(Console(), root / name)
+    cm.state["project_name"] = name
+    cm.state["answers"].update(answers)
+    cm._save_state()
+    return cm
+
+
+def test_cache_is_opt_in(monkeypatch, tmp_path):
+    assert step_cache_dir() is None
+    monkeypatch.setenv("HERE_SPEC_STEP_CACHE", "1")
+    assert step_cache_dir().name == "steps"
+    monkeypatch.setenv("HERE_SPEC_STEP_CACHE", str(tmp_path / "shared"))
+    assert step_cache_dir() == tmp_path / "shared"
+    monkeypatch.setenv("HERE_SPEC_STEP_CACHE", "off")
+    assert step_cache_dir() is None
+
+
+def test_key_ignores_case_whitespace_and_unrelated_answers():
+    base = {"big_picture": "A todo app", "audience": "personal", "constraints": ["b", "a"]}
+    same = {"big_picture": "  a TODO   app.", "audience": "Personal", "tech_stack": "go"}
+    assert cache_key("constitution", base) == cache_key("constitution", same)
+    assert cache_key("constitution", base) != cache_key("spec", base)
+    assert cache_key("spec", base) != cache_key("spec", dict(base, constraints=["c"]))
+    assert cache_key("spec", base) == cache_key("spec", dict(base, constraints=["a", "b"]))
+
+
+def test_second_project_reuses_constitution(monkeypatch, tmp_path):
+    monkeypatch.setenv("HERE_SPEC_STEP_CACHE", str(tmp_path / "shared"))
+    runs = []
+
+    class FakeLauncher:
+        def launch_for_step(self, context, project_path):
+            runs.append(project_path.name)
+            target = project_path / CONSTITUTION
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(f"# {context['project_name']} Constitution\n\nThe appendix.\n")
+            return AgentRunResult(returncode=0, duration=0.0)
+
+    monkeypatch.setattr(main, "_get_launcher", lambda agent: FakeLauncher())
+    first = _project(tmp_path, "app", big_picture="Todo list", audience="personal")
+    second = _project(tmp_path, "todo-two", big_picture="todo list ", audience="Personal")
+
+    context = {"step": "constitution", "project_name": "app"}
+    assert main._run_step_agent("claude", context, first.project_path, first)
+    context = {"step": "constitution", "project_name": "todo-two"}
+    assert main._run_step_agent("claude", context, second.project_path, second)
+
+    assert runs == ["app"]
+    text = (second.project_path / CONSTITUTION).read_text()
+    assert text == "# todo-two Constitution\n\nThe appendix.\n"
+
+    report = StepCache(tmp_path / "shared").report()
+    assert report["constitution"] == {"hit": 1, "miss": 1, "store": 1, "entries": 1}
+    result = CliRunner().invoke(main.app, ["cache"])
+    assert result.exit_code == 0
+    assert "50%" in result.stdout
+
+
+def _seed(cache_dir: Path, step: str, answers: dict, files: dict):
+    import json
+
+    key = cache_key(step, answers)
+    entry = cache_dir / key[:2] / f"{key}.json"
+    entry.parent.mkdir(parents=True)
+    entry.write_text(json.dumps({"version": 1, "step": step, "files": files}))
+
+
+def test_restore_rejects_paths_outside_the_step_outputs(tmp_path):
+    cache = StepCache(tmp_path / "shared")
+    project = tmp_path / "proj"
+    project.mkdir()
+    state = {"project_name": "proj", "answers": {"big_picture": "x"}}
+    _seed(
+        cache.directory,
+        "constitution",
+        state["answers"],
+        {CONSTITUTION.as_posix(): "ok", "../escaped.txt": "pwned"},
+    )
+
+    assert cache.restore("constitution", state, project) == []
+    assert not (tmp_path / "escaped.txt").exists()
+    assert not (project / CONSTITUTION).exists()
+    assert cache.report()["constitution"]["miss"] == 1
+
+
+def test_restore_only_replaces_templates_unless_confirmed(tmp_path):
+    cache = StepCache(tmp_path / "shared")
+    project = tmp_path / "proj"
+    template = project / ".specify" / "templates" / "constitution-template.md"
+    template.parent.mkdir(parents=True)
+    template.write_text("# [PROJECT_NAME] Constitution\n")
+    target = project / CONSTITUTION
+    target.parent.mkdir(parents=True)
+    target.write_text(template.read_text())
+    state = {"project_name": "proj", "answers": {"big_picture": "x"}}
+    _seed(cache.directory, "constitution", state["answers"], {CONSTITUTION.as_posix(): "cached"})
+
+    assert cache.restore("constitution", state, project) == [target]
+    assert target.read_text() == "cached"
+
+    target.write_text("hand edited")
+    asked = []
+    assert cache.restore("constitution", state, project, lambda paths: asked.extend(paths)) == []
+    assert asked == [target.resolve()]
+    assert target.read_text() == "hand edited"
+    assert cache.restore("constitution", state, project, lambda paths: True) == [target]
+    assert target.read_text() == "cached"
+
+
+def test_spec_is_restored_into_this_projects_feature_directory(tmp_path):
+    cache = StepCache(tmp_path / "shared")
+    state = {"project_name": "proj", "answers": {"features": "Albums"}}
+    _seed(cache.directory, "spec", state["answers"], {"specs/001-photos/spec.md": "cached"})
+
+    project = tmp_path / "proj"
+    project.mkdir()
+    assert cache.restore("spec", state, project) == []
+    assert not (project / "specs").exists()
+    assert cache.report()["spec"]["miss"] == 1
+
+    template = project / ".specify" / "templates" / "spec-template.md"
+    template.parent.mkdir(parents=True)
+    template.write_text("# Feature Specification\n")
+    target = project / "specs" / "002-albums" / "spec.md"
+    target.parent.mkdir(parents=True)
+    target.write_text(template.read_text())
+
+    assert cache.restore("spec", state, project) == [target]
+    assert target.read_text() == "cached"
+    assert not (project / "specs" / "001-photos").exists()
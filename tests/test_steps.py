@@ -0,0 +1,125 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+from typer.testing import CliRunner
+
+from here_spec.checkpoint import CheckpointManager
+from here_spec.cli.entry import _fast_path
+from here_spec.core.steps import STEPS, StepFingerprints
+
+FIXTURE = Path(__file__).parent / "fixtures" / "projects" / "full-feature"
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / "demo"
+    shutil.copytree(FIXTURE, project)
+    constitution = project / ".specify" / "memory" / "constitution.md"
+    constitution.parent.mkdir(parents=True)
+    constitution.write_text("# Constitution\n\nKeep it simple.\n")
+
+    cm = CheckpointManager(Console(), project)
+    cm.state.update(project_name="demo", current_step="complete", completed_steps=list(STEPS))
+    cm.state["answers"].update(big_picture="A demo", features="Login", tech_stack="auto")
+    cm._save_state()
+    fingerprints = StepFingerprints(project)
+    for step in STEPS:
+        fingerprints.record(step, cm.state)
+    return project, cm
+
+
+def _states(project, state):
+    return {s.step: s.state for s in StepFingerprints(project).status(state)}
+
+
+def test_recorded_steps_are_fresh_until_an_input_changes(project):
+    project, cm = project
+    assert set(_states(project, cm.state).values()) == {"fresh"}
+
+    spec = project / "specs" / "001-test-feature" / "spec.md"
+    spec.write_text(spec.read_text() + "\n- **FR-099**: New requirement\n")
+    statuses = {s.step: s for s in StepFingerprints(project).status(cm.state)}
+
+    assert statuses["constitution"].state == "fresh"
+    assert statuses["spec"].state == "fresh"
+    assert statuses["plan"].state == "stale"
+    assert statuses["plan"].reasons == ["inputs changed: specs/001-test-feature/spec.md"]
+    assert statuses["build"].reasons == ["upstream stale: plan, tasks"]
+
+
+def test_answers_and_missing_outputs_make_steps_stale(project):
+    project, cm = project
+    cm.state["answers"]["features"] = "Login, billing"
+    assert _states(project, cm.state) == {
+        "constitution": "fresh",
+        "spec": "stale",
+        "plan": "stale",
+        "tasks": "stale",
+        "validate": "stale",
+        "build": "stale",
+    }
+
+    cm.state["answers"]["features"] = "Login"
+    (project / ".specify" / "memory" / "constitution.md").unlink()
+    status = StepFingerprints(project).status(cm.state)[0]
+    assert status.reasons == ["outputs missing: .specify/memory/constitution.md"]
+
+
+def test_ticking_tasks_and_unchanged_files_need_no_rehash(project):
+    project, cm = project
+    tasks = project / "specs" / "001-test-feature" / "tasks.md"
+    tasks.write_text(tasks.read_text().replace("- [ ]", "- [x]", 1))
+
+    fingerprints = StepFingerprints(project)
+    assert set(s.state for s in fingerprints.status(cm.state)) == {"fresh"}
+    fingerprints.save()
+
+    again = StepFingerprints(project)
+    again.status(cm.state)
+    assert again.stats["hashed"] == 0
+
+
+def test_rebuild_dry_run_uses_the_fast_path(project, capsys):
+    project, cm = project
+    cm.state["answers"]["tech_stack"] = "django"
+    cm._save_state()
+
+    steps_file = project / ".speckit" / "steps.json"
+    recorded = steps_file.read_bytes()
+    (project / "specs" / "001-test-feature" / "plan.md").touch()  # forces a rehash
+
+    handler = _fast_path(["rebuild", "--dry-run", str(project)])
+    assert handler is not None
+    assert _fast_path(["rebuild", str(project)]) is None
+    assert handler() == 0
+    assert steps_file.read_bytes() == recorded
+    out = capsys.readouterr().out
+    assert "plan: stale" in out and "spec: fresh" in out
+    assert "Would re-run: plan, tasks, validate, build" in out
+
+
+def test_rebuild_reruns_stale_steps_in_order(project, monkeypatch):
+    from here_spec.agents.runner import AgentRunResult
+    from here_spec.cli import main
+
+    project, cm = project
+    cm.state["answers"]["tech_stack"] = "django"
+    cm.state["completed_steps"] = ["constitution", "spec", "plan", "tasks"]
+    cm._save_state()
+    ran = []
+
+    class FakeLauncher:
+        def launch_for_step(self, context, project_path):
+            ran.append(context["step"])
+            return AgentRunResult(returncode=0, duration=0.0)
+
+    monkeypatch.setattr(main, "_get_launcher", lambda agent: FakeLauncher())
+    result = CliRunner().invoke(main.app, ["rebuild", str(project)])
+
+    assert result.exit_code == 0, result.stdout
+    assert ran == ["plan", "tasks"]
+    state = CheckpointManager(Console(), project).state
+    assert _states(project, state)["plan"] == "fresh"
+    assert _states(project, state)["validate"] == "pending"
@@ -0,0 +1,173 @@
+import os
+import stat
+
+from here_spec.core import system_detector
+from here_spec.core.system_detector import SystemDetector
+
+
+def _fake_tool(directory, name):
+    path = directory / name
+    path.write_text("#!/bin/sh\necho fake\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def _count_spawns(monkeypatch):
+    calls = []
+    real_run = system_detector.subprocess.run
+
+    def counting_run(*args, **kwargs):
+        calls.append(args[0])
+        return real_run(*args, **kwargs)
+
+    monkeypatch.setattr(system_detector.subprocess, "run", counting_run)
+    return calls
+
+
+def test_second_detection_is_served_from_cache(tmp_path, monkeypatch):
+    calls = _count_spawns(monkeypatch)
+    first = SystemDetector().detect()
+    spawned = len(calls)
+
+    detector = SystemDetector()
+    assert detector.detect() == first
+    assert detector.cache_hit
+    assert len(calls) == spawned
+
+
+def test_new_tool_on_path_invalidates_cache(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    SystemDetector().detect()
+
+    _fake_tool(bin_dir, "opencode")
+    detector = SystemDetector()
+    after = detector.detect()
+    assert not detector.cache_hit
+    assert after["agents"]["opencode"] is True
+
+
+def test_ttl_and_refresh_bypass_cache(monkeypatch):
+    SystemDetector().detect()
+
+    detector = SystemDetector()
+    detector.detect(refresh=True)
+    assert not detector.cache_hit
+
+    monkeypatch.setenv("HERE_SPEC_DETECT_TTL", "0")
+    detector = SystemDetector()
+    detector.detect()
+    assert not detector.cache_hit
+
+
+def test_agent_lookups_reuse_detection(monkeypatch):
+    detector = SystemDetector()
+    detector.detect()
+
+    def fail_which(name):
+        raise AssertionError(f"looked up {name} again")
+
+    monkeypatch.setattr(detector.paths, "which", fail_which)
+    detector.check_agent_installation("claude")
+    detector.get_recommended_agent()
+
+
+def test_python_version_without_subprocess(monkeypatch):
+    import sys
+
+    from here_spec.core.path_index import PathIndex
+
+    bin_dir = os.path.dirname(sys.executable)
+    index = PathIndex(bin_dir)
+    if not index.which("python3") or os.path.realpath(index.which("python3")) != os.path.realpath(
+        sys.executable
+    ):
+        return  # interpreter is not installed as python3 here
+
+    calls = _count_spawns(monkeypatch)
+    version = SystemDetector(path_index=index)._get_python_version()
+    assert version == "Python " + ".".join(map(str, sys.version_info[:3]))
+    assert calls == []
+
+
+def test_versions_are_probed_concurrently_with_timeout(tmp_path, monkeypatch):
+    import shutil
+    import time
+
+    from here_spec.core.path_index import PathIndex
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    sleep = shutil.which("sleep")
+    for name, body in [
+        ("node", "echo v20.11.1"),
+        ("npm", "echo 10.2.4"),
+        ("git", "echo git version 2.43.0"),
+        ("claude", f"{sleep} 1; echo 1.0.0 '(Claude Code)'"),
+        ("opencode", f"{sleep} 30"),
+    ]:
+        path = bin_dir / name
+        path.write_text(f"#!/bin/sh\n{body}\n")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("HERE_SPEC_PROBE_TIMEOUT", "1.5")
+
+    detector = SystemDetector(path_index=PathIndex(str(bin_dir)))
+    started = time.monotonic()
+    versions = detector._probe_versions()
+    elapsed = time.monotonic() - started
+
+    assert versions == {
+        "node": "20.11.1",
+        "npm": "10.2.4",
+        "git": "2.43.0",
+        "claude": "1.0.0",
+        "opencode": system_detector.TIMED_OUT,
+    }
+    assert elapsed < 2.5
+
+
+def test_versions_are_cached_with_detection(monkeypatch):
+    first = SystemDetector().detect()
+    assert "versions" in first
+
+    calls = _count_spawns(monkeypatch)
+    monkeypatch.setattr(system_detector.subprocess, "Popen", lambda *a, **k: calls.append(a))
+    assert SystemDetector().detect()["versions"] == first["versions"]
+    assert calls == []
+
+
+def test_python_probe_runs_in_the_pool_and_timeouts_expire_early(tmp_path, monkeypatch):
+    import json
+    import shutil
+    import time
+
+    from here_spec.core.path_index import PathIndex
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    sleep = shutil.which("sleep")
+    for name in ["python3", "opencode"]:
+        path = bin_dir / name
+        path.write_text(f"#!/bin/sh\n{sleep} 30\n")
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("HERE_SPEC_PROBE_TIMEOUT", "1")
+    cache_path = tmp_path / "system.json"
+
+    started = time.monotonic()
+    info = SystemDetector(cache_path, PathIndex(str(bin_dir))).detect()
+    assert time.monotonic() - started < 1.9
+    assert info["python_version"] == "Unknown"
+    assert info["versions"]["opencode"] == system_detector.TIMED_OUT
+
+    detector = SystemDetector(cache_path, PathIndex(str(bin_dir)))
+    detector.detect()
+    assert detector.cache_hit
+
+    data = json.loads(cache_path.read_text())
+    data["created_at"] -= system_detector.TIMEOUT_TTL + 1
+    cache_path.write_text(json.dumps(data))
+    monkeypatch.setenv("HERE_SPEC_PROBE_TIMEOUT", "0.1")
+    detector = SystemDetector(cache_path, PathIndex(str(bin_dir)))
+    detector.detect()
+    assert not detector.cache_hit
@@ -0,0 +1,146 @@
+import json
+import random
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from here_spec.core.tasks import load_task_graph, parse_tasks
+
+FIXTURES = Path(__file__).parent / "fixtures" / "tasks"
+TEMPLATE = Path(__file__).parent.parent / "templates" / "tasks-template.md"
+
+
+def test_parses_ids_markers_stories_and_phases():
+    graph = load_task_graph(FIXTURES / "sample-tasks.md")
+
+    assert [t.id for t in graph] == [f"T00{i}" for i in range(1, 8)]
+    assert graph.phases == ["Phase 1: Setup", "Phase 2: Implementation", "Phase 3: Polish"]
+    t005 = graph.by_id["T005"]
+    assert t005.parallel and t005.story == "US1" and t005.phase_index == 1
+    assert t005.description == "Create helper in src/helper.js"
+    assert t005.files == ["src/helper.js"]
+    assert graph.by_id["T006"].done
+    text = (FIXTURES / "sample-tasks.md").read_bytes()
+    assert text[graph.by_id["T004"].offset :].startswith(b"- [ ] T004")
+
+
+def test_dependencies_follow_phases_markers_and_files():
+    graph = load_task_graph(TEMPLATE)
+
+    assert graph.by_id["T002"].depends_on == ["T001"]
+    assert graph.by_id["T003"].depends_on == ["T002"]  # [P] waits for the last sequential task
+    assert graph.by_id["T004"].depends_on == []  # first in its phase: only the phase barrier
+    assert graph.prerequisites("T004") == {"T001", "T002", "T003"}
+    assert graph.by_id["T011"].depends_on == ["T008", "T009", "T010"]  # waits for the [P] group
+    assert graph.by_id["T009"].depends_on == ["T008"]  # "T008 blocks T009, T015"
+    assert graph.by_id["T018"].depends_on == ["T017", "T016"]
+    assert graph.warnings == []
+
+    same_file = parse_tasks(
+        "## Phase 1\n- [ ] T001 [P] Model in src/a.py\n- [ ] T002 [P] Tests for src/a.py\n"
+        "- [ ] T003 [P] Other in src/b.py\n"
+    )
+    assert same_file.by_id["T002"].depends_on == ["T001"]
+    assert same_file.by_id["T003"].depends_on == []
+
+
+def test_ready_tasks_respect_phase_barrier():
+    graph = load_task_graph(FIXTURES / "sample-tasks.md")
+    assert [t.id for t in graph.ready()] == ["T001"]
+    assert [t.id for t in graph.ready({"T001"})] == ["T002", "T003"]
+    assert [t.id for t in graph.ready({"T001", "T002", "T003"})] == ["T004"]
+    assert [t.id for t in graph.ready({"T001", "T002", "T003", "T004"})] == ["T005"]
+
+
+def test_malformed_entries_become_warnings():
+    graph = load_task_graph(FIXTURES / "malformed-tasks.md")
+    assert [t.id for t in graph] == ["T001", "T003", "T004", "T005"]
+    assert graph.warnings == [
+        "line 8: task without a checkbox",
+        "line 9: checkbox without a task ID",
+    ]
+    explicit = load_task_graph(FIXTURES / "with-issues.md")
+    assert explicit.by_id["T003"].depends_on == []  # T001 is in an earlier phase
+
+
+def test_graph_is_cached_by_content_hash(monkeypatch):
+    from here_spec.core import tasks as tasks_module
+
+    tasks_module._memory.clear()
+    text = (FIXTURES / "sample-tasks.md").read_text()
+    first = parse_tasks(text)
+    assert parse_tasks(text) is first
+
+    tasks_module._memory.clear()
+    calls = []
+    monkeypatch.setattr(tasks_module, "parse_lines", lambda *a, **k: calls.append(1))
+    from_disk = parse_tasks(text)
+    assert calls == []
+    assert from_disk.to_dict() == first.to_dict()
+
+
+def test_disk_cache_keeps_only_the_most_recent_graphs(monkeypatch):
+    from here_spec.core import tasks as tasks_module
+    from here_spec.core.paths import cache_dir
+
+    monkeypatch.setattr(tasks_module, "DISK_SLOTS", 3)
+    for i in range(5):
+        tasks_module._memory.clear()
+        parse_tasks(f"## Phase 1\n- [ ] T001 Task number {i}\n")
+        time.sleep(0.01)
+
+    cached = sorted((cache_dir() / "tasks").glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+    assert len(cached) == 3
+    assert json.loads(cached[-1].read_text())["tasks"][0]["description"] == "Task number 4"
+
+
+def test_ready_waits_for_every_earlier_phase():
+    graph = parse_tasks(
+        "## Phase 1\n- [ ] T001 Setup\n## Phase 2\n- [x] T002 Core\n"
+        "## Phase 3\n- [ ] T003 Polish\n",
+        use_cache=False,
+    )
+    assert [t.id for t in graph.ready()] == ["T001"]
+    assert "T001" in graph.prerequisites("T003")
+    assert [t.id for t in graph.ready({"T001"})] == ["T003"]
+
+
+def test_parses_ten_thousand_tasks_quickly():
+    rng = random.Random(7)
+    lines = ["# Tasks: Big\n"]
+    number = 0
+    for phase in range(20):
+        lines.append(f"\n## Phase {phase + 1}: Work\n\n")
+        for _ in range(500):
+            number += 1
+            marker = "[P] " if rng.random() < 0.6 else ""
+            lines.append(
+                f"- [ ] T{number:05d} {marker}[US{phase % 5 + 1}] Implement part {number} "
+                f"in src/mod{rng.randint(0, 300)}/file{rng.randint(0, 20)}.py\n"
+            )
+    text = "".join(lines)
+
+    started = time.perf_counter()
+    graph = parse_tasks(text, use_cache=False)
+    elapsed = time.perf_counter() - started
+
+    assert len(graph) == 10_000
+    assert elapsed < 1.0
+
+
+def test_tasks_command_json(tmp_path):
+    from here_spec.cli.main import app
+
+    feature = tmp_path / "specs" / "001-demo"
+    feature.mkdir(parents=True)
+    (feature / "tasks.md").write_text((FIXTURES / "sample-tasks.md").read_text())
+
+    result = CliRunner().invoke(app, ["tasks", str(tmp_path), "--json"])
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(result.output)
+    assert data["file"].endswith("specs/001-demo/tasks.md")
+    assert data["tasks"][1]["id"] == "T002"
+    assert data["tasks"][1]["parallel"] is True
+    assert CliRunner().invoke(app, ["tasks", str(tmp_path / "none")]).exit_code == 1
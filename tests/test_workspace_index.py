@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+
+from rich.console import Console
+
+from here_spec.checkpoint import CheckpointManager
+from here_spec.core import workspace_index
+from here_spec.core.workspace_index import WorkspaceIndex, discover_projects
+
+
+def _make_project(path, step="spec"):
+    cm = CheckpointManager(Console(), path)
+    cm.state["project_name"] = path.name
+    cm.state["current_step"] = step
+    cm._save_state()
+    return cm
+
+
+def test_saves_update_the_index(tmp_path):
+    _make_project(tmp_path / "alpha", step="plan")
+
+    project = WorkspaceIndex().get(tmp_path / "alpha")
+    assert project["current_step"] == "plan"
+    assert project["project_name"] == "alpha"
+    assert project["agent"] == "claude"
+
+
+def test_discovery_reads_metadata_from_index(tmp_path, monkeypatch):
+    _make_project(tmp_path / "alpha", step="plan")
+    _make_project(tmp_path / "beta")
+    (tmp_path / "not-a-project").mkdir()
+
+    def fail_read(project_path):
+        raise AssertionError("checkpoint file was opened")
+
+    monkeypatch.setattr(workspace_index, "load_project_state", fail_read)
+    projects = discover_projects(tmp_path)
+    assert [p["name"] for p in projects] == ["alpha", "beta"]
+    assert projects[0]["current_step"] == "plan"
+
+
+def test_discovery_backfills_projects_saved_before_the_index(tmp_path, monkeypatch):
+    monkeypatch.setenv("HERE_SPEC_INDEX", "off")
+    _make_project(tmp_path / "legacy", step="tasks")
+    monkeypatch.setenv("HERE_SPEC_INDEX", str(tmp_path / "fresh.sqlite"))
+
+    projects = discover_projects(tmp_path)
+    assert [p["current_step"] for p in projects] == ["tasks"]
+    assert WorkspaceIndex().get(tmp_path / "legacy")["current_step"] == "tasks"
+
+
+def test_disabled_index_still_discovers(tmp_path, monkeypatch):
+    monkeypatch.setenv("HERE_SPEC_INDEX", "off")
+    _make_project(tmp_path / "alpha")
+    assert [p["name"] for p in discover_projects(tmp_path)] == ["alpha"]
+
+
+def test_discovery_rereads_projects_changed_outside_here_spec(tmp_path):
+    _make_project(tmp_path / "alpha", step="plan")
+    snapshot = tmp_path / "alpha" / ".speckit" / "checkpoints.json"
+    state = json.loads(snapshot.read_text())
+    state["current_step"] = "tasks"
+    snapshot.write_text(json.dumps(state))
+    later = WorkspaceIndex().get(tmp_path / "alpha")["updated_at"] + 5
+    os.utime(snapshot, (later, later))
+
+    assert [p["current_step"] for p in discover_projects(tmp_path)] == ["tasks"]
+    assert WorkspaceIndex().get(tmp_path / "alpha")["current_step"] == "tasks"
+
+
+def test_index_created_before_step_started_at_is_migrated(tmp_path, monkeypatch):
+    db = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(str(db))
+    conn.executescript(workspace_index.SCHEMA.replace("    step_started_at REAL,\n", ""))
+    conn.close()
+    monkeypatch.setenv("HERE_SPEC_INDEX", str(db))
+
+    cm = _make_project(tmp_path / "alpha")
+    row = WorkspaceIndex().get(tmp_path / "alpha")
+    assert row["step_started_at"] == cm.state["step_started_at"]